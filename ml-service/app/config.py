@@ -0,0 +1,81 @@
+"""
+ML Service Configuration
+Settings are read from environment variables (see .env.example)
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+# Approximate (LSH) alumni retrieval, used by mode='approximate'
+ANN_PARAMS = {
+    'num_perm': _env_int('ML_ANN_NUM_PERM', 64),
+    'bands': _env_int('ML_ANN_BANDS', 32),
+    'projection_bits': _env_int('ML_ANN_PROJECTION_BITS', 10),
+    'projection_tables': _env_int('ML_ANN_PROJECTION_TABLES', 12),
+}
+
+# Recommendation result cache (server-side index only)
+RECOMMEND_CACHE_MAX_BYTES = _env_int('ML_RECOMMEND_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+RECOMMEND_CACHE_TTL_SECONDS = _env_int('ML_RECOMMEND_CACHE_TTL_SECONDS', 300)
+
+# Journal of the server-side alumni index, replayed by every worker process
+ALUMNI_INDEX_DIR = os.getenv('ML_ALUMNI_INDEX_DIR', 'models/alumni_index')
+
+# Worker processes for the server-side alumni index (0 = single process)
+RECOMMEND_SHARDS = _env_int('ML_RECOMMEND_SHARDS', 0)
+# Seconds to wait for every shard's reply (a sync rebuilds the shards) before
+# the shards are restarted
+RECOMMEND_SHARD_TIMEOUT_SECONDS = _env_int('ML_RECOMMEND_SHARD_TIMEOUT_SECONDS', 120)
+
+# Executor pools for CPU-bound endpoints. Work beyond workers + queue is
+# rejected with 429. PROCESS_POOL_WORKERS=0 runs process work on the thread pool.
+THREAD_POOL_WORKERS = _env_int('ML_THREAD_POOL_WORKERS', 4)
+THREAD_POOL_QUEUE = _env_int('ML_THREAD_POOL_QUEUE', 32)
+PROCESS_POOL_WORKERS = _env_int('ML_PROCESS_POOL_WORKERS', 2)
+PROCESS_POOL_QUEUE = _env_int('ML_PROCESS_POOL_QUEUE', 8)
+
+# Micro-batching of concurrent /api/ml/sentiment requests
+# (SENTIMENT_BATCH_MAX_WAIT_MS=0 sends each request on its own)
+SENTIMENT_BATCH_MAX_SIZE = _env_int('ML_SENTIMENT_BATCH_MAX_SIZE', 64)
+SENTIMENT_BATCH_MAX_WAIT_MS = _env_int('ML_SENTIMENT_BATCH_MAX_WAIT_MS', 5)
+
+# Labeled rows per partial_fit call for online sentiment training
+SENTIMENT_ONLINE_BATCH_SIZE = _env_int('ML_SENTIMENT_ONLINE_BATCH_SIZE', 500)
+
+# Sentiment result cache, keyed by normalized text hash + model version (0 disables)
+SENTIMENT_CACHE_MAX_BYTES = _env_int('ML_SENTIMENT_CACHE_MAX_BYTES', 16 * 1024 * 1024)
+
+# Rows per analyze_batch call for the NDJSON streaming sentiment endpoint
+SENTIMENT_STREAM_CHUNK_SIZE = _env_int('ML_SENTIMENT_STREAM_CHUNK_SIZE', 1000)
+
+# How often (ms) a worker re-reads the CURRENT pointer of the saved sentiment
+# and global topic models, to serve versions other workers published
+MODEL_REFRESH_MS = _env_int('ML_MODEL_REFRESH_MS', 1000)
+
+# LDA trainer: 'single' (LdaModel, learns alpha) or 'multicore' (LdaMulticore,
+# fixed asymmetric alpha). LDA_WORKERS=0 uses cores - 1 worker processes.
+LDA_MODE = os.getenv('ML_LDA_MODE', 'single')
+LDA_WORKERS = _env_int('ML_LDA_WORKERS', 0)
+LDA_CHUNKSIZE = _env_int('ML_LDA_CHUNKSIZE', 2000)
+
+# Coherence score of /api/ml/topics: c_v (sliding window, the default),
+# c_v_async (c_v as a background job), u_mass (cheap, bag-of-words) or none
+TOPIC_COHERENCE = os.getenv('ML_TOPIC_COHERENCE', 'c_v')
+
+# Trending topics: a period is compared with the average of this many
+# periods before it; hourly keyword buckets are kept this long
+TRENDING_BASELINE_PERIODS = _env_int('ML_TRENDING_BASELINE_PERIODS', 4)
+TRENDING_RETENTION_DAYS = _env_int('ML_TRENDING_RETENTION_DAYS', 150)
+
+# /api/ml/keywords: texts per process-pool task, and the per-text result cache
+KEYWORDS_CHUNK_SIZE = _env_int('ML_KEYWORDS_CHUNK_SIZE', 100)
+KEYWORDS_CACHE_MAX_BYTES = _env_int('ML_KEYWORDS_CACHE_MAX_BYTES', 16 * 1024 * 1024)
+
+# Token lists cached per text and tokenizer, in each process (0 disables)
+TOKEN_CACHE_MAX_BYTES = _env_int('ML_TOKEN_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+
+# Local corpus files for /api/ml/topics/corpus must be inside this directory
+CORPUS_DIR = os.getenv('ML_CORPUS_DIR', 'data/corpora')
@@ -2,22 +2,124 @@
 FastAPI ML Service for Alumni Connect
 Classical ML Methods Only - NO Transformers
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.requests import ClientDisconnect
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Any
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 import uvicorn
+import asyncio
+import functools
+import json
+import os
+import tempfile
 
+from app import config
 from app.services.profile_matcher import ProfileMatcher
-from app.services.sentiment_analyzer import SentimentAnalyzer
-from app.services.topic_modeler import TopicModeler
+from app.services.sentiment_analyzer import SentimentAnalyzer, StaleOnlineModel, parse_labeled_line
+from app.services.topic_modeler import (
+    TopicModeler, extract_topics_task, coherence_task, document_keywords_task, init_worker
+)
+from app.services.keywords import KeywordService
+from app.services.preprocessing import configure_token_cache, token_cache
+from app.services.online_topics import OnlineTopicModel
+from app.services.topic_sweep import sweep_num_topics, topic_counts
+from app.services.trending import TrendingKeywords, GLOBAL_SCOPE
 from app.services.engagement_scorer import EngagementScorer
 from app.services.recommender import AlumniRecommender
+from app.services.sharded_index import ShardedAlumniIndex
+from app.services.executor import BoundedExecutor, PoolSaturated
+from app.services.batcher import MicroBatcher
+from app.services.jobs import JobRegistry
+
+# Tokenized documents, shared by the services in this process
+configure_token_cache(config.TOKEN_CACHE_MAX_BYTES)
+
+# Initialize ML services
+profile_matcher = ProfileMatcher()
+sentiment_analyzer = SentimentAnalyzer(
+    cache_max_bytes=config.SENTIMENT_CACHE_MAX_BYTES,
+    refresh_interval=config.MODEL_REFRESH_MS / 1000
+)
+topic_modeler = TopicModeler()
+global_topics = OnlineTopicModel(
+    preprocess=topic_modeler._preprocess,
+    refresh_interval=config.MODEL_REFRESH_MS / 1000
+)
+trending_keywords = TrendingKeywords(
+    baseline_periods=config.TRENDING_BASELINE_PERIODS,
+    retention_days=config.TRENDING_RETENTION_DAYS
+)
+engagement_scorer = EngagementScorer()
+
+# Worker pools, shard processes and the services built on them are created
+# by lifespan() at startup, not at import: spawned worker processes import
+# this module again and must not start pools or shards of their own
+alumni_recommender: Optional[AlumniRecommender] = None
+thread_pool: Optional[BoundedExecutor] = None
+process_pool: Optional[BoundedExecutor] = None
+keyword_service: Optional[KeywordService] = None
+training_jobs: Optional[JobRegistry] = None
+sentiment_batcher: Optional[MicroBatcher] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global alumni_recommender, thread_pool, process_pool, keyword_service, training_jobs, sentiment_batcher
+    
+    alumni_recommender = AlumniRecommender(
+        ann_params=config.ANN_PARAMS,
+        cache_max_bytes=config.RECOMMEND_CACHE_MAX_BYTES,
+        cache_ttl_seconds=config.RECOMMEND_CACHE_TTL_SECONDS,
+        shards=config.RECOMMEND_SHARDS,
+        shard_timeout=config.RECOMMEND_SHARD_TIMEOUT_SECONDS,
+        index_dir=config.ALUMNI_INDEX_DIR
+    )
+    
+    # CPU-bound work runs here instead of on the event loop: threads for
+    # NumPy/scikit-learn (releases the GIL), processes for pure-Python
+    # gensim/YAKE/RAKE work
+    thread_pool = BoundedExecutor('thread', 'thread', config.THREAD_POOL_WORKERS, config.THREAD_POOL_QUEUE)
+    process_pool = BoundedExecutor(
+        'process', 'process', config.PROCESS_POOL_WORKERS, config.PROCESS_POOL_QUEUE,
+        initializer=functools.partial(init_worker, config.TOKEN_CACHE_MAX_BYTES)
+    ) if config.PROCESS_POOL_WORKERS > 0 else thread_pool
+    
+    # YAKE/RAKE over the process pool in chunks, with a per-text result cache
+    keyword_service = KeywordService(
+        process_pool,
+        chunk_size=config.KEYWORDS_CHUNK_SIZE,
+        cache_max_bytes=config.KEYWORDS_CACHE_MAX_BYTES
+    )
+    
+    # Model training (and deferred topic coherence) runs as background jobs,
+    # polled via /api/ml/jobs/{job_id}
+    training_jobs = JobRegistry()
+    
+    # Concurrent sentiment requests share one transform + predict_proba
+    sentiment_batcher = MicroBatcher(
+        sentiment_analyzer.analyze_batch,
+        max_batch=config.SENTIMENT_BATCH_MAX_SIZE,
+        max_wait_ms=config.SENTIMENT_BATCH_MAX_WAIT_MS,
+        executor=thread_pool
+    )
+    
+    try:
+        yield
+    finally:
+        if isinstance(alumni_recommender.index, ShardedAlumniIndex):
+            alumni_recommender.index.close()
+        for pool in dict.fromkeys([thread_pool, process_pool]):
+            pool.shutdown(wait=False)
+        training_jobs.shutdown(wait=False)
 
 app = FastAPI(
     title="Alumni Connect ML Service",
     description="Classical ML service using scikit-learn, gensim, spaCy, NLTK",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -29,12 +131,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize ML services
-profile_matcher = ProfileMatcher()
-sentiment_analyzer = SentimentAnalyzer()
-topic_modeler = TopicModeler()
-engagement_scorer = EngagementScorer()
-alumni_recommender = AlumniRecommender()
+@app.exception_handler(PoolSaturated)
+async def pool_saturated_handler(request: Request, exc: PoolSaturated):
+    """Full executor queue -> 429, dead pool -> 503; clients should back off"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc), "pool": exc.pool},
+        headers={"Retry-After": "1"}
+    )
+
+async def ndjson_lines(request: Request):
+    """Lines of a streamed (chunked) request body, decoded as they arrive"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if buffer:
+        yield buffer.decode("utf-8")
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for handlers that keep reading the request body while
+    they respond. Starlette's disconnect listener would consume the body
+    messages; a disconnect surfaces through request.stream() instead.
+    
+    Overrides __call__ around stream_response(), so it depends on the
+    Starlette version pinned in requirements.txt (also tested on 1.8).
+    Starlette >= 0.38 skips the listener on ASGI 2.4 servers; once the
+    server and pin are there, plain StreamingResponse will do.
+    """
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
 
 # ============ Request/Response Models ============
 
@@ -52,6 +183,25 @@ class RecommendAlumniRequest(BaseModel):
     student_profile: Dict[str, Any]
     alumni_profiles: List[Dict[str, Any]]
     limit: int = 10
+    mode: str = "exact"  # exact, knn; approximate only on /recommend-alumni/indexed
+
+class AlumniIndexUpsertRequest(BaseModel):
+    alumni_profiles: List[Dict[str, Any]]
+
+class AlumniIndexDeleteRequest(BaseModel):
+    alumni_ids: List[int]
+
+class AlumniIndexResponse(BaseModel):
+    size: int
+    version: int
+
+class RecommendFromIndexRequest(BaseModel):
+    student_id: int
+    student_profile: Dict[str, Any]
+    limit: int = 10
+    exclude_ids: Optional[List[int]] = None
+    branch: Optional[str] = None
+    mode: str = "exact"  # exact, approximate, knn
 
 class AlumniRecommendation(BaseModel):
     alumni_id: int
@@ -59,6 +209,21 @@ class AlumniRecommendation(BaseModel):
     breakdown: Dict[str, float]
     explanation: str
 
+class BatchStudent(BaseModel):
+    student_id: int
+    student_profile: Dict[str, Any]
+    exclude_ids: Optional[List[int]] = None
+
+class BatchRecommendRequest(BaseModel):
+    students: List[BatchStudent]
+    alumni_profiles: Optional[List[Dict[str, Any]]] = None  # defaults to the server-side index
+    limit: int = 10
+    stream: bool = False  # NDJSON, one line per student as each block finishes
+
+class BatchRecommendation(BaseModel):
+    student_id: int
+    recommendations: List[AlumniRecommendation]
+
 class SentimentRequest(BaseModel):
     texts: List[str]
 
@@ -67,13 +232,48 @@ class SentimentResponse(BaseModel):
     confidence: float
     scores: Dict[str, float]
 
-class TopicModelRequest(BaseModel):
-    texts: List[str]
+class TopicOptions(BaseModel):
     num_topics: int = 5
+    lda_mode: Optional[str] = None  # single, multicore; defaults to ML_LDA_MODE
+    workers: Optional[int] = None  # multicore only
+    chunksize: Optional[int] = None
+    coherence: Optional[str] = None  # none, u_mass, c_v, c_v_async; defaults to ML_TOPIC_COHERENCE
+
+class TopicModelRequest(TopicOptions):
+    texts: List[str]
+
+class TopicCorpusRequest(TopicOptions):
+    path: str  # JSONL (.jsonl/.ndjson) or one-document-per-line text file under ML_CORPUS_DIR
+    field: str = "text"  # JSONL field holding the text
     
+class TopicSweepRequest(BaseModel):
+    texts: List[str]
+    min_topics: int = 2
+    max_topics: int = 20
+    step: int = 1
+    patience: int = 2  # topic counts in a row without improvement before stopping
+    min_delta: float = 0.0  # coherence gain that counts as an improvement
+    parallel: Optional[int] = None  # models trained at once; defaults to the process pool size
+    chunksize: Optional[int] = None
+
 class TopicResponse(BaseModel):
     topics: List[Dict[str, Any]]
-    coherence_score: float
+    coherence_score: Optional[float]
+    coherence: Optional[str] = None
+    coherence_error: Optional[str] = None
+    coherence_job_id: Optional[str] = None  # coherence=c_v_async: poll /api/ml/jobs/{job_id}
+
+class TopicInferRequest(BaseModel):
+    texts: List[str]
+    min_probability: float = 0.01
+
+class TrendingDocument(BaseModel):
+    text: str
+    scope: str = GLOBAL_SCOPE  # e.g. "branch:Computer Engineering"; always counted in "global" too
+    created_at: Optional[datetime] = None  # defaults to now; naive times are UTC
+
+class TrendingIngestRequest(BaseModel):
+    documents: List[TrendingDocument]
 
 class EngagementRequest(BaseModel):
     user_id: int
@@ -119,11 +319,13 @@ async def match_profiles(request: ProfileMatchRequest):
     - Jaccard similarity for skills
     - Boolean matching for branch/cohort
     """
+    job = thread_pool.submit(
+        profile_matcher.match,
+        request.student_profile,
+        request.alumni_profile
+    )
     try:
-        result = profile_matcher.match(
-            request.student_profile,
-            request.alumni_profile
-        )
+        result = await job
         return ProfileMatchResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -133,17 +335,121 @@ async def recommend_alumni(request: RecommendAlumniRequest):
     """
     Recommend top N alumni for a student using k-NN and similarity scoring.
     Returns sorted list with match percentages and explanations.
+    The pool is indexed per request; for repeated queries against the same
+    alumni (k-NN model caching, approximate mode) use /recommend-alumni/indexed.
     """
+    job = thread_pool.submit(
+        alumni_recommender.recommend,
+        student_profile=request.student_profile,
+        alumni_profiles=request.alumni_profiles,
+        limit=request.limit,
+        mode=request.mode
+    )
     try:
-        recommendations = alumni_recommender.recommend(
-            student_profile=request.student_profile,
-            alumni_profiles=request.alumni_profiles,
-            limit=request.limit
-        )
+        recommendations = await job
+        return [AlumniRecommendation(**rec) for rec in recommendations]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/ml/recommend-alumni/indexed", response_model=List[AlumniRecommendation])
+async def recommend_alumni_from_index(request: RecommendFromIndexRequest):
+    """
+    Recommend top N alumni from the server-side alumni index.
+    Only the student profile and an optional filter are sent.
+    """
+    job = thread_pool.submit(
+        alumni_recommender.recommend_from_index,
+        student_profile=request.student_profile,
+        limit=request.limit,
+        exclude_ids=request.exclude_ids,
+        branch=request.branch,
+        mode=request.mode
+    )
+    try:
+        recommendations = await job
         return [AlumniRecommendation(**rec) for rec in recommendations]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/ml/recommend-alumni/batch", response_model=List[BatchRecommendation])
+async def recommend_alumni_batch(request: BatchRecommendRequest):
+    """
+    Top N alumni for many students (nightly precomputation).
+    Scores are computed as student x alumni matrix products in row blocks.
+    With stream=true, results are returned as NDJSON while blocks finish;
+    a failure mid-stream ends it with an {"error", "fatal": true} line.
+    """
+    students = [s.model_dump() for s in request.students]
+    
+    if request.stream:
+        async def generate():
+            results = alumni_recommender.iter_recommend_many(
+                students,
+                limit=request.limit,
+                alumni_profiles=request.alumni_profiles
+            )
+            try:
+                while True:
+                    # Each step (a block of scoring or one rendered student)
+                    # runs on the bounded thread pool, waiting for room
+                    item = await thread_pool.run_when_available(next, results, None)
+                    if item is None:
+                        break
+                    student_id, recommendations = item
+                    yield json.dumps({
+                        'student_id': student_id,
+                        'recommendations': [AlumniRecommendation(**r).model_dump() for r in recommendations]
+                    }) + "\n"
+            except Exception as e:
+                # Headers are already sent: report the failure in-band and stop
+                yield json.dumps({'error': str(e), 'fatal': True}) + "\n"
+        
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+    
+    job = thread_pool.submit(
+        alumni_recommender.recommend_many,
+        students,
+        limit=request.limit,
+        alumni_profiles=request.alumni_profiles
+    )
+    try:
+        results = await job
+        return [BatchRecommendation(**r) for r in results]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/ml/alumni-index", response_model=AlumniIndexResponse)
+async def get_alumni_index():
+    """
+    Size and version of the server-side alumni index.
+    The version changes on every upsert/delete.
+    """
+    version = alumni_recommender.refresh_index()
+    return AlumniIndexResponse(size=len(alumni_recommender.index), version=version)
+
+@app.post("/api/ml/alumni-index/upsert", response_model=AlumniIndexResponse)
+async def upsert_alumni(request: AlumniIndexUpsertRequest):
+    """
+    Insert or replace alumni profiles (by id) in the server-side index.
+    """
+    try:
+        version = alumni_recommender.upsert_alumni(request.alumni_profiles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return AlumniIndexResponse(size=len(alumni_recommender.index), version=version)
+
+@app.post("/api/ml/alumni-index/delete", response_model=AlumniIndexResponse)
+async def delete_alumni(request: AlumniIndexDeleteRequest):
+    """
+    Remove alumni profiles from the server-side index.
+    """
+    version = alumni_recommender.delete_alumni(request.alumni_ids)
+    return AlumniIndexResponse(size=len(alumni_recommender.index), version=version)
+
 # ============ Sentiment Analysis Endpoints ============
 
 @app.post("/api/ml/sentiment", response_model=List[SentimentResponse])
@@ -151,45 +457,348 @@ async def analyze_sentiment(request: SentimentRequest):
     """
     Analyze sentiment using classical ML (Logistic Regression).
     Returns sentiment label and confidence scores.
+    Requests arriving within a few milliseconds are scored as one batch.
     """
     try:
-        results = sentiment_analyzer.analyze_batch(request.texts)
+        results = await sentiment_batcher.submit(request.texts)
         return [SentimentResponse(**r) for r in results]
+    except PoolSaturated:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/ml/sentiment/train")
+@app.post("/api/ml/sentiment/stream")
+async def analyze_sentiment_stream(request: Request, chunk_size: int = config.SENTIMENT_STREAM_CHUNK_SIZE):
+    """
+    Bulk sentiment for backfills. The body is NDJSON, one {"id", "text"}
+    per line, read as it arrives and scored `chunk_size` rows at a time.
+    Results stream back as NDJSON ({"id", "sentiment", "confidence",
+    "scores"}) as each chunk completes, so memory stays bounded by the
+    chunk size. Malformed lines produce {"line", "error"} and are skipped.
+    """
+    if chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be at least 1")
+    
+    async def generate():
+        ids, texts = [], []
+        
+        async def flush():
+            results = await thread_pool.run_when_available(sentiment_analyzer.analyze_batch, texts)
+            return "".join(
+                json.dumps({'id': row_id, **result}) + "\n"
+                for row_id, result in zip(ids, results)
+            )
+        
+        line_no = 0
+        try:
+            async for line in ndjson_lines(request):
+                line_no += 1
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    text = row['text']
+                    if not isinstance(text, str):
+                        raise TypeError("'text' must be a string")
+                    ids.append(row.get('id'))
+                    texts.append(text)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    yield json.dumps({'line': line_no, 'error': f"expected a JSON object with 'text' ({e})"}) + "\n"
+                    continue
+                if len(texts) >= chunk_size:
+                    yield await flush()
+                    ids, texts = [], []
+            if texts:
+                yield await flush()
+        except ClientDisconnect:
+            return
+        except Exception as e:
+            # Headers are already sent: report the failure in-band and stop
+            yield json.dumps({'line': line_no, 'error': str(e), 'fatal': True}) + "\n"
+    
+    return DuplexStreamingResponse(generate(), media_type="application/x-ndjson")
+
+@app.post("/api/ml/sentiment/train", status_code=202)
 async def train_sentiment_model(
     texts: List[str],
     labels: List[str]  # 'positive', 'negative', 'neutral'
 ):
     """
-    Train or retrain sentiment classifier with new data.
+    Train or retrain sentiment classifier with new data in the background.
+    The live model keeps serving until the new one is swapped in; poll
+    /api/ml/jobs/{job_id} for the metrics.
     """
+    if len(texts) != len(labels):
+        raise HTTPException(status_code=400, detail="Texts and labels must have same length")
+    
+    job_id = training_jobs.submit("sentiment_training", sentiment_analyzer.train, texts, labels)
+    return {
+        "status": "training_queued",
+        "job_id": job_id,
+        "model": "logistic_regression"
+    }
+
+@app.post("/api/ml/sentiment/train/online")
+async def train_sentiment_online(request: Request, batch_size: int = config.SENTIMENT_ONLINE_BATCH_SIZE):
+    """
+    Online training from a streamed NDJSON body of {"text", "label"} rows.
+    Rows are folded into a hashing-vectorizer + SGD model with partial_fit
+    every `batch_size` rows, so memory stays flat whatever the body size.
+    The rows train a private copy of the online model, swapped in only once
+    the whole stream has been read; a bad line or a failure changes nothing.
+    409 if another model was published meanwhile.
+    """
+    if batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be at least 1")
+    
+    texts, labels = [], []
+    line_no = 0
     try:
-        metrics = sentiment_analyzer.train(texts, labels)
+        online = await thread_pool.submit(sentiment_analyzer.start_online)
+        async for line in ndjson_lines(request):
+            line_no += 1
+            if not line.strip():
+                continue
+            text, label = parse_labeled_line(line)
+            texts.append(text)
+            labels.append(label)
+            if len(texts) >= batch_size:
+                await thread_pool.submit(sentiment_analyzer.partial_train, texts, labels, online)
+                texts, labels = [], []
+        if texts:
+            await thread_pool.submit(sentiment_analyzer.partial_train, texts, labels, online)
+        metrics = await thread_pool.submit(sentiment_analyzer.commit_online, online)
         return {
             "status": "training_complete",
             "metrics": metrics,
-            "model": "logistic_regression"
+            "model": "sgd_log_loss"
         }
+    except PoolSaturated:
+        raise
+    except StaleOnlineModel as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Line {line_no}: {e}" if line_no else str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============ Topic Modeling Endpoints ============
 
+def lda_options(request: TopicOptions) -> Dict[str, Any]:
+    """LDA trainer settings of a request, falling back to config"""
+    return {
+        'mode': request.lda_mode or config.LDA_MODE,
+        'workers': request.workers if request.workers is not None else config.LDA_WORKERS,
+        'chunksize': request.chunksize or config.LDA_CHUNKSIZE
+    }
+
 @app.post("/api/ml/topics", response_model=TopicResponse)
 async def extract_topics(request: TopicModelRequest):
     """
     Extract topics using LDA (Latent Dirichlet Allocation).
     Returns top keywords per topic and coherence score.
+    lda_mode=multicore trains with LdaMulticore (fixed asymmetric alpha
+    instead of alpha='auto').
+    coherence=c_v_async returns as soon as the topics exist; the c_v score
+    is computed in the background under coherence_job_id.
     """
+    job = process_pool.submit(
+        extract_topics_task,
+        texts=request.texts,
+        num_topics=request.num_topics,
+        coherence=request.coherence or config.TOPIC_COHERENCE,
+        **lda_options(request)
+    )
     try:
-        result = topic_modeler.extract_topics(
-            texts=request.texts,
-            num_topics=request.num_topics
-        )
+        result = await job
+        coherence_topics = result.pop('coherence_topics', None)
+        if coherence_topics:
+            try:
+                result['coherence_job_id'] = training_jobs.track(
+                    "topic_coherence",
+                    process_pool.submit(coherence_task, request.texts, coherence_topics)
+                )
+            except PoolSaturated as e:
+                # The topics are ready; only the deferred score is dropped
+                result['coherence_error'] = str(e)
         return TopicResponse(**result)
+    except PoolSaturated:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def run_and_remove(path: str, fn, *args, **kwargs):
+    """fn(path, *args, **kwargs), deleting the (temporary) file at path afterwards"""
+    try:
+        return fn(path, *args, **kwargs)
+    finally:
+        os.remove(path)
+
+@app.post("/api/ml/topics/corpus", status_code=202)
+async def extract_topics_from_corpus(request: TopicCorpusRequest):
+    """
+    Extract topics from a local corpus file too large for a request body,
+    in the background. The file is streamed twice (dictionary, then a
+    Matrix Market bag-of-words file that LDA streams from), so memory does
+    not grow with the corpus. Poll /api/ml/jobs/{job_id} for the topics.
+    """
+    corpus_dir = os.path.realpath(config.CORPUS_DIR)
+    path = os.path.realpath(os.path.join(corpus_dir, request.path))
+    if os.path.commonpath([corpus_dir, path]) != corpus_dir:
+        raise HTTPException(status_code=400, detail="Corpus path must be inside ML_CORPUS_DIR")
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Corpus file not found")
+    
+    job_id = training_jobs.submit(
+        "topic_corpus",
+        topic_modeler.extract_topics_from_file,
+        path,
+        request.num_topics,
+        coherence=request.coherence or config.TOPIC_COHERENCE,
+        field=request.field,
+        **lda_options(request)
+    )
+    return {"status": "extraction_queued", "job_id": job_id}
+
+@app.post("/api/ml/topics/corpus/upload", status_code=202)
+async def extract_topics_from_upload(
+    request: Request,
+    options: TopicOptions = Depends(),
+    format: str = "jsonl",  # jsonl ({"text": ...} per line) or text (one document per line)
+    field: str = "text"
+):
+    """
+    Same as /api/ml/topics/corpus for a corpus sent as the raw request
+    body. The body is written to a temporary file as it arrives and
+    deleted when the job ends.
+    """
+    if format not in ("jsonl", "text"):
+        raise HTTPException(status_code=400, detail="format must be 'jsonl' or 'text'")
+    
+    fd, path = tempfile.mkstemp(prefix="corpus-upload-", suffix=".jsonl" if format == "jsonl" else ".txt")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in request.stream():
+                f.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    
+    job_id = training_jobs.submit(
+        "topic_corpus",
+        run_and_remove,
+        path,
+        topic_modeler.extract_topics_from_file,
+        options.num_topics,
+        coherence=options.coherence or config.TOPIC_COHERENCE,
+        field=field,
+        **lda_options(options)
+    )
+    return {"status": "extraction_queued", "job_id": job_id}
+
+@app.post("/api/ml/topics/model/train", status_code=202)
+async def train_topic_model(request: TopicModelRequest):
+    """
+    Train the global topic model from scratch in the background (new
+    vocabulary and topics). Poll /api/ml/jobs/{job_id} for the metrics.
+    """
+    job_id = training_jobs.submit(
+        "topic_training",
+        global_topics.train,
+        request.texts,
+        request.num_topics,
+        **lda_options(request)
+    )
+    return {
+        "status": "training_queued",
+        "job_id": job_id,
+        "model": "lda"
+    }
+
+async def run_topic_sweep(request: TopicSweepRequest, counts: List[int]) -> Dict[str, Any]:
+    """Sweep in a scratch directory, then make the best model the global one"""
+    with tempfile.TemporaryDirectory(prefix="topic-sweep-") as work_dir:
+        result = await sweep_num_topics(
+            process_pool,
+            request.texts,
+            counts,
+            work_dir,
+            patience=request.patience,
+            min_delta=request.min_delta,
+            parallel=request.parallel,
+            chunksize=request.chunksize or config.LDA_CHUNKSIZE
+        )
+        published = await thread_pool.run_when_available(
+            global_topics.adopt, result.pop('best_model_path'), result['documents']
+        )
+    return {'model_version': published['model_version'], **result}
+
+@app.post("/api/ml/topics/model/sweep", status_code=202)
+async def sweep_topic_model(request: TopicSweepRequest):
+    """
+    Train the global topic model with the best num_topics in
+    [min_topics, max_topics]: one LDA model per topic count, trained in
+    parallel worker processes over a shared dictionary and corpus, scored
+    with u_mass coherence, stopping early once coherence stops improving.
+    The best model is published like /api/ml/topics/model/train; poll
+    /api/ml/jobs/{job_id} for the coherence curve.
+    """
+    try:
+        counts = topic_counts(request.min_topics, request.max_topics, request.step)
+        if request.patience < 1:
+            raise ValueError("patience must be at least 1")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    job_id = training_jobs.track("topic_sweep", asyncio.ensure_future(run_topic_sweep(request, counts)))
+    return {
+        "status": "sweep_queued",
+        "job_id": job_id,
+        "model": "lda",
+        "topic_counts": counts
+    }
+
+@app.post("/api/ml/topics/model/update", status_code=202)
+async def update_topic_model(texts: List[str]):
+    """
+    Fold new documents into the global topic model (online LDA update)
+    in the background. The vocabulary stays that of the last full training.
+    """
+    if not global_topics.is_trained:
+        raise HTTPException(status_code=409, detail="Topic model is not trained yet")
+    
+    job_id = training_jobs.submit("topic_update", global_topics.update, texts)
+    return {
+        "status": "update_queued",
+        "job_id": job_id,
+        "model": "lda"
+    }
+
+@app.get("/api/ml/topics/model")
+async def get_topic_model(topn: int = 10):
+    """
+    Version, document count and top keywords per topic of the global model.
+    """
+    if not global_topics.is_trained:
+        raise HTTPException(status_code=404, detail="Topic model is not trained yet")
+    return global_topics.describe(topn=topn)
+
+@app.post("/api/ml/topics/infer")
+async def infer_topics(request: TopicInferRequest):
+    """
+    Topic distributions of new texts under the global topic model,
+    without retraining anything.
+    """
+    if not global_topics.is_trained:
+        raise HTTPException(status_code=409, detail="Topic model is not trained yet")
+    
+    job = thread_pool.submit(global_topics.infer, request.texts, request.min_probability)
+    try:
+        return await job
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -197,41 +806,68 @@ async def extract_topics(request: TopicModelRequest):
 async def extract_keywords(texts: List[str], method: str = "yake"):
     """
     Extract keywords using RAKE or YAKE.
+    Large inputs are split into chunks across the process pool; results
+    are cached per text and method.
     """
     try:
-        if method == "yake":
-            results = topic_modeler.extract_keywords_yake(texts)
-        else:
-            results = topic_modeler.extract_keywords_rake(texts)
+        results = await keyword_service.extract(texts, method)
         return {"keywords": results}
+    except PoolSaturated:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def utc_timestamp(moment: Optional[datetime]) -> float:
+    """Unix time of a datetime (naive means UTC), or of now"""
+    if moment is None:
+        return datetime.now(timezone.utc).timestamp()
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+@app.post("/api/ml/trending/ingest")
+async def ingest_trending(request: TrendingIngestRequest):
+    """
+    Add new posts/messages to the trending counters. Keywords (YAKE) are
+    extracted once here and counted into per-scope, per-hour buckets.
+    """
+    if not request.documents:
+        return {"ingested": 0}
+    
+    job = process_pool.submit(document_keywords_task, [doc.text for doc in request.documents])
+    try:
+        keywords = await job
+        documents = [
+            (doc.scope, utc_timestamp(doc.created_at), doc_keywords)
+            for doc, doc_keywords in zip(request.documents, keywords)
+        ]
+        ingested = await thread_pool.submit(trending_keywords.add, documents)
+        return {"ingested": ingested}
+    except PoolSaturated:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/ml/trending-topics")
 async def get_trending_topics(
     scope: str = "global",
-    period: str = "week"
+    period: str = "week",  # day, week, month
+    top_n: int = 20
 ):
     """
-    Get trending topics from posts/chats using LDA + keyword extraction.
+    Trending keywords of a scope: counts of the last period compared with
+    the average of the periods before it, from pre-aggregated hourly
+    buckets (no text is re-read).
     """
+    job = thread_pool.submit(trending_keywords.trending, scope, period, top_n)
     try:
-        # This would fetch data from the main app's database
-        # For now, return placeholder structure
-        return {
-            "scope": scope,
-            "period": period,
-            "topics": [
-                {
-                    "topic_id": 0,
-                    "keywords": ["machine learning", "ai", "python", "tensorflow"],
-                    "weight": 0.25,
-                    "doc_count": 45
-                }
-            ],
-            "trending_keywords": ["AI", "React", "Internship", "Hackathon"],
-            "method": "LDA + YAKE"
-        }
+        result = await job
+        result["method"] = "YAKE keywords + hourly counts (window vs. baseline)"
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -246,19 +882,54 @@ async def calculate_engagement(request: EngagementRequest):
     - Response time metrics
     - Content interactions
     """
+    job = thread_pool.submit(
+        engagement_scorer.calculate,
+        user_id=request.user_id,
+        activity_logs=request.activity_logs,
+        messages=request.messages,
+        posts=request.posts
+    )
     try:
-        result = engagement_scorer.calculate(
-            user_id=request.user_id,
-            activity_logs=request.activity_logs,
-            messages=request.messages,
-            posts=request.posts
-        )
+        result = await job
         return EngagementResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============ Model Management Endpoints ============
 
+@app.get("/api/ml/cache-stats")
+async def get_cache_stats():
+    """
+    Hit/miss/eviction counters and memory use of the in-process caches.
+    """
+    return {
+        "recommendations": alumni_recommender.cache.stats(),
+        "sentiment": sentiment_analyzer.cache.stats(),
+        "keywords": keyword_service.cache.stats(),
+        "tokens": token_cache.stats()
+    }
+
+@app.get("/api/ml/executor-stats")
+async def get_executor_stats():
+    """
+    Queue depth, rejections and queue wait times of the executor pools,
+    plus sentiment micro-batch sizes.
+    """
+    stats = {pool.name: pool.stats() for pool in dict.fromkeys([thread_pool, process_pool])}
+    stats["sentiment_batcher"] = sentiment_batcher.stats()
+    return stats
+
+@app.get("/api/ml/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status of a background job (training, deferred coherence): queued, running, succeeded
+    (with its result) or failed (with the error).
+    """
+    job = training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 @app.get("/api/ml/models")
 async def list_models():
     """
@@ -0,0 +1,422 @@
+"""
+Alumni Index Service
+Corpus-wide TF-IDF index over alumni bio + headline text and a sparse
+alumni x skill incidence matrix for vectorized Jaccard scoring, backed by
+a columnar feature store
+"""
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.neighbors import KDTree
+from sklearn.preprocessing import StandardScaler
+from scipy import sparse
+from typing import List, Dict, Any, Optional, Iterable
+import threading
+import numpy as np
+from .feature_store import AlumniFeatureStore
+from .lsh_index import LSHIndex
+from .preprocessing import SHARED_TOKENIZER
+
+
+def profile_text(profile: Dict[str, Any]) -> str:
+    """Text used for similarity: bio + headline"""
+    return f"{profile.get('bio', '') or ''} {profile.get('headline', '') or ''}"
+
+
+def profile_skills(profile: Dict[str, Any]) -> set:
+    """Distinct skills of a profile"""
+    return set(profile.get('skills') or [])
+
+
+def make_text_vectorizer() -> TfidfVectorizer:
+    """TF-IDF settings for alumni bio + headline text"""
+    return TfidfVectorizer(
+        max_features=1000,
+        stop_words='english',
+        ngram_range=(1, 2),
+        **SHARED_TOKENIZER
+    )
+
+
+# Branch encoding for k-NN features (simplified - could use one-hot encoding)
+KNN_BRANCH_MAP = {
+    'Computer Engineering': 1,
+    'Information Technology': 2,
+    'Electronics': 3,
+    'Mechanical': 4,
+    'Civil': 5
+}
+
+
+def knn_features(profile: Dict[str, Any]) -> Optional[List[float]]:
+    """
+    Numerical k-NN feature vector of a profile, or None if insufficient data.
+    """
+    bio = profile.get('bio', '')
+    headline = profile.get('headline', '')
+    skills = profile.get('skills', [])
+    features = [
+        len(skills) if skills else 0,
+        profile.get('years_of_experience', 0),
+        len(bio),
+        len(headline),
+        1 if profile.get('linkedin_url') else 0,
+        1 if profile.get('github_url') else 0,
+        1 if profile.get('resume_url') else 0,
+        KNN_BRANCH_MAP.get(profile.get('branch', ''), 0),
+    ]
+    return features if any(features) else None
+
+
+class KNNModel:
+    def __init__(self, features: np.ndarray, rows: np.ndarray):
+        """Scaler + KD-tree over the alumni feature rows"""
+        self.rows = rows
+        self.scaler = StandardScaler()
+        self.tree = KDTree(self.scaler.fit_transform(features), metric='euclidean')
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def query(self, features: List[float], k: int):
+        """(distances, index rows) of the k nearest alumni, closest first"""
+        scaled = self.scaler.transform([features])
+        distances, positions = self.tree.query(scaled, k=min(k, len(self.rows)))
+        return distances[0], self.rows[positions[0]]
+
+
+class AlumniIndex:
+    def __init__(
+        self,
+        alumni_profiles: Optional[List[Dict[str, Any]]] = None,
+        vectorizer: Optional[TfidfVectorizer] = None
+    ):
+        """
+        Fit the TF-IDF vectorizer once over every alumnus and keep the
+        L2-normalized sparse CSR matrix (one row per alumnus) in memory.
+
+        The index can be built from a one-off pool or kept server-side and
+        maintained through upsert/delete. Every mutation bumps `version`;
+        matrices are rebuilt lazily on the next query. Callers that combine
+        several queries should hold `lock` so the rows stay consistent.
+
+        A prefitted `vectorizer` is only used to transform; the index then
+        shares vocabulary and IDF weights with whoever fitted it.
+
+        Profiles are not kept as dicts: `store` holds them column-wise and
+        `store.row_profile(row)` rebuilds a dict view when one is needed.
+        """
+        self.shared_vectorizer = vectorizer
+        self.store = AlumniFeatureStore.from_profiles(list(alumni_profiles or []))
+        self.version = 0
+        self._rows: Dict[Any, int] = {}
+        self.lock = threading.RLock()
+        self._dirty = True
+        self._reindex_rows()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def ids(self) -> List[Any]:
+        """Ids of the indexed profiles"""
+        return list(self._rows)
+
+    # ============ Mutations ============
+
+    def upsert(self, alumni_profiles: List[Dict[str, Any]]) -> int:
+        """Insert or replace profiles by id. Returns the new index version."""
+        if any(profile.get('id') is None for profile in alumni_profiles):
+            raise ValueError("Alumni profiles must have an 'id' to be indexed")
+
+        # Last occurrence wins within one request
+        latest = list({profile['id']: profile for profile in alumni_profiles}.values())
+
+        with self.lock:
+            # Append the new rows, then move replacements into the rows
+            # they replace. Copy-on-write so store snapshots held by
+            # readers never change.
+            size = len(self.store)
+            order = list(range(size))
+            for offset, profile in enumerate(latest):
+                row = self._rows.get(profile['id'])
+                if row is None:
+                    order.append(size + offset)
+                else:
+                    order[row] = size + offset
+            self.store = self.store.concat(AlumniFeatureStore.from_profiles(latest)).take(order)
+            self._reindex_rows()
+            return self._touch()
+
+    def delete(self, alumni_ids: Iterable[Any]) -> int:
+        """Remove profiles by id (unknown ids are ignored). Returns the new version."""
+        with self.lock:
+            to_remove = {alumni_id for alumni_id in alumni_ids if alumni_id in self._rows}
+            if not to_remove:
+                return self.version
+            keep = np.ones(len(self.store), dtype=bool)
+            keep[[self._rows[alumni_id] for alumni_id in to_remove]] = False
+            self.store = self.store.take(np.flatnonzero(keep))
+            self._reindex_rows()
+            return self._touch()
+
+    def set_vectorizer(self, vectorizer: Optional[TfidfVectorizer]) -> int:
+        """Swap the shared vectorizer; text rows are re-transformed lazily"""
+        with self.lock:
+            self.shared_vectorizer = vectorizer
+            return self._touch()
+
+    def _touch(self) -> int:
+        self.version += 1
+        self._dirty = True
+        return self.version
+
+    def _reindex_rows(self):
+        self._rows = {alumni_id: row for row, alumni_id in enumerate(self.store.ids)}
+
+    # ============ Build ============
+
+    def build(self):
+        """Build the matrices now instead of on the next query"""
+        with self.lock:
+            self._ensure_built()
+
+    def _ensure_built(self):
+        """Rebuild the matrices if the pool changed since the last query"""
+        if not self._dirty:
+            return
+        self._build_text_matrix()
+        self._build_skill_matrix()
+        self._build_feature_arrays()
+        self._lsh = None
+        self._lsh_params = None
+        self._knn = None
+        self._dirty = False
+
+    def _build_text_matrix(self):
+        """Corpus-wide TF-IDF fit over all alumni bio + headline text"""
+        texts = self.store.texts()
+        if self.shared_vectorizer is not None:
+            # Vocabulary and IDF fitted elsewhere (e.g. over all shards)
+            self.vectorizer = self.shared_vectorizer
+            self.text_matrix = self.vectorizer.transform(texts).tocsr()
+            return
+
+        self.vectorizer = make_text_vectorizer()
+        try:
+            self.text_matrix = self.vectorizer.fit_transform(texts).tocsr()
+        except ValueError:
+            # Empty vocabulary (no alumni text, or only stop words)
+            self.vectorizer = None
+            self.text_matrix = None
+
+    def _build_skill_matrix(self):
+        """Binary CSR matrix (alumni x skill) straight from the store's skill codes"""
+        store = self.store
+        self.skill_vocab: Dict[str, int] = store.skills.codes
+        self.skill_matrix = sparse.csr_matrix(
+            (np.ones(len(store.skill_codes), dtype=np.float32), store.skill_codes, store.skill_indptr),
+            shape=(len(store), len(store.skills))
+        )
+        # Number of distinct skills per alumnus, used for the union size
+        self.skill_counts = store.skill_counts()
+
+    def _build_feature_arrays(self):
+        """Per-alumnus experience scores for vectorized scoring"""
+        years = self.store.years
+        # Same buckets as ProfileMatcher.match: 2-8 years is the sweet spot
+        self.experience_scores = np.select(
+            [(years >= 2) & (years <= 8), years > 8],
+            [1.0, 0.8],
+            default=0.5
+        )
+
+    def _branch_code(self, branch: Any) -> int:
+        """Store code of a branch value, -1 if no alumnus has it"""
+        return self.store.branches.codes.get(branch, -1)
+
+    # ============ Queries ============
+
+    def candidate_mask(
+        self,
+        exclude_ids: Optional[Iterable[Any]] = None,
+        branch: Optional[str] = None
+    ) -> np.ndarray:
+        """Boolean row mask for the optional recommend filter"""
+        with self.lock:
+            mask = np.ones(len(self.store), dtype=bool)
+            for alumni_id in exclude_ids or []:
+                row = self._rows.get(alumni_id)
+                if row is not None:
+                    mask[row] = False
+            if branch:
+                mask &= self.store.branch_codes == self._branch_code(branch)
+            return mask
+
+    def lsh(self, **params) -> LSHIndex:
+        """LSH tables for approximate retrieval, cached until the pool or params change"""
+        with self.lock:
+            self._ensure_built()
+            if self._lsh is None or self._lsh_params != params:
+                self._lsh = LSHIndex(self.skill_matrix, self.text_matrix, **params)
+                self._lsh_params = params
+            return self._lsh
+
+    def knn_model(self) -> Optional[KNNModel]:
+        """Scaled k-NN feature matrix + KD-tree, cached until the pool changes"""
+        with self.lock:
+            self._ensure_built()
+            if self._knn is None:
+                features = self._knn_feature_matrix()
+                # Same rule as knn_features: rows with no data are left out
+                rows = np.flatnonzero(features.any(axis=1))
+                if not len(rows):
+                    return None
+                self._knn = KNNModel(features[rows], rows)
+            return self._knn
+
+    def _knn_feature_matrix(self) -> np.ndarray:
+        """knn_features for every alumnus, stacked from the store columns"""
+        store = self.store
+        branch_ids = np.array([KNN_BRANCH_MAP.get(b, 0) for b in store.branches.values], dtype=float)
+        return np.column_stack([
+            store.skill_counts(),
+            store.years,
+            [len(bio or '') for bio in store.bios],
+            [len(headline or '') for headline in store.headlines],
+            store.has_linkedin,
+            store.has_github,
+            store.has_resume,
+            branch_ids[store.branch_codes] if len(branch_ids) else np.zeros(len(store)),
+        ]).astype(float)
+
+    def ann_candidates(self, student_profile: Dict[str, Any], **params) -> np.ndarray:
+        """Candidate rows from MinHash (skills) and random-projection (text) LSH"""
+        with self.lock:
+            lsh = self.lsh(**params)
+            skill_ids = [self.skill_vocab[s] for s in profile_skills(student_profile) if s in self.skill_vocab]
+            return lsh.candidates(skill_ids, self._student_text_vector(student_profile))
+
+    def _student_text_vector(self, student_profile: Dict[str, Any]):
+        """TF-IDF vector of the student's text, or None if it has no known terms"""
+        student_text = profile_text(student_profile)
+        if self.vectorizer is None or not student_text.strip():
+            return None
+        student_vec = self.vectorizer.transform([student_text])
+        return student_vec if student_vec.nnz else None
+
+    def text_similarity(
+        self,
+        student_profile: Dict[str, Any],
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Cosine similarity between the student's text and every alumnus
+        (or only `rows`). Rows are already L2-normalized, so this is one
+        sparse mat-vec product.
+        """
+        with self.lock:
+            self._ensure_built()
+            scores = np.zeros(len(self.store) if rows is None else len(rows))
+            student_vec = self._student_text_vector(student_profile)
+            if student_vec is None:
+                return scores
+
+            matrix = self.text_matrix if rows is None else self.text_matrix[rows]
+            scores = (matrix @ student_vec.T).toarray().ravel()
+            return np.clip(scores, 0.0, 1.0)
+
+    def skills_overlap(
+        self,
+        student_profile: Dict[str, Any],
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Jaccard similarity between the student's skills and every alumnus
+        (or only `rows`). Intersections come from one sparse dot product;
+        unions from row sums.
+        """
+        with self.lock:
+            self._ensure_built()
+            scores = np.zeros(len(self.store) if rows is None else len(rows))
+            student_skills = profile_skills(student_profile)
+            if not student_skills or not self.skill_vocab:
+                return scores
+
+            columns = [self.skill_vocab[s] for s in student_skills if s in self.skill_vocab]
+            student_vec = np.zeros(len(self.skill_vocab), dtype=np.float32)
+            student_vec[columns] = 1.0
+
+            matrix = self.skill_matrix if rows is None else self.skill_matrix[rows]
+            counts = self.skill_counts if rows is None else self.skill_counts[rows]
+            intersection = matrix @ student_vec
+            union = counts + len(student_skills) - intersection
+            # Alumni without skills score 0, matching ProfileMatcher.match
+            np.divide(intersection, union, out=scores, where=counts > 0)
+            return scores
+
+    def branch_match(
+        self,
+        student_profile: Dict[str, Any],
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Branch score for every alumnus (or `rows`): 1.0 on a match, 0.3 otherwise"""
+        with self.lock:
+            self._ensure_built()
+            codes = self.store.branch_codes if rows is None else self.store.branch_codes[rows]
+            return np.where(codes == self._branch_code(student_profile.get('branch', '')), 1.0, 0.3)
+
+    def experience_relevance(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Experience score for every alumnus or `rows` (student-independent)"""
+        with self.lock:
+            self._ensure_built()
+            return self.experience_scores if rows is None else self.experience_scores[rows]
+
+    # ============ Batch queries (students x alumni) ============
+
+    def rows_for_ids(self, alumni_ids: Iterable[Any]) -> np.ndarray:
+        """Row numbers of the given alumni ids (unknown ids are skipped)"""
+        with self.lock:
+            rows = [self._rows[i] for i in alumni_ids if i in self._rows]
+            return np.array(rows, dtype=np.int64)
+
+    def batch_text_similarity(self, student_profiles: List[Dict[str, Any]]) -> np.ndarray:
+        """(students x alumni) cosine similarities from one sparse product"""
+        with self.lock:
+            self._ensure_built()
+            scores = np.zeros((len(student_profiles), len(self.store)))
+            if self.vectorizer is None or not len(self.store):
+                return scores
+            student_matrix = self.vectorizer.transform([profile_text(p) for p in student_profiles])
+            scores = (student_matrix @ self.text_matrix.T).toarray()
+            return np.clip(scores, 0.0, 1.0)
+
+    def batch_skills_overlap(self, student_profiles: List[Dict[str, Any]]) -> np.ndarray:
+        """(students x alumni) Jaccard similarities from one sparse product"""
+        with self.lock:
+            self._ensure_built()
+            student_skills = [profile_skills(p) for p in student_profiles]
+            indptr = [0]
+            indices = []
+            for skills in student_skills:
+                indices.extend(self.skill_vocab[s] for s in skills if s in self.skill_vocab)
+                indptr.append(len(indices))
+            student_matrix = sparse.csr_matrix(
+                (np.ones(len(indices), dtype=np.float32), indices, indptr),
+                shape=(len(student_profiles), len(self.skill_vocab))
+            )
+            student_counts = np.array([len(skills) for skills in student_skills])
+
+            intersection = (student_matrix @ self.skill_matrix.T).toarray()
+            union = student_counts[:, None] + self.skill_counts[None, :] - intersection
+            has_skills = (student_counts[:, None] > 0) & (self.skill_counts[None, :] > 0)
+            scores = np.zeros(intersection.shape)
+            np.divide(intersection, union, out=scores, where=has_skills)
+            return scores
+
+    def batch_branch_match(self, student_profiles: List[Dict[str, Any]]) -> np.ndarray:
+        """(students x alumni) branch scores via categorical code comparison"""
+        with self.lock:
+            self._ensure_built()
+            student_codes = np.array(
+                [self._branch_code(p.get('branch', '')) for p in student_profiles],
+                dtype=np.int32
+            )
+            return np.where(student_codes[:, None] == self.store.branch_codes[None, :], 1.0, 0.3)
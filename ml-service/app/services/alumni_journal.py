@@ -0,0 +1,222 @@
+"""
+Alumni Index Journal
+Upserts and deletes of the server-side alumni index, appended to a log that
+every worker process replays, so each worker's in-memory index (single or
+sharded) holds the same pool
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import threading
+
+from .file_lock import exclusive_lock
+
+SNAPSHOT_FILE = 'snapshot.jsonl'
+LOCK_FILE = '.lock'
+# Entry operation -> the list it carries
+ENTRY_FIELDS = {'upsert': 'profiles', 'delete': 'ids'}
+# The log is folded into the snapshot once it is larger than both this and
+# the snapshot, so compaction is amortized over the appends
+COMPACT_MIN_BYTES = 4 * 1024 * 1024
+
+
+class AlumniJournal:
+    def __init__(self, data_dir: str = 'models/alumni_index'):
+        """
+        data_dir holds a snapshot of the pool, snapshot.jsonl (a header line
+        {"generation", "version"}, then one profile per line), and the log of
+        changes since, journal.<generation + 1>.log (one {"op": "upsert",
+        "profiles"} or {"op": "delete", "ids"} entry per line). `version`
+        counts the entries applied, so it is the same in every worker that
+        has caught up. The log before the last compaction is kept, so a
+        worker that was idle through one compaction still catches up by
+        replaying; one idle through more reloads the snapshot.
+        """
+        self.data_dir = data_dir
+        self.version = 0
+        # Snapshot generation and log offset this process has applied up to;
+        # None until the first sync loads the snapshot
+        self._generation: Optional[int] = None
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    # ============ Public API ============
+
+    def sync(self, index) -> int:
+        """Apply the entries other workers appended since the last call"""
+        with self._lock, self._file_lock():
+            self._replay(index)
+        return self.version
+
+    def upsert(self, index, alumni_profiles: List[Dict[str, Any]]) -> int:
+        """Journal and apply an upsert; returns the journal version"""
+        if any(profile.get('id') is None for profile in alumni_profiles):
+            raise ValueError("Alumni profiles must have an 'id' to be indexed")
+        return self._write(index, {'op': 'upsert', 'profiles': alumni_profiles})
+
+    def delete(self, index, alumni_ids: Iterable[Any]) -> int:
+        """Journal and apply a delete; returns the journal version"""
+        return self._write(index, {'op': 'delete', 'ids': list(alumni_ids)})
+
+    def _write(self, index, entry: Dict[str, Any]) -> int:
+        # Validated before it is journaled: every worker replays it
+        line = (json.dumps(entry) + '\n').encode('utf-8')
+        with self._lock, self._file_lock():
+            self._replay(index)
+            size = self._append(line)
+            self._replay(index)
+            if size > max(COMPACT_MIN_BYTES, self._size(self._snapshot_path())):
+                self._compact()
+        return self.version
+
+    # ============ Files ============
+
+    def _file_lock(self):
+        return exclusive_lock(os.path.join(self.data_dir, LOCK_FILE))
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.data_dir, SNAPSHOT_FILE)
+
+    def _log_path(self, generation: int) -> str:
+        """Log of the entries added after the snapshot of `generation` - 1"""
+        return os.path.join(self.data_dir, f"journal.{generation}.log")
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _read_header(self) -> Dict[str, int]:
+        try:
+            with open(self._snapshot_path()) as f:
+                header = json.loads(f.readline())
+            return {'generation': int(header['generation']), 'version': int(header['version'])}
+        except FileNotFoundError:
+            return {'generation': 0, 'version': 0}
+        except (ValueError, KeyError, TypeError) as e:
+            raise RuntimeError(f"Alumni index snapshot {self._snapshot_path()} is unreadable: {e}")
+
+    def _read_snapshot(self) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """Header and profiles of the snapshot"""
+        header = self._read_header()
+        profiles = []
+        try:
+            with open(self._snapshot_path()) as f:
+                f.readline()
+                profiles = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            raise RuntimeError(f"Alumni index snapshot {self._snapshot_path()} is unreadable: {e}")
+        return header, profiles
+
+    @staticmethod
+    def _read_entries(path: str, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Entries of a log from byte `offset` on and the offset after them.
+        A line cut short by a crash is skipped the same way by every worker.
+        """
+        entries = []
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict) and isinstance(entry.get(ENTRY_FIELDS.get(entry.get('op'))), list):
+                        entries.append(entry)
+                return entries, f.tell()
+        except FileNotFoundError:
+            return [], offset
+
+    def _append(self, line: bytes) -> int:
+        """Append one entry to the current log; returns the log size"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        with open(self._log_path(self._generation + 1), 'a+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                # Terminate a line cut short by a crash instead of gluing onto it
+                f.seek(size - 1)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+            return size + len(line)
+
+    # ============ Replay (under the file lock) ============
+
+    def _replay(self, index):
+        header = self._read_header()
+        if self._generation is not None and header['generation'] == self._generation + 1:
+            # Compacted since the last sync: finish the folded log first
+            entries, _ = self._read_entries(self._log_path(header['generation']), self._offset)
+            self._apply(index, entries)
+            self._generation, self._offset = header['generation'], 0
+        elif self._generation != header['generation']:
+            self._reload(index)
+
+        entries, self._offset = self._read_entries(self._log_path(self._generation + 1), self._offset)
+        self._apply(index, entries)
+
+    def _reload(self, index):
+        """Replace the index contents with the snapshot"""
+        header, profiles = self._read_snapshot()
+        stale = set(index.ids()) - {profile['id'] for profile in profiles}
+        if stale:
+            index.delete(stale)
+        if profiles:
+            index.upsert(profiles)
+        self._generation, self._offset = header['generation'], 0
+        self.version = header['version']
+
+    def _apply(self, index, entries: List[Dict[str, Any]]):
+        """
+        Apply entries in order, merging runs of the same operation into one
+        index call (an upsert rebuilds the whole store, so replaying many
+        small entries one by one would be quadratic)
+        """
+        run_op, run = None, []
+        for entry in entries + [{'op': None}]:
+            if entry['op'] != run_op and run:
+                if run_op == 'upsert':
+                    index.upsert(run)
+                else:
+                    index.delete(run)
+                run = []
+            run_op = entry['op']
+            if run_op is not None:
+                run.extend(entry[ENTRY_FIELDS[run_op]])
+        self.version += len(entries)
+
+    def _compact(self):
+        """
+        Fold the current log into a new snapshot of the next generation and
+        remove the logs before it. The snapshot names its generation and
+        version, so a crash mid-compaction cannot apply the folded log twice.
+        """
+        header, profiles = self._read_snapshot()
+        pool = {profile['id']: profile for profile in profiles}
+        entries, _ = self._read_entries(self._log_path(header['generation'] + 1), 0)
+        for entry in entries:
+            if entry['op'] == 'upsert':
+                pool.update((profile['id'], profile) for profile in entry['profiles'])
+            else:
+                for alumni_id in entry['ids']:
+                    pool.pop(alumni_id, None)
+
+        generation = header['generation'] + 1
+        path = self._snapshot_path()
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({'generation': generation, 'version': header['version'] + len(entries)}) + '\n')
+            for profile in pool.values():
+                f.write(json.dumps(profile) + '\n')
+        os.replace(tmp_path, path)
+        for name in os.listdir(self.data_dir):
+            number = name[len('journal.'):-len('.log')]
+            if name.startswith('journal.') and name.endswith('.log') and number.isdigit() and int(number) < generation:
+                os.remove(os.path.join(self.data_dir, name))
+        self._generation, self._offset = generation, 0
@@ -0,0 +1,240 @@
+"""
+Memory-Mapped Model Artifacts
+Saves fitted vectorizer + linear classifier pairs as .npy arrays plus a small
+pickle, so every worker process can np.load them with mmap_mode='r' and
+share the pages through the OS page cache
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import copy
+import os
+import shutil
+
+from scipy import sparse
+from sklearn.preprocessing import normalize
+import joblib
+import numpy as np
+
+META_FILE = 'meta.pkl'
+# Pointer to the live version directory, replaced atomically on publish
+CURRENT_FILE = 'CURRENT'
+
+# Fitted arrays stored as .npy files instead of inside the pickle
+_CLASSIFIER_ARRAYS = ('coef_', 'intercept_')
+
+
+class MappedVocabulary(Mapping):
+    """
+    Read-only term -> column mapping over two arrays: UTF-8 terms sorted
+    as fixed-width bytes, and their columns. Lookups are a binary search,
+    so the arrays can stay memory-mapped instead of becoming a dict of
+    Python strings in every process.
+    """
+
+    def __init__(self, terms: np.ndarray, columns: np.ndarray):
+        self.terms = terms
+        self.columns = columns
+
+    @staticmethod
+    def arrays_from_dict(vocabulary: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        encoded = sorted((term.encode('utf-8'), column) for term, column in vocabulary.items())
+        terms = np.array([term for term, _ in encoded], dtype=bytes)
+        columns = np.array([column for _, column in encoded], dtype=np.int32)
+        return terms, columns
+
+    def lookup(self, tokens: List[str]) -> np.ndarray:
+        """Columns of many tokens in one vectorized search; -1 where unknown"""
+        if not tokens or not len(self.terms):
+            return np.full(len(tokens), -1, dtype=np.int64)
+        keys = np.array([token.encode('utf-8') for token in tokens], dtype=bytes)
+        # Keys longer than the widest term are truncated for the search,
+        # then fail the exact comparison below
+        pos = np.searchsorted(self.terms, keys.astype(self.terms.dtype))
+        pos = np.minimum(pos, len(self.terms) - 1)
+        found = self.terms[pos] == keys
+        return np.where(found, self.columns[pos], -1).astype(np.int64)
+
+    def __getitem__(self, term: str) -> int:
+        column = int(self.lookup([term])[0])
+        if column < 0:
+            raise KeyError(term)
+        return column
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __iter__(self) -> Iterator[str]:
+        return (term.decode('utf-8') for term in self.terms)
+
+
+class MappedTfidfVectorizer:
+    """
+    transform()-compatible stand-in for a fitted TfidfVectorizer whose
+    vocabulary and IDF weights are mapped arrays. Tokenization is the
+    original vectorizer's analyzer; the tokens of a whole batch are looked
+    up with one binary search instead of a dict lookup per token.
+    """
+
+    def __init__(self, vectorizer: Any, vocabulary: MappedVocabulary, idf: Optional[np.ndarray]):
+        self.vectorizer = vectorizer
+        self.vocabulary_ = vocabulary
+        self.idf_ = idf
+        self._analyze = vectorizer.build_analyzer()
+
+    def transform(self, raw_documents: List[str]) -> sparse.csr_matrix:
+        analyzed = [self._analyze(doc) for doc in raw_documents]
+        lengths = np.array([len(tokens) for tokens in analyzed], dtype=np.int64)
+        columns = self.vocabulary_.lookup([token for tokens in analyzed for token in tokens])
+        rows = np.repeat(np.arange(len(analyzed)), lengths)
+        known = columns >= 0
+
+        # Term counts (duplicates are summed by the CSR conversion)
+        X = sparse.csr_matrix(
+            (np.ones(int(known.sum())), (rows[known], columns[known])),
+            shape=(len(analyzed), len(self.vocabulary_)),
+            dtype=np.float64
+        )
+        X.sum_duplicates()
+        if self.vectorizer.binary:
+            X.data[:] = 1.0
+        if self.vectorizer.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1.0
+        if self.idf_ is not None:
+            X.data *= self.idf_[X.indices]
+        if self.vectorizer.norm is not None:
+            X = normalize(X, norm=self.vectorizer.norm, copy=False)
+        return X
+
+
+def _skeleton(obj: Any, drop: Tuple[str, ...]) -> Any:
+    """Shallow copy of an estimator without the given (large) attributes"""
+    skeleton = copy.copy(obj)
+    for name in drop:
+        skeleton.__dict__.pop(name, None)
+    return skeleton
+
+
+def save_text_model(directory: str, vectorizer: Any, classifier: Any, meta: Optional[Dict[str, Any]] = None):
+    """
+    Write a fitted vectorizer + linear classifier into `directory`:
+    vocabulary, IDF weights and coefficients as .npy files, everything
+    else (hyper-parameters, classes, small state) in meta.pkl. The
+    directory is written under a temporary name and renamed into place;
+    it may exist only if empty (reserved by reserve_version), so a
+    published version is never overwritten.
+    """
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    vectorizer_drop = ('vocabulary_', 'stop_words_', '_tfidf')
+    vocabulary = getattr(vectorizer, 'vocabulary_', None)
+    if vocabulary is not None:
+        terms, columns = MappedVocabulary.arrays_from_dict(vocabulary)
+        np.save(os.path.join(tmp_dir, 'vocab_terms.npy'), terms)
+        np.save(os.path.join(tmp_dir, 'vocab_columns.npy'), columns)
+
+    tfidf = getattr(vectorizer, '_tfidf', None)
+    if tfidf is not None and hasattr(tfidf, 'idf_'):
+        np.save(os.path.join(tmp_dir, 'idf.npy'), tfidf.idf_)
+
+    for name in _CLASSIFIER_ARRAYS:
+        np.save(os.path.join(tmp_dir, f"{name.rstrip('_')}.npy"), getattr(classifier, name))
+
+    joblib.dump({
+        'vectorizer': _skeleton(vectorizer, vectorizer_drop),
+        'classifier': _skeleton(classifier, _CLASSIFIER_ARRAYS),
+        'meta': meta or {}
+    }, os.path.join(tmp_dir, META_FILE))
+
+    rename_into_place(tmp_dir, directory)
+
+
+def rename_into_place(tmp_dir: str, directory: str):
+    """Rename a finished tmp_dir to `directory`, which must be missing or empty"""
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def load_text_model(directory: str, mmap: bool = True) -> Tuple[Any, Any, Dict[str, Any]]:
+    """
+    (vectorizer, classifier, meta) from save_text_model; arrays are
+    read-only memmaps. A fitted TF-IDF vectorizer comes back as a
+    MappedTfidfVectorizer; stateless ones (HashingVectorizer) as saved.
+    """
+    mmap_mode = 'r' if mmap else None
+
+    def array(name: str) -> Optional[np.ndarray]:
+        path = os.path.join(directory, f"{name}.npy")
+        return np.load(path, mmap_mode=mmap_mode) if os.path.exists(path) else None
+
+    saved = joblib.load(os.path.join(directory, META_FILE))
+    vectorizer, classifier = saved['vectorizer'], saved['classifier']
+
+    terms = array('vocab_terms')
+    if terms is not None:
+        vectorizer = MappedTfidfVectorizer(vectorizer, MappedVocabulary(terms, array('vocab_columns')), array('idf'))
+
+    for name in _CLASSIFIER_ARRAYS:
+        setattr(classifier, name, array(name.rstrip('_')))
+    return vectorizer, classifier, saved['meta']
+
+
+def _version_numbers(root: str) -> List[int]:
+    return sorted(
+        int(entry[1:]) for entry in os.listdir(root)
+        if entry.startswith('v') and entry[1:].isdigit()
+    )
+
+
+def reserve_version(root: str) -> Tuple[int, str]:
+    """
+    Claim the next version number under root by creating its (empty)
+    directory. mkdir is atomic and fails if the directory exists, so
+    processes saving at the same time never get the same number, and a
+    version number always names the same model in every process.
+    """
+    os.makedirs(root, exist_ok=True)
+    numbers = _version_numbers(root)
+    version = (numbers[-1] if numbers else 0) + 1
+    while True:
+        name = f"v{version}"
+        try:
+            os.mkdir(os.path.join(root, name))
+            return version, name
+        except FileExistsError:
+            version += 1
+
+
+def publish_version(root: str, name: str, keep: int = 3):
+    """
+    Point root/CURRENT at the version directory `name` (atomic rename) and
+    delete all but the newest `keep` version directories older than it.
+    Empty directories are versions another process is still writing and
+    are left alone. Processes that still map an old version keep their
+    pages until they reload.
+    """
+    tmp_path = os.path.join(root, f"{CURRENT_FILE}.tmp-{os.getpid()}")
+    with open(tmp_path, 'w') as f:
+        f.write(name)
+    os.replace(tmp_path, os.path.join(root, CURRENT_FILE))
+
+    numbers = _version_numbers(root)
+    for number in numbers[:-keep]:
+        path = os.path.join(root, f"v{number}")
+        if number < int(name[1:]) and os.listdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def current_version(root: str) -> Optional[str]:
+    """Name of the live version directory under root, or None"""
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return name if name and os.path.isdir(os.path.join(root, name)) else None
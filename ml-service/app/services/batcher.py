@@ -0,0 +1,97 @@
+"""
+Dynamic Micro-Batching
+Coalesces concurrent small requests into one call of a batch function
+"""
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+
+from .executor import BoundedExecutor
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch: int = 64,
+        max_wait_ms: float = 5.0,
+        executor: Optional[BoundedExecutor] = None
+    ):
+        """
+        Callers submit lists of items. Items are gathered until max_batch
+        items are pending or max_wait_ms has passed since the first one,
+        then batch_fn runs once over all of them (on `executor` if given)
+        and each caller gets back its own slice. batch_fn must return one
+        result per item, in order. Must be used from a single event loop.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.executor = executor
+        self._pending: List[tuple] = []  # (items, future)
+        self._pending_items = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = set()  # strong refs so running batches are not collected
+        self.batches = 0
+        self.items = 0
+        self.requests = 0
+
+    async def submit(self, items: List[Any]) -> List[Any]:
+        """Results for `items`, computed together with other pending requests"""
+        if not items:
+            return []
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((items, future))
+        self._pending_items += len(items)
+
+        if self._pending_items >= self.max_batch or self.max_wait == 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_items = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[tuple]):
+        items = [item for request_items, _ in batch for item in request_items]
+        self.batches += 1
+        self.items += len(items)
+        self.requests += len(batch)
+        try:
+            if self.executor is not None:
+                results = await self.executor.submit(self.batch_fn, items)
+            else:
+                results = self.batch_fn(items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for request_items, future in batch:
+            if not future.done():  # caller may have gone away
+                future.set_result(results[offset:offset + len(request_items)])
+            offset += len(request_items)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'max_batch': self.max_batch,
+            'max_wait_ms': round(self.max_wait * 1000, 3),
+            'batches': self.batches,
+            'requests': self.requests,
+            'items': self.items,
+            'avg_batch_items': round(self.items / self.batches, 2) if self.batches else 0.0,
+            'pending_items': self._pending_items
+        }
@@ -0,0 +1,72 @@
+"""
+Disk-Streamed Corpora
+Re-iterable text and token streams over a local JSONL or plain-text file,
+and a bag-of-words corpus serialized to Matrix Market, so topic models can
+be trained on corpora larger than memory
+"""
+from gensim import corpora
+from typing import Callable, Iterable, Iterator, List, Sequence
+import json
+import os
+
+
+class TextFileCorpus:
+    def __init__(self, path: str, field: str = 'text'):
+        """
+        Texts of a file, read lazily on every iteration: .jsonl/.ndjson
+        files hold one JSON object per line (text under `field`), any other
+        file one document per line. Blank lines are skipped.
+        """
+        if not os.path.isfile(path):
+            raise ValueError(f"Corpus file not found: {path}")
+        self.path = path
+        self.field = field
+        self.jsonl = path.endswith(('.jsonl', '.ndjson'))
+
+    def __iter__(self) -> Iterator[str]:
+        with open(self.path, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                if not self.jsonl:
+                    yield line
+                    continue
+                try:
+                    text = json.loads(line)[self.field]
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f"Line {line_no}: expected a JSON object with '{self.field}' ({e})")
+                if not isinstance(text, str):
+                    raise ValueError(f"Line {line_no}: '{self.field}' must be a string")
+                yield text
+
+
+class TokenStream:
+    def __init__(self, texts: Iterable[str], preprocess: Callable[[str], Sequence[str]], min_tokens: int = 4):
+        """Token lists of the texts with at least min_tokens tokens, re-tokenized on every iteration"""
+        self.texts = texts
+        self.preprocess = preprocess
+        self.min_tokens = min_tokens
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for text in self.texts:
+            tokens = self.preprocess(text)
+            if len(tokens) >= self.min_tokens:
+                yield tokens
+
+
+def build_dictionary(docs: Iterable[List[str]], no_below: int = 2, no_above: float = 0.8) -> corpora.Dictionary:
+    """Dictionary from one pass over the stream; memory grows with the vocabulary only"""
+    dictionary = corpora.Dictionary(docs)
+    dictionary.filter_extremes(no_below=no_below, no_above=no_above)
+    return dictionary
+
+
+def serialize_corpus(path: str, docs: Iterable[List[str]], dictionary: corpora.Dictionary) -> corpora.MmCorpus:
+    """
+    Write the bag-of-words corpus to `path` in Matrix Market format (plus a
+    document offset index) in one streaming pass and open it for reading.
+    MmCorpus reads documents from the file on every iteration, so only
+    the OS page cache holds the corpus.
+    """
+    corpora.MmCorpus.serialize(path, (dictionary.doc2bow(doc) for doc in docs), id2word=dictionary)
+    return corpora.MmCorpus(path)
@@ -0,0 +1,216 @@
+"""
+Bounded Executor Pools
+Runs CPU-bound ML work off the event loop on a thread or process pool with
+a bounded queue, rejecting new work when saturated
+"""
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import functools
+import multiprocessing
+import threading
+import time
+
+
+class PoolSaturated(Exception):
+    def __init__(self, pool: str, status_code: int, message: str):
+        """status_code is the HTTP status to answer with (429 or 503)"""
+        super().__init__(message)
+        self.pool = pool
+        self.status_code = status_code
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    """Runs in the worker: returns (start wall time, result) for wait metrics"""
+    # Wall clock rather than monotonic so it is comparable across processes
+    started_at = time.time()
+    return started_at, fn(*args, **kwargs)
+
+
+class BoundedExecutor:
+    # Wait times kept for the percentile metrics
+    WAIT_SAMPLES = 1024
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        max_workers: int,
+        max_queue: int,
+        initializer: Optional[Callable] = None
+    ):
+        """
+        kind='thread' suits NumPy/scikit-learn code that releases the GIL;
+        kind='process' suits pure-Python work (YAKE, RAKE, gensim LDA), whose
+        function and arguments must be picklable. At most max_workers +
+        max_queue tasks are admitted; beyond that submit() raises
+        PoolSaturated (429). When a process pool worker dies, the tasks it
+        took down answer 503 and the pool is replaced with a fresh one, so
+        later submissions succeed again. `initializer` runs once in every
+        worker (process pools only).
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind '{kind}', expected 'thread' or 'process'")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max(0, max_queue)
+        self._initializer = initializer
+        self._executor = self._new_executor()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._closed = False
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self._waits = deque(maxlen=self.WAIT_SAMPLES)
+
+    def _new_executor(self):
+        if self.kind == 'thread':
+            return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"ml-{self.name}")
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=self._initializer
+        )
+
+    def _replace_broken(self, broken):
+        """Swap a broken process pool for a fresh one (once per breakage)"""
+        with self._lock:
+            if self._closed or self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    # ============ Submission ============
+
+    def submit(self, fn: Callable, *args, **kwargs) -> "asyncio.Future":
+        """
+        Admit fn(*args, **kwargs) and return an awaitable for its result.
+        Must be called from the event loop. Raises PoolSaturated right away
+        instead of queueing without bound.
+        """
+        with self._lock:
+            if self._closed:
+                raise PoolSaturated(self.name, 503, f"The {self.name} pool is shut down")
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturated(
+                    self.name, 429,
+                    f"The {self.name} pool is saturated ({self._in_flight} tasks in flight), retry later"
+                )
+            self._in_flight += 1
+            self.submitted += 1
+            executor = self._executor
+
+        submitted_at = time.time()
+        try:
+            try:
+                future = executor.submit(_timed_call, fn, args, kwargs)
+            except BrokenProcessPool:
+                # Died since the last task finished: retry once on a fresh pool
+                self._replace_broken(executor)
+                executor = self._executor
+                future = executor.submit(_timed_call, fn, args, kwargs)
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._finish(None, failed=True)
+            raise PoolSaturated(self.name, 503, f"The {self.name} pool is unavailable: {e}")
+        future.add_done_callback(functools.partial(self._on_done, submitted_at))
+        return asyncio.ensure_future(self._result(asyncio.wrap_future(future), executor))
+
+    async def _result(self, future: "asyncio.Future", executor) -> Any:
+        try:
+            _, result = await future
+        except BrokenProcessPool as e:
+            self._replace_broken(executor)
+            raise PoolSaturated(self.name, 503, f"The {self.name} pool lost a worker: {e}")
+        return result
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """submit() and await the result"""
+        return await self.submit(fn, *args, **kwargs)
+
+    async def run_when_available(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        run(), but while the pool is full wait for room (exponential
+        backoff up to 0.5 s) instead of raising 429. For bulk work that has
+        already been accepted; a dead or shut-down pool still raises.
+        """
+        delay = 0.01
+        while True:
+            try:
+                job = self.submit(fn, *args, **kwargs)
+            except PoolSaturated as e:
+                if e.status_code != 429:
+                    raise
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.5)
+                continue
+            return await job
+
+    def _on_done(self, submitted_at: float, future):
+        # Runs on the worker thread (thread pool) or the pool's manager thread
+        wait = None
+        failed = future.cancelled() or future.exception() is not None
+        if not failed:
+            started_at, _ = future.result()
+            wait = max(0.0, started_at - submitted_at)
+        self._finish(wait, failed)
+
+    def _finish(self, wait, failed: bool):
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self._waits.append(wait)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    # ============ Metrics ============
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, rejections and queue wait (ms) of recently finished tasks"""
+        with self._lock:
+            in_flight = self._in_flight
+            waits = sorted(self._waits)
+            counters = {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'restarts': self.restarts,
+            }
+
+        def percentile(q: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 2)
+
+        return {
+            'kind': self.kind,
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': in_flight,
+            # Tasks beyond the worker count are waiting for a free worker
+            'queue_depth': max(0, in_flight - self.max_workers),
+            **counters,
+            'wait_ms': {
+                'mean': round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+                'p50': percentile(0.50),
+                'p95': percentile(0.95),
+                'max': round(waits[-1] * 1000, 2) if waits else 0.0,
+            }
+        }
@@ -0,0 +1,195 @@
+"""
+Columnar Alumni Feature Store
+NumPy columns for numeric/boolean fields, categorical codes for branch
+and skills, and interned string tables instead of per-alumnus dicts
+"""
+from typing import List, Dict, Any, Optional
+import math
+import sys
+import numpy as np
+
+
+def _intern(value: Any) -> Any:
+    """Interned string so repeated values (companies, names) share storage"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _years(value: Any) -> float:
+    """
+    Years of experience as a float; missing or non-numeric values count as
+    0, so one malformed profile does not fail the whole pool
+    """
+    try:
+        years = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return years if math.isfinite(years) else 0.0
+
+
+def _object_column(values: List[Any]) -> np.ndarray:
+    """1-D object array (np.array would nest list/tuple values)"""
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+class _Categories:
+    """Append-only table of category values with value -> code lookup"""
+
+    def __init__(self, values: Optional[List[Any]] = None):
+        self.values: List[Any] = []
+        self.codes: Dict[Any, int] = {}
+        for value in values or []:
+            self.code(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def copy(self) -> '_Categories':
+        return _Categories(self.values)
+
+
+class AlumniFeatureStore:
+    def __init__(self):
+        """Empty store; use from_profiles / take / concat to build new ones"""
+        self.ids = np.empty(0, dtype=object)
+        self.names = np.empty(0, dtype=object)
+        self.headlines = np.empty(0, dtype=object)
+        self.companies = np.empty(0, dtype=object)
+        self.bios = np.empty(0, dtype=object)
+        self.years = np.empty(0, dtype=np.float64)
+        self.has_linkedin = np.empty(0, dtype=bool)
+        self.has_github = np.empty(0, dtype=bool)
+        self.has_resume = np.empty(0, dtype=bool)
+        self.branches = _Categories()
+        self.branch_codes = np.empty(0, dtype=np.int32)
+        # Skills as CSR: row i owns skill_codes[skill_indptr[i]:skill_indptr[i + 1]]
+        self.skills = _Categories()
+        self.skill_indptr = np.zeros(1, dtype=np.int64)
+        self.skill_codes = np.empty(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_profiles(cls, profiles: List[Dict[str, Any]]) -> 'AlumniFeatureStore':
+        """Single pass over profile dicts into columns"""
+        store = cls()
+        store.ids = _object_column([p.get('id') for p in profiles])
+        store.names = _object_column([_intern(p.get('name', 'Unknown')) for p in profiles])
+        store.headlines = _object_column([p.get('headline', '') for p in profiles])
+        store.companies = _object_column([_intern(p.get('company', '')) for p in profiles])
+        store.bios = _object_column([p.get('bio', '') for p in profiles])
+        store.years = np.array([_years(p.get('years_of_experience')) for p in profiles], dtype=np.float64)
+        store.has_linkedin = np.array([bool(p.get('linkedin_url')) for p in profiles], dtype=bool)
+        store.has_github = np.array([bool(p.get('github_url')) for p in profiles], dtype=bool)
+        store.has_resume = np.array([bool(p.get('resume_url')) for p in profiles], dtype=bool)
+        store.branch_codes = np.array(
+            [store.branches.code(p.get('branch', '')) for p in profiles], dtype=np.int32
+        )
+
+        indptr = [0]
+        codes = []
+        for p in profiles:
+            # Distinct skills, first occurrence order
+            codes.extend(store.skills.code(s) for s in dict.fromkeys(p.get('skills') or []))
+            indptr.append(len(codes))
+        store.skill_indptr = np.array(indptr, dtype=np.int64)
+        store.skill_codes = np.array(codes, dtype=np.int32)
+        return store
+
+    # ============ Row selection ============
+
+    def take(self, rows: np.ndarray) -> 'AlumniFeatureStore':
+        """New store with only the given rows (category tables are shared)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        store = AlumniFeatureStore()
+        for name in ('ids', 'names', 'headlines', 'companies', 'bios', 'years',
+                     'has_linkedin', 'has_github', 'has_resume', 'branch_codes'):
+            setattr(store, name, getattr(self, name)[rows])
+        store.branches = self.branches.copy()
+        store.skills = self.skills.copy()
+
+        counts = np.diff(self.skill_indptr)[rows]
+        store.skill_indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        offsets = np.repeat(self.skill_indptr[:-1][rows] - store.skill_indptr[:-1], counts)
+        store.skill_codes = self.skill_codes[offsets + np.arange(store.skill_indptr[-1], dtype=np.int64)]
+        return store
+
+    def concat(self, other: 'AlumniFeatureStore') -> 'AlumniFeatureStore':
+        """New store with other's rows appended, remapping its category codes"""
+        store = AlumniFeatureStore()
+        for name in ('ids', 'names', 'headlines', 'companies', 'bios', 'years',
+                     'has_linkedin', 'has_github', 'has_resume'):
+            setattr(store, name, np.concatenate([getattr(self, name), getattr(other, name)]))
+
+        store.branches = self.branches.copy()
+        branch_map = np.array([store.branches.code(v) for v in other.branches.values], dtype=np.int32)
+        store.branch_codes = np.concatenate([self.branch_codes, branch_map[other.branch_codes]]) \
+            if len(other) else self.branch_codes.copy()
+
+        store.skills = self.skills.copy()
+        skill_map = np.array([store.skills.code(v) for v in other.skills.values], dtype=np.int32)
+        other_codes = skill_map[other.skill_codes] if len(other.skill_codes) else other.skill_codes
+        store.skill_codes = np.concatenate([self.skill_codes, other_codes]).astype(np.int32)
+        store.skill_indptr = np.concatenate([self.skill_indptr, other.skill_indptr[1:] + self.skill_indptr[-1]])
+        return store
+
+    # ============ Column views ============
+
+    def texts(self) -> List[str]:
+        """bio + headline per row, as used for TF-IDF"""
+        return [f"{bio or ''} {headline or ''}" for bio, headline in zip(self.bios, self.headlines)]
+
+    def skill_counts(self) -> np.ndarray:
+        return np.diff(self.skill_indptr)
+
+    def row_skills(self, row: int) -> List[str]:
+        codes = self.skill_codes[self.skill_indptr[row]:self.skill_indptr[row + 1]]
+        return [self.skills.values[c] for c in codes]
+
+    def row_years(self, row: int):
+        """Years of experience as int when whole (keeps explanations unchanged)"""
+        years = float(self.years[row])
+        return int(years) if years.is_integer() else years
+
+    def row_profile(self, row: int) -> Dict[str, Any]:
+        """
+        Lightweight dict view of one row for ProfileMatcher and result
+        rendering. URL fields are reduced to presence flags.
+        """
+        return {
+            'id': self.ids[row],
+            'name': self.names[row],
+            'headline': self.headlines[row],
+            'company': self.companies[row],
+            'bio': self.bios[row],
+            'skills': self.row_skills(row),
+            'branch': self.branches.values[self.branch_codes[row]],
+            'years_of_experience': self.row_years(row),
+            'linkedin_url': bool(self.has_linkedin[row]),
+            'github_url': bool(self.has_github[row]),
+            'resume_url': bool(self.has_resume[row]),
+        }
+
+    def nbytes(self) -> int:
+        """Approximate memory of the columns, counting shared strings once"""
+        size = sum(
+            getattr(self, name).nbytes
+            for name in ('years', 'has_linkedin', 'has_github', 'has_resume',
+                         'branch_codes', 'skill_indptr', 'skill_codes')
+        )
+        objects = {}
+        for column in (self.ids, self.names, self.headlines, self.companies, self.bios):
+            size += column.nbytes
+            objects.update((id(v), v) for v in column)
+        for value in self.skills.values + self.branches.values:
+            objects[id(value)] = value
+        return size + sum(sys.getsizeof(v) for v in objects.values())
@@ -0,0 +1,95 @@
+"""
+Background Jobs
+Runs long training tasks off the request path and keeps their status
+for polling by job id
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import threading
+import time
+import uuid
+
+
+class JobRegistry:
+    def __init__(self, max_workers: int = 1, max_jobs: int = 100):
+        """
+        Jobs run on a small dedicated thread pool (one worker by default,
+        so training runs do not compete with each other or with request
+        handling). The newest max_jobs job records are kept.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ml-jobs")
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_jobs = max_jobs
+
+    def submit(self, kind: str, fn: Callable, *args, **kwargs) -> str:
+        """Queue fn(*args, **kwargs) and return its job id"""
+        job = self._add(kind)
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job['job_id']
+
+    def track(self, kind: str, future: "asyncio.Future") -> str:
+        """
+        Record work already running elsewhere (e.g. a BoundedExecutor task)
+        as a job, so its result can be polled by job id like any other
+        """
+        job = self._add(kind)
+        job['started_at'] = time.time()
+        job['status'] = 'running'
+
+        def done(future: "asyncio.Future"):
+            if future.cancelled():
+                job['error'] = "CancelledError: job was cancelled"
+                job['status'] = 'failed'
+            elif future.exception() is not None:
+                e = future.exception()
+                job['error'] = f"{type(e).__name__}: {e}"
+                job['status'] = 'failed'
+            else:
+                job['result'] = future.result()
+                job['status'] = 'succeeded'
+            job['finished_at'] = time.time()
+
+        future.add_done_callback(done)
+        return job['job_id']
+
+    def _add(self, kind: str) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'kind': kind,
+            'status': 'queued',
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return job
+
+    def _run(self, job: Dict[str, Any], fn: Callable, args: tuple, kwargs: dict):
+        job['started_at'] = time.time()
+        job['status'] = 'running'
+        try:
+            job['result'] = fn(*args, **kwargs)
+            job['status'] = 'succeeded'
+        except Exception as e:
+            job['error'] = f"{type(e).__name__}: {e}"
+            job['status'] = 'failed'
+        finally:
+            job['finished_at'] = time.time()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job record, or None if unknown (or already dropped)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,68 @@
+"""
+Keyword Extraction Service
+Splits large YAKE/RAKE requests into chunks across the process pool and
+caches per-text results by content hash and method
+"""
+from typing import Any, Dict, List
+import asyncio
+import hashlib
+
+from .cache import LRUCache
+from .executor import BoundedExecutor
+from .topic_modeler import extract_keywords_task
+
+KEYWORD_METHODS = ('yake', 'rake')
+
+
+def content_key(method: str, text: str) -> tuple:
+    """Cache key of one text: extraction method + digest of the exact text"""
+    return method, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class KeywordService:
+    def __init__(self, executor: BoundedExecutor, chunk_size: int = 100, cache_max_bytes: int = 16 * 1024 * 1024):
+        """
+        Texts not in the cache are deduplicated and sent to `executor` in
+        chunks of chunk_size, at most one chunk per worker at a time. Each
+        worker keeps its extractors warm between chunks (see init_worker).
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.cache = LRUCache(max_bytes=cache_max_bytes)
+
+    async def extract(self, texts: List[str], method: str = 'yake') -> List[Dict[str, Any]]:
+        """Keywords of every text, in order"""
+        if method not in KEYWORD_METHODS:
+            raise ValueError(f"Unknown method '{method}', expected one of {list(KEYWORD_METHODS)}")
+
+        keys = [content_key(method, text) for text in texts]
+        results = [self.cache.get(key) for key in keys]
+        misses = {}
+        for i, result in enumerate(results):
+            if result is None:
+                misses.setdefault(keys[i], i)
+        if not misses:
+            return results
+
+        pending = list(misses.items())
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+        # One chunk keeps the pool's fail-fast 429; a bulk request waits
+        # for room between its chunks instead of failing halfway
+        run = self.executor.run if len(chunks) == 1 else self.executor.run_when_available
+        slots = asyncio.Semaphore(self.executor.max_workers)
+
+        async def run_chunk(chunk):
+            async with slots:
+                return await run(extract_keywords_task, [texts[i] for _, i in chunk], method)
+
+        outputs = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+
+        computed = {}
+        for chunk, output in zip(chunks, outputs):
+            for (key, _), result in zip(chunk, output):
+                computed[key] = result
+                self.cache.put(key, result)
+        return [computed[key] if result is None else result for key, result in zip(keys, results)]
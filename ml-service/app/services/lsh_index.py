@@ -0,0 +1,158 @@
+"""
+Approximate Candidate Retrieval
+MinHash LSH over skill sets and random-projection LSH over TF-IDF vectors
+"""
+from scipy import sparse
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+# Mersenne prime for the universal hash family used by MinHash
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class _BucketTable:
+    """One LSH band/table: sorted bucket keys with their row ids"""
+
+    def __init__(self, keys: np.ndarray, rows: np.ndarray):
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.rows = rows[order]
+
+    def lookup(self, key: int) -> np.ndarray:
+        lo = np.searchsorted(self.keys, key, side='left')
+        hi = np.searchsorted(self.keys, key, side='right')
+        return self.rows[lo:hi]
+
+
+class LSHIndex:
+    def __init__(
+        self,
+        skill_matrix: sparse.csr_matrix,
+        text_matrix: Optional[sparse.csr_matrix],
+        num_perm: int = 64,
+        bands: int = 32,
+        projection_bits: int = 10,
+        projection_tables: int = 12,
+        seed: int = 42
+    ):
+        """
+        Build LSH tables over an AlumniIndex's matrices.
+
+        - MinHash: num_perm permutations split into `bands` bands; alumni
+          whose skill sets agree on every row of a band share a bucket.
+        - Random projection: `projection_tables` tables of
+          `projection_bits` sign bits over the L2-normalized TF-IDF rows.
+
+        More bands / fewer bits per table raise recall and shortlist size.
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        if not 1 <= projection_bits <= 62:
+            raise ValueError("projection_bits must be between 1 and 62")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.projection_bits = projection_bits
+        self.projection_tables = projection_tables
+        self.num_rows = skill_matrix.shape[0]
+
+        rng = np.random.default_rng(seed)
+        self._perm_a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._perm_b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._band_mult = rng.integers(1, 1 << 62, size=num_perm // bands, dtype=np.int64).astype(np.uint64)
+
+        self._skill_tables = self._build_minhash_tables(skill_matrix)
+
+        self._projections = None
+        self._text_tables: List[_BucketTable] = []
+        if text_matrix is not None and projection_tables > 0:
+            self._projections = rng.standard_normal(
+                (text_matrix.shape[1], projection_tables * projection_bits)
+            ).astype(np.float32)
+            self._text_tables = self._build_projection_tables(text_matrix)
+
+    # ============ MinHash over skills ============
+
+    def _minhash(self, skill_ids: np.ndarray, perms: slice = slice(None)) -> np.ndarray:
+        """Hash values (perms x len(skill_ids)) of the universal hash family"""
+        a = self._perm_a[perms, None]
+        b = self._perm_b[perms, None]
+        return (a * skill_ids.astype(np.int64)[None, :] + b) % _MERSENNE_PRIME
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Collapse each band of a (rows x num_perm) signature into one key"""
+        rows_per_band = self.num_perm // self.bands
+        banded = signatures.astype(np.uint64).reshape(len(signatures), self.bands, rows_per_band)
+        return (banded * self._band_mult).sum(axis=2)
+
+    def _build_minhash_tables(self, skill_matrix: sparse.csr_matrix) -> List[_BucketTable]:
+        counts = np.diff(skill_matrix.indptr)
+        rows = np.flatnonzero(counts > 0)
+        if not len(rows):
+            return []
+
+        # Row-wise min of each permutation via reduceat over the CSR layout;
+        # empty rows are skipped so consecutive segments stay contiguous.
+        starts = skill_matrix.indptr[:-1][rows]
+        signatures = np.empty((len(rows), self.num_perm), dtype=np.int64)
+        chunk = 8  # permutations per pass, bounds the temporary to 8 x nnz
+        for p in range(0, self.num_perm, chunk):
+            hashed = self._minhash(skill_matrix.indices, slice(p, p + chunk))
+            signatures[:, p:p + chunk] = np.minimum.reduceat(hashed, starts, axis=1).T
+
+        keys = self._band_keys(signatures)
+        return [_BucketTable(keys[:, band], rows) for band in range(self.bands)]
+
+    def skill_candidates(self, skill_ids: List[int]) -> np.ndarray:
+        """Rows sharing at least one MinHash band with the given skill ids"""
+        if not skill_ids or not self._skill_tables:
+            return np.empty(0, dtype=np.int64)
+        signature = self._minhash(np.asarray(skill_ids)).min(axis=1)
+        keys = self._band_keys(signature[None, :])[0]
+        return np.concatenate([table.lookup(key) for table, key in zip(self._skill_tables, keys)])
+
+    # ============ Random projection over TF-IDF ============
+
+    def _projection_codes(self, vectors: sparse.csr_matrix) -> np.ndarray:
+        """(rows x tables) integer codes from the sign bits of each table"""
+        bits = np.asarray(vectors @ self._projections) > 0
+        bits = bits.reshape(vectors.shape[0], self.projection_tables, self.projection_bits)
+        weights = (1 << np.arange(self.projection_bits, dtype=np.int64))
+        return (bits * weights).sum(axis=2)
+
+    def _build_projection_tables(self, text_matrix: sparse.csr_matrix) -> List[_BucketTable]:
+        # Rows without text would all collide in bucket 0
+        rows = np.flatnonzero(np.diff(text_matrix.indptr) > 0)
+        if not len(rows):
+            return []
+        codes = self._projection_codes(text_matrix[rows])
+        return [_BucketTable(codes[:, t], rows) for t in range(self.projection_tables)]
+
+    def text_candidates(self, text_vector: sparse.csr_matrix) -> np.ndarray:
+        """Rows sharing at least one projection bucket with the text vector"""
+        if not self._text_tables or text_vector.nnz == 0:
+            return np.empty(0, dtype=np.int64)
+        codes = self._projection_codes(text_vector)[0]
+        return np.concatenate([table.lookup(code) for table, code in zip(self._text_tables, codes)])
+
+    # ============ Query ============
+
+    def candidates(
+        self,
+        skill_ids: List[int],
+        text_vector: Optional[sparse.csr_matrix]
+    ) -> np.ndarray:
+        """Sorted, de-duplicated shortlist of candidate rows"""
+        found = [self.skill_candidates(skill_ids)]
+        if text_vector is not None:
+            found.append(self.text_candidates(text_vector))
+        return np.unique(np.concatenate(found))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'rows': self.num_rows,
+            'num_perm': self.num_perm,
+            'bands': self.bands,
+            'projection_bits': self.projection_bits,
+            'projection_tables': self.projection_tables,
+        }
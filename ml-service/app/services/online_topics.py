@@ -0,0 +1,298 @@
+"""
+Online Topic Model
+A persisted global LDA model, updated incrementally with new documents
+(online variational Bayes) and used to infer topic distributions of new texts
+"""
+from gensim import corpora
+from gensim.models import LdaModel
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import json
+import os
+import shutil
+import threading
+import time
+
+from .artifacts import publish_version, current_version, rename_into_place, reserve_version
+from .topic_modeler import fit_lda
+
+MODEL_FILE = 'lda.model'
+META_FILE = 'meta.json'
+
+
+class TopicModel(NamedTuple):
+    """Fitted LDA model (its dictionary is lda.id2word); replaced as a whole, never mutated"""
+    lda: LdaModel
+    version: int
+    documents: int  # documents trained on, including later updates
+
+
+class OnlineTopicModel:
+    def __init__(
+        self,
+        preprocess: Callable[[str], List[str]],
+        model_dir: str = 'models/topics',
+        refresh_interval: float = 1.0
+    ):
+        """
+        `preprocess` turns a text into tokens (TopicModeler's tokenizer), so
+        the global model sees the same tokens as /api/ml/topics. Versions are
+        saved under model_dir/v<N>/ and the CURRENT one is loaded at startup,
+        then followed: every refresh_interval seconds at most, CURRENT is
+        re-read so versions other worker processes publish are picked up.
+        """
+        self.preprocess = preprocess
+        self.model: Optional[TopicModel] = None
+        self.model_dir = model_dir
+        # Serializes training runs and updates so no update is lost
+        self._train_lock = threading.Lock()
+        self.refresh_interval = refresh_interval
+        self._checked_at = time.monotonic()
+
+        self._load_model()
+
+    @property
+    def is_trained(self) -> bool:
+        self._refresh()
+        return self.model is not None
+
+    def _tokenize(self, texts: List[str]) -> List[List[str]]:
+        # Same minimum document length as TopicModeler.extract_topics
+        docs = [self.preprocess(text) for text in texts]
+        return [doc for doc in docs if len(doc) > 3]
+
+    # ============ Persistence ============
+
+    def _load_model(self):
+        """Load the current saved version, if any"""
+        try:
+            name = current_version(self.model_dir)
+            if name is not None:
+                self.model = self._load_version(name)
+        except Exception:
+            pass
+
+    def _refresh(self):
+        """Follow CURRENT if it moved; read at most once per refresh_interval"""
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+        # Skip while this process publishes: the publish sets the live model itself
+        if self._train_lock.acquire(blocking=False):
+            try:
+                self._follow_current()
+            finally:
+                self._train_lock.release()
+
+    def _follow_current(self):
+        """Make CURRENT's version the live model if it is not already (caller holds _train_lock)"""
+        name = current_version(self.model_dir)
+        model = self.model
+        if name is None or (model is not None and name == f"v{model.version}"):
+            return
+        try:
+            self.model = self._load_version(name)
+        except Exception:
+            # Pruned by a newer publish meanwhile; the next check follows that one
+            pass
+
+    def _load_version(self, name: str, mmap: Optional[str] = 'r') -> TopicModel:
+        """
+        With mmap='r' the topic-word matrices stay in the OS page cache,
+        shared by every worker that maps them. mmap=None gives a private,
+        writable copy for update().
+        """
+        directory = os.path.join(self.model_dir, name)
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        lda = LdaModel.load(os.path.join(directory, MODEL_FILE), mmap=mmap)
+        return TopicModel(lda, meta['version'], meta['documents'])
+
+    def _save_model(self, lda: LdaModel, documents: int) -> TopicModel:
+        """
+        Write a new version directory, point CURRENT at it, and map it back.
+        The version number is reserved on disk, so it is unique across
+        worker processes sharing model_dir; existing versions are never
+        overwritten.
+        """
+        version, name = reserve_version(self.model_dir)
+        directory = os.path.join(self.model_dir, name)
+        tmp_dir = f"{directory}.tmp-{os.getpid()}"
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            lda.save(os.path.join(tmp_dir, MODEL_FILE))
+            with open(os.path.join(tmp_dir, META_FILE), 'w') as f:
+                json.dump({
+                    'version': version,
+                    'documents': documents,
+                    'num_topics': lda.num_topics,
+                    'saved_at': time.time()
+                }, f)
+            rename_into_place(tmp_dir, directory)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.rmdir(directory)
+            raise
+
+        publish_version(self.model_dir, name)
+        return self._load_version(name)
+
+    def _publish(self, lda: LdaModel, documents: int) -> TopicModel:
+        """Save a fitted model, then make it the live one (caller holds _train_lock)"""
+        model = self._save_model(lda, documents)
+        self.model = model
+        return model
+
+    # ============ Training ============
+
+    def train(
+        self,
+        texts: List[str],
+        num_topics: int = 10,
+        passes: int = 10,
+        mode: str = 'single',
+        workers: Optional[int] = None,
+        chunksize: int = 2000
+    ) -> Dict[str, Any]:
+        """
+        Full training run: builds a new dictionary and LDA model from
+        `texts` and replaces the global model. The vocabulary is fixed
+        until the next full run; update() only refines topic weights.
+        mode/workers/chunksize select the trainer (see fit_lda).
+        """
+        docs = self._tokenize(texts)
+        if len(docs) < max(num_topics, 1):
+            raise ValueError(f"Need at least {num_topics} documents with enough content, got {len(docs)}")
+
+        dictionary = corpora.Dictionary(docs)
+        dictionary.filter_extremes(no_below=2, no_above=0.8)
+        if len(dictionary) < 10:
+            raise ValueError("Vocabulary too small after filtering; add more documents")
+        corpus = [dictionary.doc2bow(doc) for doc in docs]
+
+        lda = fit_lda(corpus, dictionary, num_topics, passes=passes, mode=mode, workers=workers, chunksize=chunksize)
+        log_perplexity = lda.log_perplexity(corpus)
+
+        with self._train_lock:
+            model = self._publish(lda, len(corpus))
+
+        return {
+            'model_version': model.version,
+            'num_topics': num_topics,
+            'lda_mode': mode,
+            'documents': len(corpus),
+            'vocabulary_size': len(dictionary),
+            'log_perplexity': round(float(log_perplexity), 4)
+        }
+
+    def adopt(self, path: str, documents: int) -> Dict[str, Any]:
+        """
+        Make an LDA model trained elsewhere (saved with lda.save, e.g. the
+        winner of a topic count sweep) the global model, as a new version
+        """
+        lda = LdaModel.load(path)
+        with self._train_lock:
+            model = self._publish(lda, documents)
+
+        return {
+            'model_version': model.version,
+            'num_topics': lda.num_topics,
+            'documents': documents,
+            'vocabulary_size': len(lda.id2word)
+        }
+
+    def update(self, texts: List[str], passes: int = 1) -> Dict[str, Any]:
+        """
+        Fold new documents into the global model with an online LDA update.
+        Tokens outside the model's vocabulary are ignored; a high
+        unknown_token_rate means it is time for a full train().
+        """
+        with self._train_lock:
+            # Build on the newest version, whichever worker published it
+            self._follow_current()
+            current = self.model
+            if current is None:
+                raise ValueError("Topic model is not trained yet")
+
+            dictionary = current.lda.id2word
+            docs = self._tokenize(texts)
+            corpus = [dictionary.doc2bow(doc) for doc in docs]
+            total_tokens = sum(len(doc) for doc in docs)
+            known_tokens = sum(count for bow in corpus for _, count in bow)
+            corpus = [bow for bow in corpus if bow]
+
+            metrics = {
+                'documents': len(corpus),
+                'skipped_documents': len(texts) - len(corpus),
+                'unknown_token_rate': round(1 - known_tokens / total_tokens, 4) if total_tokens else 0.0
+            }
+            if not corpus:
+                return {'model_version': current.version, **metrics}
+
+            # Update a private writable copy; readers keep the mapped live one
+            lda = self._load_version(f"v{current.version}", mmap=None).lda
+            # Both LdaModel and LdaMulticore run self.passes passes per update
+            lda.passes = passes
+            lda.update(corpus)
+            model = self._publish(lda, current.documents + len(corpus))
+
+        return {'model_version': model.version, 'total_documents': model.documents, **metrics}
+
+    # ============ Inference ============
+
+    def infer(self, texts: List[str], min_probability: float = 0.01) -> Dict[str, Any]:
+        """
+        Topic distribution of each text under the global model, from one
+        batched variational inference pass. Texts without any known token
+        get an empty distribution.
+        """
+        self._refresh()
+        # Read the reference once: a concurrent swap cannot mix two models
+        model = self.model
+        if model is None:
+            raise ValueError("Topic model is not trained yet")
+
+        dictionary = model.lda.id2word
+        bows = [dictionary.doc2bow(self.preprocess(text)) for text in texts]
+        known = [i for i, bow in enumerate(bows) if bow]
+
+        results = [{'topics': [], 'dominant_topic': None} for _ in texts]
+        if known:
+            gamma, _ = model.lda.inference([bows[i] for i in known])
+            distributions = gamma / gamma.sum(axis=1, keepdims=True)
+            for i, distribution in zip(known, distributions):
+                order = distribution.argsort()[::-1]
+                results[i] = {
+                    'topics': [
+                        {'topic_id': int(topic_id), 'weight': round(float(distribution[topic_id]), 4)}
+                        for topic_id in order if distribution[topic_id] >= min_probability
+                    ],
+                    'dominant_topic': int(order[0])
+                }
+
+        return {'model_version': model.version, 'results': results}
+
+    def describe(self, topn: int = 10) -> Dict[str, Any]:
+        """Version, size and top keywords of every topic of the global model"""
+        self._refresh()
+        model = self.model
+        if model is None:
+            raise ValueError("Topic model is not trained yet")
+
+        topics = []
+        for topic_id in range(model.lda.num_topics):
+            topic_words = model.lda.show_topic(topic_id, topn=topn)
+            topics.append({
+                'topic_id': topic_id,
+                'keywords': [word for word, _ in topic_words],
+                'weights': [round(float(weight), 4) for _, weight in topic_words]
+            })
+
+        return {
+            'model_version': model.version,
+            'num_topics': model.lda.num_topics,
+            'vocabulary_size': len(model.lda.id2word),
+            'documents': model.documents,
+            'topics': topics
+        }
@@ -0,0 +1,75 @@
+"""
+Text Preprocessing
+Shared tokenizers with precompiled patterns, a frozen stopword set and a
+content-hash-keyed cache of token lists, so a text that reaches several
+endpoints is tokenized once per pipeline (per process)
+"""
+from functools import lru_cache
+from typing import Callable, FrozenSet, Tuple
+import hashlib
+import re
+
+import nltk
+
+from .cache import LRUCache
+
+_NON_ALPHA = re.compile(r'[^a-zA-Z\s]')
+# scikit-learn's default token_pattern: words of two or more characters
+_WORD = re.compile(r'(?u)\b\w\w+\b')
+
+# (pipeline, text digest) -> tuple of tokens; tuples so cached lists cannot
+# be modified by a caller
+token_cache = LRUCache(max_bytes=32 * 1024 * 1024)
+
+
+def configure_token_cache(max_bytes: int):
+    """Set the byte budget of this process's token cache (0 disables it)"""
+    token_cache.max_bytes = max_bytes
+    token_cache.clear()
+
+
+@lru_cache(maxsize=None)
+def topic_stopwords() -> FrozenSet[str]:
+    """NLTK English stopwords, loaded once"""
+    return frozenset(nltk.corpus.stopwords.words('english'))
+
+
+def _cached(pipeline: str, text: str, tokenize: Callable[[str], Tuple[str, ...]]) -> Tuple[str, ...]:
+    key = (pipeline, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest())
+    tokens = token_cache.get(key)
+    if tokens is None:
+        tokens = tokenize(text)
+        token_cache.put(key, tokens)
+    return tokens
+
+
+def _topic_tokens(text: str) -> Tuple[str, ...]:
+    # Lowercase, drop everything but letters, remove stopwords and short tokens
+    stopwords = topic_stopwords()
+    return tuple(
+        token for token in _NON_ALPHA.sub('', text.lower()).split()
+        if len(token) > 3 and token not in stopwords
+    )
+
+
+def _word_tokens(text: str) -> Tuple[str, ...]:
+    return tuple(_WORD.findall(text.lower()))
+
+
+def topic_tokens(text: str) -> Tuple[str, ...]:
+    """Tokens for topic modeling (LDA dictionaries and coherence)"""
+    return _cached('topic', text, _topic_tokens)
+
+
+def word_tokens(text: str) -> Tuple[str, ...]:
+    """
+    Lowercased words, exactly what scikit-learn's default preprocessor and
+    tokenizer produce; stop words and n-grams are still applied by the
+    vectorizer (see SHARED_TOKENIZER)
+    """
+    return _cached('word', text, _word_tokens)
+
+
+# Vectorizer arguments that swap scikit-learn's own lowercasing and
+# tokenizing for word_tokens (same tokens, shared cache)
+SHARED_TOKENIZER = {'tokenizer': word_tokens, 'lowercase': False, 'token_pattern': None}
@@ -4,21 +4,39 @@ Uses TF-IDF, Word2Vec, and Jaccard similarity for matching students with alumni
 """
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import Dict, Any
+from sklearn.base import clone
+from typing import Dict, Any, Optional
 import numpy as np
+from .preprocessing import SHARED_TOKENIZER
 
 class ProfileMatcher:
     def __init__(self):
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=1000,
             stop_words='english',
-            ngram_range=(1, 2)
+            ngram_range=(1, 2),
+            **SHARED_TOKENIZER
         )
+        self.weights = {
+            'skills_overlap': 0.35,
+            'text_similarity': 0.30,
+            'branch_match': 0.15,
+            'experience_relevance': 0.20
+        }
     
-    def match(self, student_profile: Dict[str, Any], alumni_profile: Dict[str, Any]) -> Dict[str, Any]:
+    def match(
+        self,
+        student_profile: Dict[str, Any],
+        alumni_profile: Dict[str, Any],
+        text_score: Optional[float] = None,
+        skills_score: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Calculate match percentage between student and alumni profiles.
         
+        text_score and skills_score may be supplied by a precomputed
+        AlumniIndex, in which case the pairwise computations are skipped.
+        
         Returns breakdown of:
         - skills_overlap: Jaccard similarity of skills
         - text_similarity: TF-IDF cosine similarity of bio + headline
@@ -26,29 +44,32 @@ class ProfileMatcher:
         - experience_relevance: Normalized score
         """
         
-        # 1. Skills Overlap (Jaccard Index)
+        # 1. Skills Overlap (Jaccard Index), unless precomputed by the caller
         student_skills = set(student_profile.get('skills', []))
         alumni_skills = set(alumni_profile.get('skills', []))
         
-        if student_skills and alumni_skills:
-            intersection = len(student_skills & alumni_skills)
-            union = len(student_skills | alumni_skills)
-            skills_score = intersection / union if union > 0 else 0
-        else:
-            skills_score = 0
-        
-        # 2. Text Similarity (TF-IDF)
-        student_text = f"{student_profile.get('bio', '')} {student_profile.get('headline', '')}"
-        alumni_text = f"{alumni_profile.get('bio', '')} {alumni_profile.get('headline', '')}"
-        
-        if student_text.strip() and alumni_text.strip():
-            try:
-                tfidf_matrix = self.tfidf_vectorizer.fit_transform([student_text, alumni_text])
-                text_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            except:
+        if skills_score is None:
+            if student_skills and alumni_skills:
+                intersection = len(student_skills & alumni_skills)
+                union = len(student_skills | alumni_skills)
+                skills_score = intersection / union if union > 0 else 0
+            else:
+                skills_score = 0
+        
+        # 2. Text Similarity (TF-IDF), unless precomputed by the caller
+        if text_score is None:
+            student_text = f"{student_profile.get('bio', '')} {student_profile.get('headline', '')}"
+            alumni_text = f"{alumni_profile.get('bio', '')} {alumni_profile.get('headline', '')}"
+            
+            if student_text.strip() and alumni_text.strip():
+                try:
+                    # Fresh copy per call: match() may run on several threads
+                    tfidf_matrix = clone(self.tfidf_vectorizer).fit_transform([student_text, alumni_text])
+                    text_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+                except:
+                    text_score = 0
+            else:
                 text_score = 0
-        else:
-            text_score = 0
         
         # 3. Branch Match
         student_branch = student_profile.get('branch', '')
@@ -64,14 +85,6 @@ class ProfileMatcher:
         else:
             experience_score = 0.5  # Very recent grad
         
-        # Weighted combination
-        weights = {
-            'skills_overlap': 0.35,
-            'text_similarity': 0.30,
-            'branch_match': 0.15,
-            'experience_relevance': 0.20
-        }
-        
         breakdown = {
             'skills_overlap': round(skills_score * 100, 2),
             'text_similarity': round(text_score * 100, 2),
@@ -80,12 +93,7 @@ class ProfileMatcher:
         }
         
         # Calculate weighted match
-        match_percent = (
-            skills_score * weights['skills_overlap'] +
-            text_score * weights['text_similarity'] +
-            branch_score * weights['branch_match'] +
-            experience_score * weights['experience_relevance']
-        ) * 100
+        match_percent = self.weighted_score(skills_score, text_score, branch_score, experience_score)
         
         # Generate explanation
         common_skills = list(student_skills & alumni_skills) if student_skills and alumni_skills else []
@@ -97,6 +105,18 @@ class ProfileMatcher:
             'explanation': explanation
         }
     
+    def weighted_score(self, skills_score, text_score, branch_score, experience_score):
+        """
+        Weighted combination (0-100) of the component scores.
+        Works on floats as well as NumPy arrays of scores.
+        """
+        return (
+            skills_score * self.weights['skills_overlap'] +
+            text_score * self.weights['text_similarity'] +
+            branch_score * self.weights['branch_match'] +
+            experience_score * self.weights['experience_relevance']
+        ) * 100
+    
     def _generate_explanation(self, match_percent: float, common_skills: list, branch_score: float, years: int) -> str:
         """Generate human-readable explanation"""
         if match_percent >= 80:
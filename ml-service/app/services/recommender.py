@@ -2,55 +2,318 @@
 Alumni Recommendation Service
 Uses k-NN with combined similarity features
 """
-from sklearn.neighbors import NearestNeighbors
-from sklearn.preprocessing import StandardScaler
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import numpy as np
 from .profile_matcher import ProfileMatcher
+from .alumni_index import AlumniIndex, knn_features
+from .alumni_journal import AlumniJournal
+from .cache import LRUCache, fingerprint
+from .sharded_index import ShardedAlumniIndex
+
+# Student fields that influence any recommendation mode
+_FINGERPRINT_FIELDS = (
+    'skills', 'bio', 'headline', 'branch', 'years_of_experience',
+    'linkedin_url', 'github_url', 'resume_url'
+)
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest finite scores, best first, using partial
+    selection (O(N + k log k)) instead of a full sort. Ties keep row order.
+    """
+    finite = np.flatnonzero(np.isfinite(scores))
+    if k <= 0 or not len(finite):
+        return finite[:0]
+    if k < len(finite):
+        values = scores[finite]
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = finite[values > kth]
+        ties = finite[values == kth][:k - len(above)]
+        finite = np.concatenate([above, ties])
+    return finite[np.lexsort((finite, -scores[finite]))]
 
 class AlumniRecommender:
-    def __init__(self):
+    MODES = ('exact', 'approximate', 'knn')
+    # Upper bound for one (students x alumni) score block in recommend_many
+    BATCH_BLOCK_BYTES = 64 * 1024 * 1024
+    
+    def __init__(
+        self,
+        ann_params: Optional[Dict[str, Any]] = None,
+        cache_max_bytes: int = 32 * 1024 * 1024,
+        cache_ttl_seconds: Optional[float] = 300,
+        shards: int = 0,
+        shard_timeout: float = 120.0,
+        index_dir: Optional[str] = None
+    ):
+        """
+        ann_params are passed to LSHIndex for mode='approximate'
+        (num_perm, bands, projection_bits, projection_tables, seed).
+        Indexed recommendations are cached (LRU + TTL) within cache_max_bytes.
+        With shards > 0 the server-side pool is partitioned across that
+        many worker processes (see ShardedAlumniIndex), each of which must
+        answer within shard_timeout seconds.
+        
+        With index_dir, changes to the server-side pool go through an
+        AlumniJournal there, and every worker process sharing the directory
+        replays them before serving, so all workers serve the same pool.
+        """
         self.profile_matcher = ProfileMatcher()
-        self.scaler = StandardScaler()
+        self.ann_params = dict(ann_params or {})
+        # Server-side alumni pool, maintained through upsert/delete
+        if shards > 0:
+            self.index = ShardedAlumniIndex(shards, ann_params=self.ann_params, reply_timeout=shard_timeout)
+        else:
+            self.index = AlumniIndex()
+        self.journal = AlumniJournal(index_dir) if index_dir else None
+        self.cache = LRUCache(max_bytes=cache_max_bytes, ttl_seconds=cache_ttl_seconds)
+    
+    # ============ Server-side pool ============
+    
+    def refresh_index(self) -> int:
+        """Apply the changes other workers made to the pool; returns its version"""
+        if self.journal is None:
+            return self.index.version
+        return self.journal.sync(self.index)
+    
+    def upsert_alumni(self, alumni_profiles: List[Dict[str, Any]]) -> int:
+        """Insert or replace profiles (by id) in the pool; returns its version"""
+        if self.journal is None:
+            return self.index.upsert(alumni_profiles)
+        return self.journal.upsert(self.index, alumni_profiles)
+    
+    def delete_alumni(self, alumni_ids: List[Any]) -> int:
+        """Remove profiles from the pool (unknown ids are ignored); returns its version"""
+        if self.journal is None:
+            return self.index.delete(alumni_ids)
+        return self.journal.delete(self.index, alumni_ids)
     
     def recommend(
         self,
         student_profile: Dict[str, Any],
         alumni_profiles: List[Dict[str, Any]],
-        limit: int = 10
+        limit: int = 10,
+        mode: str = 'exact'
     ) -> List[Dict[str, Any]]:
         """
         Recommend top N alumni for a student using similarity scoring.
         Returns ranked list with match percentages and explanations.
+        
+        mode='knn' ranks by distance in the k-NN feature space; its scaler
+        and KD-tree are cached per index, so only recommend_from_index
+        reuses them and here they are rebuilt on every call.
+        mode='approximate' is only offered by recommend_from_index: LSH
+        tables built for a one-off pool cost more than scoring it exactly.
         """
+        if mode == 'approximate':
+            raise ValueError(
+                "mode='approximate' needs the server-side alumni index "
+                "(/api/ml/recommend-alumni/indexed); use 'exact' for a per-request pool"
+            )
         if not alumni_profiles:
             return []
         
-        # Calculate match scores for all alumni
-        recommendations = []
+        # Fit TF-IDF and the skill-incidence matrix once over the whole
+        # alumni pool; text and skills scores are then sparse products
+        return self._rank(AlumniIndex(alumni_profiles), student_profile, limit, mode=mode)
+    
+    def recommend_from_index(
+        self,
+        student_profile: Dict[str, Any],
+        limit: int = 10,
+        exclude_ids: Optional[List[Any]] = None,
+        branch: Optional[str] = None,
+        mode: str = 'exact'
+    ) -> List[Dict[str, Any]]:
+        """
+        Recommend top N alumni from the server-side index, so callers only
+        send the student profile and an optional filter.
+        
+        Results are cached by student profile fingerprint, request options
+        and index version, so any upsert/delete invalidates them.
+        """
+        self.refresh_index()
+        if not len(self.index):
+            return []
+        
+        key = (
+            self._student_fingerprint(student_profile),
+            limit,
+            mode,
+            tuple(sorted(exclude_ids or [])),
+            branch,
+            self.index.version
+        )
+        recommendations = self.cache.get(key)
+        if recommendations is None:
+            if isinstance(self.index, ShardedAlumniIndex):
+                if mode not in self.MODES:
+                    raise ValueError(f"Unknown recommendation mode '{mode}', expected one of {self.MODES}")
+                recommendations = self.index.recommend(student_profile, limit, exclude_ids, branch, mode)
+            else:
+                recommendations = self._rank(self.index, student_profile, limit, exclude_ids, branch, mode)
+            self.cache.put(key, recommendations)
+        return recommendations
+    
+    def _student_fingerprint(self, student_profile: Dict[str, Any]) -> str:
+        """Stable hash of the student fields used for scoring"""
+        fields = {name: student_profile.get(name) for name in _FINGERPRINT_FIELDS}
+        fields['skills'] = sorted(set(fields['skills'] or []))
+        return fingerprint(fields)
+    
+    def _rank(
+        self,
+        index: AlumniIndex,
+        student_profile: Dict[str, Any],
+        limit: int,
+        exclude_ids: Optional[List[Any]] = None,
+        branch: Optional[str] = None,
+        mode: str = 'exact'
+    ) -> List[Dict[str, Any]]:
+        """Score every alumnus (or the LSH shortlist) passing the filter and return the top N"""
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown recommendation mode '{mode}', expected one of {self.MODES}")
+        if mode == 'knn':
+            return self._rank_knn(index, student_profile, limit, exclude_ids, branch)
+        
+        # Hold the index lock so rows, scores and mask stay aligned
+        with index.lock:
+            store = index.store
+            mask = None
+            if exclude_ids or branch:
+                mask = index.candidate_mask(exclude_ids=exclude_ids, branch=branch)
+            rows = None
+            if mode == 'approximate':
+                rows = index.ann_candidates(student_profile, **self.ann_params)
+                if mask is not None:
+                    rows = rows[mask[rows]]
+                if len(rows) < limit:
+                    # Filtered shortlist too small to fill the page: score exactly
+                    rows = None
+            
+            text_scores = index.text_similarity(student_profile, rows)
+            skills_scores = index.skills_overlap(student_profile, rows)
+            scores = self.profile_matcher.weighted_score(
+                skills_scores,
+                text_scores,
+                index.branch_match(student_profile, rows),
+                index.experience_relevance(rows)
+            )
+            if mask is not None and rows is None:
+                scores = np.where(mask, scores, -np.inf)
+        
+        # Only the top N rows get breakdowns and explanations rendered
+        top = top_k_indices(scores, limit)
+        return [
+            self._build_recommendation(
+                student_profile,
+                store.row_profile(pos if rows is None else rows[pos]),
+                text_scores[pos],
+                skills_scores[pos]
+            )
+            for pos in top
+        ]
+    
+    def recommend_many(
+        self,
+        students: List[Dict[str, Any]],
+        limit: int = 10,
+        alumni_profiles: Optional[List[Dict[str, Any]]] = None,
+        block_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Top N alumni for many students at once. Each student is a dict with
+        'student_id', 'student_profile' and optional 'exclude_ids'.
+        Uses the server-side index unless alumni_profiles is given.
+        """
+        return [
+            {'student_id': student_id, 'recommendations': recommendations}
+            for student_id, recommendations in self.iter_recommend_many(
+                students, limit, alumni_profiles, block_size
+            )
+        ]
+    
+    def iter_recommend_many(
+        self,
+        students: List[Dict[str, Any]],
+        limit: int = 10,
+        alumni_profiles: Optional[List[Dict[str, Any]]] = None,
+        block_size: Optional[int] = None
+    ) -> Iterator[Tuple[Any, List[Dict[str, Any]]]]:
+        """
+        Generator form of recommend_many. Students are scored in row blocks
+        as (block x alumni) matrix products, so memory stays bounded by
+        BATCH_BLOCK_BYTES, and results are yielded as each block finishes.
+        """
+        if alumni_profiles is None:
+            self.refresh_index()
+        index = self.index if alumni_profiles is None else AlumniIndex(alumni_profiles)
+        if isinstance(index, ShardedAlumniIndex):
+            # Shards rank one student at a time, in parallel across shards
+            for student in students:
+                yield student.get('student_id'), self.recommend_from_index(
+                    student.get('student_profile', {}), limit, student.get('exclude_ids')
+                ) if len(index) else []
+            return
+        
+        if not len(index):
+            for student in students:
+                yield student.get('student_id'), []
+            return
         
-        for alumni in alumni_profiles:
-            try:
-                match_result = self.profile_matcher.match(student_profile, alumni)
-                
-                recommendations.append({
-                    'alumni_id': alumni.get('id'),
-                    'match_percent': match_result['match_percent'],
-                    'breakdown': match_result['breakdown'],
-                    'explanation': match_result['explanation'],
-                    'alumni_name': alumni.get('name', 'Unknown'),
-                    'alumni_headline': alumni.get('headline', ''),
-                    'alumni_company': alumni.get('company', ''),
-                })
-            except Exception as e:
-                # Skip alumni that cause errors
-                continue
-        
-        # Sort by match percentage (descending)
-        recommendations.sort(key=lambda x: x['match_percent'], reverse=True)
-        
-        # Return top N
-        return recommendations[:limit]
+        if block_size is None:
+            # Several float64 (block x alumni) temporaries are alive at once
+            block_size = max(1, self.BATCH_BLOCK_BYTES // (8 * 4 * len(index)))
+        
+        for start in range(0, len(students), block_size):
+            block = students[start:start + block_size]
+            student_profiles = [s.get('student_profile', {}) for s in block]
+            
+            with index.lock:
+                store = index.store
+                text_scores = index.batch_text_similarity(student_profiles)
+                skills_scores = index.batch_skills_overlap(student_profiles)
+                scores = self.profile_matcher.weighted_score(
+                    skills_scores,
+                    text_scores,
+                    index.batch_branch_match(student_profiles),
+                    index.experience_relevance()[None, :]
+                )
+                for i, student in enumerate(block):
+                    if student.get('exclude_ids'):
+                        scores[i, index.rows_for_ids(student['exclude_ids'])] = -np.inf
+            
+            for i, student in enumerate(block):
+                yield student.get('student_id'), [
+                    self._build_recommendation(
+                        student_profiles[i], store.row_profile(row), text_scores[i, row], skills_scores[i, row]
+                    )
+                    for row in top_k_indices(scores[i], limit)
+                ]
+    
+    def _build_recommendation(
+        self,
+        student_profile: Dict[str, Any],
+        alumni: Dict[str, Any],
+        text_score: float,
+        skills_score: float
+    ) -> Dict[str, Any]:
+        """Full result dict (breakdown + explanation) for one selected alumnus"""
+        match_result = self.profile_matcher.match(
+            student_profile,
+            alumni,
+            text_score=float(text_score),
+            skills_score=float(skills_score)
+        )
+        return {
+            'alumni_id': alumni.get('id'),
+            'match_percent': match_result['match_percent'],
+            'breakdown': match_result['breakdown'],
+            'explanation': match_result['explanation'],
+            'alumni_name': alumni.get('name', 'Unknown'),
+            'alumni_headline': alumni.get('headline', ''),
+            'alumni_company': alumni.get('company', ''),
+        }
     
     def recommend_with_knn(
         self,
@@ -66,99 +329,79 @@ class AlumniRecommender:
             # Fall back to simple matching
             return self.recommend(student_profile, alumni_profiles, limit)
         
-        # Extract features for all alumni
-        alumni_features = []
-        alumni_ids = []
-        
-        for alumni in alumni_profiles:
-            features = self._extract_features(alumni)
-            if features is not None:
-                alumni_features.append(features)
-                alumni_ids.append(alumni.get('id'))
-        
-        if len(alumni_features) < limit:
-            return self.recommend(student_profile, alumni_profiles, limit)
-        
-        # Convert to numpy array
-        X = np.array(alumni_features)
-        
-        # Normalize features
-        X_scaled = self.scaler.fit_transform(X)
-        
-        # Extract student features
-        student_features = self._extract_features(student_profile)
-        if student_features is None:
-            return self.recommend(student_profile, alumni_profiles, limit)
-        
-        student_features_scaled = self.scaler.transform([student_features])
-        
-        # Fit k-NN
-        knn = NearestNeighbors(n_neighbors=min(limit, len(alumni_features)), metric='euclidean')
-        knn.fit(X_scaled)
-        
-        # Find nearest neighbors
-        distances, indices = knn.kneighbors(student_features_scaled)
+        return self._rank_knn(AlumniIndex(alumni_profiles), student_profile, limit)
+    
+    def _rank_knn(
+        self,
+        index: AlumniIndex,
+        student_profile: Dict[str, Any],
+        limit: int,
+        exclude_ids: Optional[List[Any]] = None,
+        branch: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        k-NN ranking against the index's cached scaler + KD-tree. Once the
+        index is warm, a query is one tree lookup plus O(k) result rendering.
+        """
+        with index.lock:
+            knn = index.knn_model()
+            student_features = self._extract_features(student_profile)
+            if knn is None or len(knn) < limit or student_features is None:
+                return self._rank(index, student_profile, limit, exclude_ids, branch)
+            
+            store = index.store
+            mask = None
+            if exclude_ids or branch:
+                mask = index.candidate_mask(exclude_ids=exclude_ids, branch=branch)
+            
+            # Widen the neighbourhood until enough neighbours pass the filter
+            k = limit
+            while True:
+                distances, rows = knn.query(student_features, k)
+                if mask is not None:
+                    keep = mask[rows]
+                    distances, rows = distances[keep], rows[keep]
+                if len(rows) >= limit or k >= len(knn):
+                    break
+                k = min(k * 2, len(knn))
+            distances, rows = distances[:limit], rows[:limit]
+            
+            text_scores = index.text_similarity(student_profile, rows)
+            skills_scores = index.skills_overlap(student_profile, rows)
         
         # Build recommendations
         recommendations = []
-        for dist, idx in zip(distances[0], indices[0]):
-            alumni_id = alumni_ids[idx]
-            alumni = next((a for a in alumni_profiles if a.get('id') == alumni_id), None)
+        for dist, row, text_score, skills_score in zip(distances, rows, text_scores, skills_scores):
+            alumni = store.row_profile(row)
             
-            if alumni:
-                # Convert distance to similarity score (0-100)
-                similarity_score = max(0, 100 - (dist * 20))
-                
-                match_result = self.profile_matcher.match(student_profile, alumni)
-                
-                recommendations.append({
-                    'alumni_id': alumni_id,
-                    'match_percent': round(similarity_score, 2),
-                    'breakdown': match_result['breakdown'],
-                    'explanation': f"k-NN similarity: {similarity_score:.0f}%. " + match_result['explanation'],
-                    'alumni_name': alumni.get('name', 'Unknown'),
-                    'alumni_headline': alumni.get('headline', ''),
-                    'knn_distance': round(float(dist), 4)
-                })
+            # Convert distance to similarity score (0-100)
+            similarity_score = max(0, 100 - (dist * 20))
+            
+            match_result = self.profile_matcher.match(
+                student_profile,
+                alumni,
+                text_score=float(text_score),
+                skills_score=float(skills_score)
+            )
+            
+            recommendations.append({
+                'alumni_id': alumni.get('id'),
+                'match_percent': round(similarity_score, 2),
+                'breakdown': match_result['breakdown'],
+                'explanation': f"k-NN similarity: {similarity_score:.0f}%. " + match_result['explanation'],
+                'alumni_name': alumni.get('name', 'Unknown'),
+                'alumni_headline': alumni.get('headline', ''),
+                'knn_distance': round(float(dist), 4)
+            })
         
         return recommendations
     
-    def _extract_features(self, profile: Dict[str, Any]) -> List[float]:
+    def _extract_features(self, profile: Dict[str, Any]) -> Optional[List[float]]:
         """
         Extract numerical features from profile for k-NN.
         Returns feature vector or None if insufficient data.
         """
-        features = []
-        
-        # Skill count
-        skills = profile.get('skills', [])
-        features.append(len(skills) if skills else 0)
-        
-        # Years of experience
-        features.append(profile.get('years_of_experience', 0))
-        
-        # Text length features
-        bio = profile.get('bio', '')
-        headline = profile.get('headline', '')
-        features.append(len(bio))
-        features.append(len(headline))
-        
-        # Boolean features (0 or 1)
-        features.append(1 if profile.get('linkedin_url') else 0)
-        features.append(1 if profile.get('github_url') else 0)
-        features.append(1 if profile.get('resume_url') else 0)
-        
-        # Branch encoding (simplified - could use one-hot encoding)
-        branch_map = {
-            'Computer Engineering': 1,
-            'Information Technology': 2,
-            'Electronics': 3,
-            'Mechanical': 4,
-            'Civil': 5
-        }
-        features.append(branch_map.get(profile.get('branch', ''), 0))
-        
-        return features if any(features) else None
+        return knn_features(profile)
     
     def explain_recommendation(
         self,
@@ -1,57 +1,248 @@
 """
 Sentiment Analysis Service
-Uses Logistic Regression with TF-IDF features (Classical ML)
+Uses Logistic Regression with TF-IDF features (Classical ML), or an online
+SGD classifier over hashed features updated with partial_fit
 """
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 import joblib
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, NamedTuple, Optional, Iterable, Iterator, Tuple, Union
+import copy
+import hashlib
+import json
 import os
+import threading
+import time
+
+from .artifacts import save_text_model, load_text_model, publish_version, current_version, reserve_version
+from .cache import LRUCache
+from .preprocessing import SHARED_TOKENIZER
+
+LABEL_MAP = {'positive': 1, 'neutral': 0, 'negative': -1}
+# Every class must be declared on the first partial_fit call
+ONLINE_CLASSES = np.array(sorted(LABEL_MAP.values()))
+
+
+def text_key(text: str) -> bytes:
+    """
+    Digest of the text after lowercasing and collapsing whitespace. Both
+    vectorizers lowercase and split on whitespace, so texts with equal keys
+    get equal predictions.
+    """
+    normalized = ' '.join(text.lower().split())
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+
+def parse_labeled_line(line: Union[str, bytes]) -> Tuple[str, str]:
+    """(text, label) from one JSONL line; ValueError if malformed"""
+    try:
+        row = json.loads(line)
+        text, label = row['text'], row['label']
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"expected a JSON object with 'text' and 'label' ({e})")
+    if label not in LABEL_MAP:
+        raise ValueError(f"unknown label {label!r}, expected one of {sorted(LABEL_MAP)}")
+    return text, label
+
+
+def iter_labeled_jsonl(
+    lines: Iterable[Union[str, bytes]],
+    batch_size: int = 500
+) -> Iterator[Tuple[List[str], List[str]]]:
+    """
+    (texts, labels) mini-batches from JSONL lines of {"text", "label"}.
+    Only one batch is held in memory; blank lines are skipped.
+    """
+    texts, labels = [], []
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            text, label = parse_labeled_line(line)
+        except ValueError as e:
+            raise ValueError(f"Line {line_no}: {e}")
+        texts.append(text)
+        labels.append(label)
+        if len(texts) >= batch_size:
+            yield texts, labels
+            texts, labels = [], []
+    if texts:
+        yield texts, labels
+
+
+class StaleOnlineModel(Exception):
+    """An online run tried to publish over a model it did not start from"""
+
+
+class SentimentModel(NamedTuple):
+    """Fitted vectorizer + classifier pair; replaced as a whole, never mutated"""
+    vectorizer: Union[TfidfVectorizer, HashingVectorizer]
+    classifier: Union[LogisticRegression, SGDClassifier]
+    version: int
+
 
 class SentimentAnalyzer:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
+    def __init__(self, cache_max_bytes: int = 16 * 1024 * 1024, refresh_interval: float = 1.0):
+        self.model: Optional[SentimentModel] = None
+        # (model version, text_key) -> result; cleared whenever a model is swapped in
+        self.cache = LRUCache(max_bytes=cache_max_bytes)
+        # Versioned, memory-mapped artifacts: models/sentiment/v<N>/ + CURRENT
+        self.model_dir = 'models/sentiment'
+        # Pickles written by earlier versions, still loaded if present
+        self.legacy_model_path = 'models/sentiment_classifier.pkl'
+        self.legacy_vectorizer_path = 'models/sentiment_vectorizer.pkl'
+        # Serializes training runs so versions and the saved model stay in order
+        self._train_lock = threading.Lock()
+        # Online learner state as last committed; runs train on copies of it
+        self._online: Optional[Dict[str, Any]] = None
+        self._online_lock = threading.Lock()
+        # Seconds between checks of CURRENT for versions other workers published
+        self.refresh_interval = refresh_interval
+        self._checked_at = time.monotonic()
+        
+        # Try to load pre-trained model
+        self._load_model()
+    
+    @property
+    def is_trained(self) -> bool:
+        self._refresh()
+        return self.model is not None
+    
+    @property
+    def vectorizer(self) -> Optional[TfidfVectorizer]:
+        model = self.model
+        return model.vectorizer if model else None
+    
+    @property
+    def classifier(self) -> Optional[LogisticRegression]:
+        model = self.model
+        return model.classifier if model else None
+    
+    def _new_vectorizer(self) -> TfidfVectorizer:
+        return TfidfVectorizer(
             max_features=5000,
             ngram_range=(1, 2),
             stop_words='english',
-            min_df=2
+            min_df=2,
+            **SHARED_TOKENIZER
         )
-        self.classifier = LogisticRegression(
+    
+    def _new_classifier(self) -> LogisticRegression:
+        return LogisticRegression(
             max_iter=1000,
             random_state=42,
             class_weight='balanced'
         )
-        self.is_trained = False
-        self.model_path = 'models/sentiment_classifier.pkl'
-        self.vectorizer_path = 'models/sentiment_vectorizer.pkl'
-        
-        # Try to load pre-trained model
-        self._load_model()
+    
+    def _new_hashing_vectorizer(self) -> HashingVectorizer:
+        # Stateless: no vocabulary to fit or grow with the corpus
+        return HashingVectorizer(
+            n_features=2 ** 18,
+            ngram_range=(1, 2),
+            stop_words='english',
+            alternate_sign=False,
+            **SHARED_TOKENIZER
+        )
+    
+    def _new_online_classifier(self) -> SGDClassifier:
+        # log_loss keeps predict_proba available for analyze_batch
+        return SGDClassifier(
+            loss='log_loss',
+            alpha=1e-5,
+            random_state=42
+        )
+    
+    def _encode_labels(self, texts: List[str], labels: List[str]) -> np.ndarray:
+        if len(texts) != len(labels):
+            raise ValueError("Texts and labels must have same length")
+        unknown = set(labels) - set(LABEL_MAP)
+        if unknown:
+            raise ValueError(f"Unknown labels {sorted(unknown)}, expected one of {sorted(LABEL_MAP)}")
+        return np.array([LABEL_MAP[label] for label in labels])
     
     def _load_model(self):
         """Load pre-trained model if available"""
         try:
-            if os.path.exists(self.model_path) and os.path.exists(self.vectorizer_path):
-                self.classifier = joblib.load(self.model_path)
-                self.vectorizer = joblib.load(self.vectorizer_path)
-                self.is_trained = True
+            name = current_version(self.model_dir)
+            if name is not None:
+                self.model = self._load_version(name)
+            elif os.path.exists(self.legacy_model_path) and os.path.exists(self.legacy_vectorizer_path):
+                self.model = SentimentModel(
+                    joblib.load(self.legacy_vectorizer_path),
+                    joblib.load(self.legacy_model_path),
+                    1
+                )
         except:
             pass
     
+    def _refresh(self):
+        """
+        Serve the version another worker process published, if CURRENT
+        moved; CURRENT is read at most once per refresh_interval
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+        # Skip while this process publishes: the publish sets the live model itself
+        if self._train_lock.acquire(blocking=False):
+            try:
+                self._follow_current()
+            finally:
+                self._train_lock.release()
+    
+    def _follow_current(self):
+        """Make CURRENT's version the live model if it is not already (caller holds _train_lock)"""
+        name = current_version(self.model_dir)
+        model = self.model
+        if name is None or (model is not None and name == f"v{model.version}"):
+            return
+        try:
+            self.model = self._load_version(name)
+        except Exception:
+            # Pruned by a newer publish meanwhile; the next check follows that one
+            return
+        self.cache.clear()
+    
+    def _load_version(self, name: str) -> SentimentModel:
+        """
+        Memory-mapped load: coefficients, IDF weights and vocabulary stay
+        in the OS page cache, shared by every worker that maps them.
+        """
+        vectorizer, classifier, meta = load_text_model(os.path.join(self.model_dir, name))
+        return SentimentModel(vectorizer, classifier, meta['version'])
+    
+    def _save_model(self, vectorizer, classifier) -> SentimentModel:
+        """
+        Write a new version directory, point CURRENT at it, and map it back.
+        The version number is reserved on disk, so it is unique across
+        worker processes sharing model_dir.
+        """
+        version, name = reserve_version(self.model_dir)
+        directory = os.path.join(self.model_dir, name)
+        try:
+            save_text_model(directory, vectorizer, classifier, meta={'version': version})
+        except BaseException:
+            os.rmdir(directory)
+            raise
+        publish_version(self.model_dir, name)
+        # Serve from the mapped copy so this process shares pages with the others
+        return self._load_version(name)
+    
     def train(self, texts: List[str], labels: List[str]) -> Dict[str, float]:
         """
         Train sentiment classifier on labeled data.
         Labels should be: 'positive', 'negative', 'neutral'
-        """
-        if len(texts) != len(labels):
-            raise ValueError("Texts and labels must have same length")
         
+        A new vectorizer + classifier pair is fitted off to the side,
+        saved, and then swapped in with one reference assignment, so
+        concurrent analyze_batch calls see either the old or the new pair.
+        """
         # Encode labels
-        label_map = {'positive': 1, 'neutral': 0, 'negative': -1}
-        y = np.array([label_map[label] for label in labels])
+        y = self._encode_labels(texts, labels)
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -59,24 +250,22 @@ class SentimentAnalyzer:
         )
         
         # Fit vectorizer and transform
-        X_train_vec = self.vectorizer.fit_transform(X_train)
-        X_test_vec = self.vectorizer.transform(X_test)
+        vectorizer = self._new_vectorizer()
+        X_train_vec = vectorizer.fit_transform(X_train)
+        X_test_vec = vectorizer.transform(X_test)
         
         # Train classifier
-        self.classifier.fit(X_train_vec, y_train)
-        self.is_trained = True
+        classifier = self._new_classifier()
+        classifier.fit(X_train_vec, y_train)
         
         # Evaluate
-        y_pred = self.classifier.predict(X_test_vec)
+        y_pred = classifier.predict(X_test_vec)
         accuracy = accuracy_score(y_test, y_pred)
         precision, recall, f1, _ = precision_recall_fscore_support(
             y_test, y_pred, average='weighted', zero_division=0
         )
         
-        # Save model
-        os.makedirs('models', exist_ok=True)
-        joblib.dump(self.classifier, self.model_path)
-        joblib.dump(self.vectorizer, self.vectorizer_path)
+        model = self._publish(vectorizer, classifier)
         
         return {
             'accuracy': round(accuracy, 4),
@@ -84,12 +273,149 @@ class SentimentAnalyzer:
             'recall': round(recall, 4),
             'f1_score': round(f1, 4),
             'training_samples': len(texts),
-            'test_samples': len(X_test)
+            'test_samples': len(X_test),
+            'model_version': model.version
+        }
+    
+    def _publish(self, vectorizer, classifier, base_version: Optional[int] = None) -> SentimentModel:
+        """
+        Save a fitted pair, then make it the live model. With base_version,
+        refuse (StaleOnlineModel) if the live model is no longer that version.
+        """
+        with self._train_lock:
+            self._follow_current()
+            live_version = self.model.version if self.model else 0
+            if base_version is not None and base_version != live_version:
+                raise StaleOnlineModel(
+                    f"The sentiment model changed to v{live_version} while this online run "
+                    f"was training from v{base_version}; retry the run"
+                )
+            model = self._save_model(vectorizer, classifier)
+            self.model = model
+            # Keys carry the version, so this only frees memory early
+            self.cache.clear()
+        return model
+    
+    # ============ Online training ============
+    
+    def start_online(self) -> Dict[str, Any]:
+        """
+        A private copy of the online learner for one training run: pass it
+        to partial_train for each batch, then to commit_online. Nothing is
+        shared until the commit, so a failed or abandoned run leaves no trace.
+        
+        Continues from the last committed online state while the live model
+        is still the one it published; after a retrain, from the live model
+        if it is an online model, otherwise from scratch. The counters
+        (samples_seen, batches, progressive_accuracy) cover this run only.
+        """
+        self._refresh()
+        with self._online_lock:
+            live_version = self.model.version if self.model else 0
+            committed = self._online
+            if committed is not None and committed['base_version'] == live_version:
+                online = copy.deepcopy(committed)
+            else:
+                online = self._start_online()
+        online.update(samples_seen=0, batches=0, evaluated=0, correct=0)
+        return online
+    
+    def partial_train(
+        self,
+        texts: List[str],
+        labels: List[str],
+        online: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fold one labeled mini-batch into the online learner `online` (from
+        start_online): hashed features + SGD logistic regression, so memory
+        is independent of how much data has been seen. Each batch is scored
+        before it is learned from, which gives a progressive (test-then-train)
+        accuracy.
+        
+        Without `online`, the batch is learned and committed on its own.
+        """
+        y = self._encode_labels(texts, labels)
+        commit = online is None
+        if commit:
+            online = self.start_online()
+        
+        X = online['vectorizer'].transform(texts)
+        if hasattr(online['classifier'], 'coef_'):
+            online['evaluated'] += len(y)
+            online['correct'] += int((online['classifier'].predict(X) == y).sum())
+        online['classifier'].partial_fit(X, y, classes=ONLINE_CLASSES)
+        online['samples_seen'] += len(y)
+        online['batches'] += 1
+        
+        if commit:
+            return self.commit_online(online)
+        return self._online_metrics(online)
+    
+    def partial_train_stream(self, batches: Iterable[Tuple[List[str], List[str]]]) -> Dict[str, Any]:
+        """
+        partial_train over streamed (texts, labels) batches, committed once
+        at the end; an error in any batch commits nothing
+        """
+        online = self.start_online()
+        for texts, labels in batches:
+            self.partial_train(texts, labels, online)
+        return self.commit_online(online)
+    
+    def partial_train_jsonl(self, path: str, batch_size: int = 500) -> Dict[str, Any]:
+        """Stream a JSONL file of {"text", "label"} rows through partial_train"""
+        with open(path, encoding='utf-8') as lines:
+            return self.partial_train_stream(iter_labeled_jsonl(lines, batch_size))
+    
+    def commit_online(self, online: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Publish a learner from start_online as the live model and make it
+        the state the next run continues from. Raises StaleOnlineModel if
+        another model was published since the run started, so concurrent
+        runs never overwrite each other's updates.
+        """
+        if not hasattr(online['classifier'], 'coef_'):
+            raise ValueError("The online model has not seen any labeled data yet")
+        with self._online_lock:
+            model = self._publish(online['vectorizer'], online['classifier'], base_version=online['base_version'])
+            # The run's copy is never touched again; later runs copy it
+            online['base_version'] = model.version
+            self._online = online
+            return {**self._online_metrics(online), 'model_version': model.version}
+    
+    def _start_online(self) -> Dict[str, Any]:
+        model = self.model
+        if model is not None and isinstance(model.classifier, SGDClassifier):
+            vectorizer, classifier = model.vectorizer, copy.deepcopy(model.classifier)
+            # partial_fit updates these in place; the live ones are read-only memmaps
+            classifier.coef_ = np.array(classifier.coef_)
+            classifier.intercept_ = np.array(classifier.intercept_)
+        else:
+            vectorizer, classifier = self._new_hashing_vectorizer(), self._new_online_classifier()
+        return {
+            'vectorizer': vectorizer,
+            'classifier': classifier,
+            # Live model version this learner continues from
+            'base_version': model.version if model else 0
+        }
+    
+    def _online_metrics(self, online: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'algorithm': 'sgd_log_loss',
+            'samples_seen': online['samples_seen'],
+            'batches': online['batches'],
+            'progressive_accuracy': round(online['correct'] / online['evaluated'], 4)
+            if online['evaluated'] else None
         }
     
+    # ============ Inference ============
+    
     def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
         """Analyze sentiment for multiple texts"""
-        if not self.is_trained:
+        self._refresh()
+        # Read the reference once: a concurrent swap cannot mix two models
+        model = self.model
+        if model is None:
             # Return neutral for untrained model
             return [{
                 'sentiment': 'neutral',
@@ -97,10 +423,29 @@ class SentimentAnalyzer:
                 'scores': {'positive': 0.33, 'neutral': 0.34, 'negative': 0.33}
             } for _ in texts]
         
+        # Only texts not seen under this model version are vectorized,
+        # each distinct one once
+        keys = [(model.version, text_key(text)) for text in texts]
+        results = [self.cache.get(key) for key in keys]
+        misses = {}
+        for i, result in enumerate(results):
+            if result is None:
+                misses.setdefault(keys[i], i)
+        if misses:
+            computed = dict(zip(misses, self._predict(model, [texts[i] for i in misses.values()])))
+            for key, result in computed.items():
+                self.cache.put(key, result)
+            results = [computed[key] if result is None else result for key, result in zip(keys, results)]
+        return results
+    
+    def _predict(self, model: SentimentModel, texts: List[str]) -> List[Dict[str, Any]]:
+        """Label and class probabilities for every text"""
         results = []
-        X = self.vectorizer.transform(texts)
-        predictions = self.classifier.predict(X)
-        probabilities = self.classifier.predict_proba(X)
+        X = model.vectorizer.transform(texts)
+        # One predict_proba pass; the label is its argmax (what predict returns)
+        probabilities = model.classifier.predict_proba(X)
+        classes = model.classifier.classes_
+        predictions = classes[np.argmax(probabilities, axis=1)]
         
         label_map_inv = {1: 'positive', 0: 'neutral', -1: 'negative'}
         
@@ -109,7 +454,6 @@ class SentimentAnalyzer:
             confidence = np.max(probs)
             
             # Get class probabilities
-            classes = self.classifier.classes_
             scores = {
                 label_map_inv[cls]: round(float(prob), 3)
                 for cls, prob in zip(classes, probs)
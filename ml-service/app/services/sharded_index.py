@@ -0,0 +1,252 @@
+"""
+Sharded Alumni Index
+Partitions the alumni pool across worker processes that keep their shard's
+matrices resident, score a student locally and return a local top-k
+"""
+from typing import List, Dict, Any, Optional, Iterable
+import multiprocessing
+import threading
+import time
+
+from .alumni_index import make_text_vectorizer, profile_text
+
+
+def _shard_worker(conn, ann_params):
+    """Worker loop: owns one AlumniIndex shard and answers commands over a pipe"""
+    # Imported here so the spawned process only pays for it once
+    from .recommender import AlumniRecommender
+
+    recommender = AlumniRecommender(ann_params=ann_params, cache_max_bytes=0)
+    index = recommender.index
+    while True:
+        command, args = conn.recv()
+        if command == 'stop':
+            break
+        try:
+            if command == 'sync':
+                vectorizer, upserts, deletes = args
+                if deletes:
+                    index.delete(deletes)
+                if upserts:
+                    index.upsert(upserts)
+                index.set_vectorizer(vectorizer)
+                # Rebuild now so the next query does not pay for it
+                index.build()
+                result = len(index)
+            elif command == 'rank':
+                student_profile, limit, exclude_ids, branch, mode = args
+                result = recommender._rank(index, student_profile, limit, exclude_ids, branch, mode) \
+                    if len(index) else []
+            else:
+                raise ValueError(f"Unknown shard command '{command}'")
+            conn.send(('ok', result))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+def _merge_key(recommendation: Dict[str, Any]):
+    """Best first: highest match, then closest k-NN neighbour"""
+    return (-recommendation['match_percent'], recommendation.get('knn_distance', 0.0))
+
+
+class ShardedAlumniIndex:
+    def __init__(
+        self,
+        num_shards: int,
+        ann_params: Optional[Dict[str, Any]] = None,
+        reply_timeout: float = 120.0
+    ):
+        """
+        Start `num_shards` worker processes. The parent keeps the
+        id -> shard assignment, every profile (to rebuild a restarted
+        shard) and the profile text needed to fit one global TF-IDF
+        vectorizer, so text scores match single-process mode. k-NN feature
+        scaling is per shard.
+
+        A shard that dies or does not answer within reply_timeout seconds
+        (a sync, which rebuilds the shard, must fit too) fails that call,
+        and every shard is restarted and resynced before the next one.
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+
+        self.num_shards = num_shards
+        self.ann_params = ann_params
+        self.reply_timeout = reply_timeout
+        self.version = 0
+        self.restarts = 0
+        self.lock = threading.RLock()
+        self._profiles: Dict[Any, Dict[str, Any]] = {}
+        self._texts: Dict[Any, str] = {}
+        self._shard_of: Dict[Any, int] = {}
+        self._shard_sizes = [0] * num_shards
+        self._pending = [{'upserts': {}, 'deletes': set()} for _ in range(num_shards)]
+        self._dirty = False
+        self._conns = []
+        self._processes = []
+        self._start_shards()
+
+    def _start_shards(self):
+        context = multiprocessing.get_context('spawn')
+        for _ in range(self.num_shards):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_shard_worker, args=(child_conn, self.ann_params), daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+    def _restart(self):
+        """
+        Replace every shard process and queue the whole pool for resync.
+        All pipes are new, so no reply of a failed round can be read as
+        the answer to a later one.
+        """
+        for conn, process in zip(self._conns, self._processes):
+            process.kill()
+            process.join(timeout=5)
+            conn.close()
+        self._conns = []
+        self._processes = []
+        self._start_shards()
+        self.restarts += 1
+
+        self._pending = [{'upserts': {}, 'deletes': set()} for _ in range(self.num_shards)]
+        for alumni_id, shard in self._shard_of.items():
+            self._pending[shard]['upserts'][alumni_id] = self._profiles[alumni_id]
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._shard_of)
+
+    def ids(self) -> List[Any]:
+        """Ids of the indexed profiles"""
+        return list(self._shard_of)
+
+    # ============ Mutations ============
+
+    def upsert(self, alumni_profiles: List[Dict[str, Any]]) -> int:
+        """Insert or replace profiles by id; new ids go to the smallest shard"""
+        if any(profile.get('id') is None for profile in alumni_profiles):
+            raise ValueError("Alumni profiles must have an 'id' to be indexed")
+
+        with self.lock:
+            for profile in alumni_profiles:
+                alumni_id = profile['id']
+                shard = self._shard_of.get(alumni_id)
+                if shard is None:
+                    shard = min(range(self.num_shards), key=self._shard_sizes.__getitem__)
+                    self._shard_of[alumni_id] = shard
+                    self._shard_sizes[shard] += 1
+                self._profiles[alumni_id] = profile
+                self._texts[alumni_id] = profile_text(profile)
+                self._pending[shard]['upserts'][alumni_id] = profile
+                self._pending[shard]['deletes'].discard(alumni_id)
+            return self._touch()
+
+    def delete(self, alumni_ids: Iterable[Any]) -> int:
+        """Remove profiles by id (unknown ids are ignored)"""
+        with self.lock:
+            removed = False
+            for alumni_id in alumni_ids:
+                shard = self._shard_of.pop(alumni_id, None)
+                if shard is None:
+                    continue
+                del self._profiles[alumni_id]
+                del self._texts[alumni_id]
+                self._shard_sizes[shard] -= 1
+                self._pending[shard]['upserts'].pop(alumni_id, None)
+                self._pending[shard]['deletes'].add(alumni_id)
+                removed = True
+            return self._touch() if removed else self.version
+
+    def _touch(self) -> int:
+        self.version += 1
+        self._dirty = True
+        return self.version
+
+    def _sync(self):
+        """Refit the global vectorizer and push pending changes to every shard"""
+        if not self._dirty:
+            return
+        vectorizer = make_text_vectorizer()
+        try:
+            vectorizer.fit(list(self._texts.values()))
+        except ValueError:
+            # Empty vocabulary: shards fall back to fitting their own
+            vectorizer = None
+
+        self._scatter([
+            ('sync', (vectorizer, list(pending['upserts'].values()), list(pending['deletes'])))
+            for pending in self._pending
+        ])
+        self._pending = [{'upserts': {}, 'deletes': set()} for _ in range(self.num_shards)]
+        self._dirty = False
+
+    def _scatter(self, commands: List[tuple]) -> List[Any]:
+        """
+        Send one command to each shard and wait for every reply, raising
+        the first shard error. A dead or silent shard restarts all of them.
+        """
+        deadline = time.monotonic() + self.reply_timeout
+        replies = []
+        try:
+            for conn, command in zip(self._conns, commands):
+                conn.send(command)
+            for shard, conn in enumerate(self._conns):
+                if not conn.poll(max(0.0, deadline - time.monotonic())):
+                    raise TimeoutError(f"shard {shard} did not answer within {self.reply_timeout}s")
+                replies.append(conn.recv())
+        except (EOFError, OSError, TimeoutError) as e:
+            self._restart()
+            raise RuntimeError(f"Shard worker failed, shards restarted: {type(e).__name__}: {e}")
+
+        for status, payload in replies:
+            if status == 'error':
+                raise RuntimeError(f"Shard worker failed: {payload}")
+        return [payload for _, payload in replies]
+
+    # ============ Queries ============
+
+    def recommend(
+        self,
+        student_profile: Dict[str, Any],
+        limit: int = 10,
+        exclude_ids: Optional[List[Any]] = None,
+        branch: Optional[str] = None,
+        mode: str = 'exact'
+    ) -> List[Dict[str, Any]]:
+        """Scatter the query to all shards in parallel and merge their top-k"""
+        with self.lock:
+            self._sync()
+            shard_results = self._scatter(
+                [('rank', (student_profile, limit, exclude_ids, branch, mode))] * self.num_shards
+            )
+
+        merged = [rec for results in shard_results for rec in results]
+        merged.sort(key=_merge_key)
+        return merged[:limit]
+
+    def close(self):
+        """Stop the worker processes"""
+        with self.lock:
+            for conn, process in zip(self._conns, self._processes):
+                try:
+                    conn.send(('stop', None))
+                except (BrokenPipeError, OSError):
+                    pass
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            self._conns = []
+            self._processes = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'shards': self.num_shards,
+            'shard_sizes': list(self._shard_sizes),
+            'size': len(self),
+            'version': self.version,
+            'restarts': self.restarts
+        }
@@ -3,13 +3,18 @@ Topic Modeling Service
 Uses LDA (Latent Dirichlet Allocation) and keyword extraction (RAKE/YAKE)
 """
 from gensim import corpora
-from gensim.models import LdaModel
+from gensim.models import LdaModel, LdaMulticore
 from gensim.models.coherencemodel import CoherenceModel
 import yake
 from rake_nltk import Rake
 import nltk
-from typing import List, Dict, Any
-import re
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import os
+import tempfile
+import threading
+
+from .corpus_stream import TextFileCorpus, TokenStream, build_dictionary, serialize_corpus
+from .preprocessing import configure_token_cache, topic_stopwords, topic_tokens
 
 # Download required NLTK data
 try:
@@ -21,81 +26,195 @@ try:
 except LookupError:
     nltk.download('punkt', quiet=True)
 
+LDA_MODES = ('single', 'multicore')
+COHERENCE_MODES = ('none', 'u_mass', 'c_v', 'c_v_async')
+# Top words per topic that coherence is measured on (CoherenceModel's default)
+COHERENCE_TOPN = 20
+
+
+def fit_lda(
+    corpus: List[List[tuple]],
+    dictionary: corpora.Dictionary,
+    num_topics: int,
+    passes: int = 10,
+    mode: str = 'single',
+    workers: Optional[int] = None,
+    chunksize: int = 2000,
+    **kwargs
+) -> LdaModel:
+    """
+    Train LDA in one process ('single', LdaModel with alpha='auto') or
+    across `workers` processes ('multicore', LdaMulticore; None or 0 means
+    cores - 1). LdaMulticore cannot learn alpha, so 'multicore' falls back
+    to alpha='asymmetric': a fixed prior of 1 / (topic_index + sqrt(num_topics)),
+    the usual stand-in for the skewed alpha that 'auto' tends to learn.
+    """
+    if mode not in LDA_MODES:
+        raise ValueError(f"Unknown LDA mode {mode!r}, expected one of {list(LDA_MODES)}")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    
+    if mode == 'multicore':
+        return LdaMulticore(
+            corpus=corpus,
+            num_topics=num_topics,
+            id2word=dictionary,
+            random_state=42,
+            passes=passes,
+            alpha='asymmetric',
+            workers=workers or None,
+            chunksize=chunksize,
+            **kwargs
+        )
+    return LdaModel(
+        corpus=corpus,
+        num_topics=num_topics,
+        id2word=dictionary,
+        random_state=42,
+        passes=passes,
+        alpha='auto',
+        chunksize=chunksize,
+        **kwargs
+    )
+
 class TopicModeler:
     def __init__(self):
-        self.stop_words = set(nltk.corpus.stopwords.words('english'))
+        self.stop_words = topic_stopwords()
         self.yake_extractor = yake.KeywordExtractor(
             lan="en",
             n=3,  # max n-gram size
             dedupLim=0.9,
             top=10
         )
+        self._rake_local = threading.local()
+    
+    @property
+    def rake_extractor(self) -> Rake:
+        """Reused across calls, one per thread (RAKE keeps the last text's phrases)"""
+        rake = getattr(self._rake_local, 'rake', None)
+        if rake is None:
+            rake = self._rake_local.rake = Rake()
+        return rake
     
     def _preprocess(self, text: str) -> List[str]:
-        """Preprocess text for topic modeling"""
-        # Lowercase and remove special characters
-        text = re.sub(r'[^a-zA-Z\s]', '', text.lower())
-        # Tokenize
-        tokens = text.split()
-        # Remove stopwords and short tokens
-        tokens = [t for t in tokens if t not in self.stop_words and len(t) > 3]
-        return tokens
+        """Preprocess text for topic modeling (cached, see preprocessing.topic_tokens)"""
+        return list(topic_tokens(text))
     
-    def extract_topics(self, texts: List[str], num_topics: int = 5) -> Dict[str, Any]:
+    def extract_topics(
+        self,
+        texts: List[str],
+        num_topics: int = 5,
+        mode: str = 'single',
+        workers: Optional[int] = None,
+        chunksize: int = 2000,
+        coherence: str = 'c_v'
+    ) -> Dict[str, Any]:
         """
         Extract topics using LDA.
         Returns topics with keywords and coherence score.
+        mode='multicore' trains with LdaMulticore (see fit_lda).
+        
+        coherence: 'none' skips scoring; 'u_mass' reuses the bag-of-words
+        corpus (cheap); 'c_v' runs sliding-window co-occurrence over all
+        texts (often slower than the fit); 'c_v_async' leaves the score
+        to coherence_task and returns the top words it needs in
+        'coherence_topics'. A failed score is reported in 'coherence_error'.
         """
+        if coherence not in COHERENCE_MODES:
+            raise ValueError(f"Unknown coherence {coherence!r}, expected one of {list(COHERENCE_MODES)}")
         if not texts or len(texts) < num_topics:
             return {
                 'topics': [],
+                'coherence': coherence,
                 'coherence_score': 0.0
             }
         
-        # Preprocess documents
-        processed_docs = [self._preprocess(text) for text in texts]
-        processed_docs = [doc for doc in processed_docs if len(doc) > 3]
-        
-        if not processed_docs:
-            return {
-                'topics': [],
-                'coherence_score': 0.0
-            }
-        
-        # Create dictionary and corpus
-        dictionary = corpora.Dictionary(processed_docs)
-        dictionary.filter_extremes(no_below=2, no_above=0.8)
-        corpus = [dictionary.doc2bow(doc) for doc in processed_docs]
+        processed_docs, dictionary, corpus = self._build_corpus(texts)
         
         if not corpus or len(dictionary) < 10:
             return {
                 'topics': [],
+                'coherence': coherence,
                 'coherence_score': 0.0
             }
         
         # Train LDA model
-        lda_model = LdaModel(
-            corpus=corpus,
-            num_topics=num_topics,
-            id2word=dictionary,
-            random_state=42,
+        lda_model = fit_lda(
+            corpus,
+            dictionary,
+            num_topics,
             passes=10,
-            alpha='auto',
+            mode=mode,
+            workers=workers,
+            chunksize=chunksize,
             per_word_topics=True
         )
         
-        # Calculate coherence
-        try:
-            coherence_model = CoherenceModel(
-                model=lda_model,
-                texts=processed_docs,
-                dictionary=dictionary,
-                coherence='c_v'
+        return self._topics_result(lda_model, num_topics, coherence, processed_docs, corpus, dictionary)
+    
+    def extract_topics_from_file(
+        self,
+        path: str,
+        num_topics: int = 5,
+        mode: str = 'single',
+        workers: Optional[int] = None,
+        chunksize: int = 2000,
+        coherence: str = 'u_mass',
+        field: str = 'text',
+        work_dir: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        extract_topics over a local JSONL or plain-text file that does not
+        need to fit in memory. One pass builds the dictionary, a second
+        writes the bag-of-words corpus to a Matrix Market file in work_dir
+        (a temporary directory by default), and LDA trains by streaming that
+        file chunksize documents at a time. Texts are never all in memory,
+        so peak memory follows the vocabulary and chunk size, not the corpus
+        size. 'c_v_async' is scored synchronously here (the caller already
+        runs this as a job).
+        """
+        if coherence not in COHERENCE_MODES:
+            raise ValueError(f"Unknown coherence {coherence!r}, expected one of {list(COHERENCE_MODES)}")
+        
+        docs = TokenStream(TextFileCorpus(path, field=field), self._preprocess)
+        dictionary = build_dictionary(docs)
+        
+        with tempfile.TemporaryDirectory(prefix='corpus-', dir=work_dir) as tmp_dir:
+            corpus_path = os.path.join(tmp_dir, 'corpus.mm')
+            corpus = serialize_corpus(corpus_path, docs, dictionary)
+            stats = {
+                'documents': corpus.num_docs,
+                'vocabulary_size': len(dictionary),
+                'corpus_bytes': os.path.getsize(corpus_path)
+            }
+            coherence = 'c_v' if coherence == 'c_v_async' else coherence
+            if corpus.num_docs < max(num_topics, 1) or len(dictionary) < 10:
+                return {'topics': [], 'coherence': coherence, 'coherence_score': 0.0, 'corpus': stats}
+            
+            lda_model = fit_lda(
+                corpus,
+                dictionary,
+                num_topics,
+                passes=10,
+                mode=mode,
+                workers=workers,
+                chunksize=chunksize
             )
-            coherence_score = coherence_model.get_coherence()
-        except:
-            coherence_score = 0.0
+            result = self._topics_result(lda_model, num_topics, coherence, docs, corpus, dictionary)
         
+        result['corpus'] = stats
+        return result
+    
+    def _topics_result(
+        self,
+        lda_model: LdaModel,
+        num_topics: int,
+        coherence: str,
+        processed_docs: Iterable[List[str]],
+        corpus: Iterable[List[tuple]],
+        dictionary: corpora.Dictionary
+    ) -> Dict[str, Any]:
+        """Keywords of every topic plus the requested coherence score"""
         # Extract topics
         topics = []
         for topic_id in range(num_topics):
@@ -107,10 +226,60 @@ class TopicModeler:
                 'top_keywords': [word for word, _ in topic_words[:5]]
             })
         
-        return {
+        result = {
             'topics': topics,
-            'coherence_score': round(coherence_score, 4)
+            'coherence': coherence,
+            'coherence_score': None
         }
+        
+        # Calculate coherence
+        if coherence == 'c_v_async':
+            # Scored later by coherence_task, from the same top words
+            result['coherence_topics'] = [
+                [word for word, _ in lda_model.show_topic(topic_id, topn=COHERENCE_TOPN)]
+                for topic_id in range(num_topics)
+            ]
+        elif coherence != 'none':
+            try:
+                coherence_model = CoherenceModel(
+                    model=lda_model,
+                    texts=processed_docs if coherence == 'c_v' else None,
+                    corpus=corpus if coherence == 'u_mass' else None,
+                    dictionary=dictionary,
+                    coherence=coherence,
+                    topn=COHERENCE_TOPN
+                )
+                result['coherence_score'] = round(float(coherence_model.get_coherence()), 4)
+            except Exception as e:
+                result['coherence_error'] = f"{type(e).__name__}: {e}"
+        
+        return result
+    
+    def _build_corpus(self, texts: List[str]) -> Tuple[List[List[str]], corpora.Dictionary, List[List[tuple]]]:
+        """Preprocessed documents, filtered dictionary and bag-of-words corpus"""
+        processed_docs = [self._preprocess(text) for text in texts]
+        processed_docs = [doc for doc in processed_docs if len(doc) > 3]
+        
+        dictionary = corpora.Dictionary(processed_docs)
+        dictionary.filter_extremes(no_below=2, no_above=0.8)
+        corpus = [dictionary.doc2bow(doc) for doc in processed_docs]
+        return processed_docs, dictionary, corpus
+    
+    def c_v_coherence(self, texts: List[str], topics: List[List[str]]) -> float:
+        """
+        c_v coherence of topics (lists of top words) over texts, for topics
+        extracted earlier with coherence='c_v_async'. The corpus is rebuilt
+        exactly as extract_topics built it.
+        """
+        processed_docs, dictionary, _ = self._build_corpus(texts)
+        coherence_model = CoherenceModel(
+            topics=topics,
+            texts=processed_docs,
+            dictionary=dictionary,
+            coherence='c_v',
+            topn=COHERENCE_TOPN
+        )
+        return round(float(coherence_model.get_coherence()), 4)
     
     def extract_keywords_yake(self, texts: List[str]) -> List[Dict[str, Any]]:
         """Extract keywords using YAKE algorithm"""
@@ -128,7 +297,7 @@ class TopicModeler:
     
     def extract_keywords_rake(self, texts: List[str]) -> List[Dict[str, Any]]:
         """Extract keywords using RAKE algorithm"""
-        rake = Rake()
+        rake = self.rake_extractor
         results = []
         
         for text in texts:
@@ -144,6 +313,13 @@ class TopicModeler:
         
         return results
     
+    def document_keywords(self, texts: List[str]) -> List[List[str]]:
+        """Lowercased YAKE keywords of each text, for trending counts"""
+        return [
+            list(dict.fromkeys(kw.lower() for kw, _ in self.yake_extractor.extract_keywords(text)))
+            for text in texts
+        ]
+    
     def get_trending_keywords(self, texts: List[str], top_n: int = 20) -> List[Dict[str, Any]]:
         """Get trending keywords across all texts"""
         all_keywords = {}
@@ -176,3 +352,46 @@ class TopicModeler:
             }
             for item in trending
         ]
+
+
+# ============ Process pool tasks ============
+# Module-level so they pickle by reference; each worker process builds its
+# own TopicModeler (and YAKE extractor) once and reuses it.
+
+_worker_modeler = None
+
+
+def _get_worker_modeler() -> TopicModeler:
+    global _worker_modeler
+    if _worker_modeler is None:
+        _worker_modeler = TopicModeler()
+    return _worker_modeler
+
+
+def init_worker(token_cache_max_bytes: Optional[int] = None):
+    """Process pool initializer: build the extractors before the first task"""
+    if token_cache_max_bytes is not None:
+        configure_token_cache(token_cache_max_bytes)
+    _get_worker_modeler()
+
+
+def extract_topics_task(texts: List[str], num_topics: int = 5, **lda_options) -> Dict[str, Any]:
+    return _get_worker_modeler().extract_topics(texts, num_topics, **lda_options)
+
+
+def coherence_task(texts: List[str], topics: List[List[str]]) -> Dict[str, Any]:
+    return {
+        'coherence': 'c_v',
+        'coherence_score': _get_worker_modeler().c_v_coherence(texts, topics)
+    }
+
+
+def document_keywords_task(texts: List[str]) -> List[List[str]]:
+    return _get_worker_modeler().document_keywords(texts)
+
+
+def extract_keywords_task(texts: List[str], method: str = "yake") -> List[Dict[str, Any]]:
+    modeler = _get_worker_modeler()
+    if method == "yake":
+        return modeler.extract_keywords_yake(texts)
+    return modeler.extract_keywords_rake(texts)
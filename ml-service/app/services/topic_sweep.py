@@ -0,0 +1,148 @@
+"""
+Topic Count Sweep
+Trains LDA for a range of num_topics values in parallel worker processes
+over one shared, prebuilt dictionary and corpus, scores each model with
+u_mass coherence and stops once coherence stops improving
+"""
+from gensim import corpora
+from gensim.models.coherencemodel import CoherenceModel
+from typing import Any, Dict, List, Optional
+import asyncio
+import os
+import time
+
+from .corpus_stream import TokenStream, build_dictionary, serialize_corpus
+from .executor import BoundedExecutor
+from .preprocessing import topic_tokens
+from .topic_modeler import COHERENCE_TOPN, fit_lda
+
+DICTIONARY_FILE = 'dictionary.dict'
+CORPUS_FILE = 'corpus.mm'
+MODEL_FILE = 'lda.model'
+# Upper bound on the models one sweep may train
+MAX_TOPIC_COUNTS = 50
+
+
+def topic_counts(min_topics: int, max_topics: int, step: int = 1) -> List[int]:
+    """The num_topics values of a sweep, validated"""
+    if min_topics < 2:
+        raise ValueError("min_topics must be at least 2")
+    if max_topics < min_topics:
+        raise ValueError("max_topics must be at least min_topics")
+    if step < 1:
+        raise ValueError("step must be at least 1")
+    counts = list(range(min_topics, max_topics + 1, step))
+    if len(counts) > MAX_TOPIC_COUNTS:
+        raise ValueError(f"A sweep trains at most {MAX_TOPIC_COUNTS} models, got {len(counts)}")
+    return counts
+
+
+# ============ Process pool tasks ============
+
+def prepare_corpus_task(texts: List[str], work_dir: str) -> Dict[str, int]:
+    """
+    Tokenize the texts once and write the dictionary and Matrix Market
+    corpus that every fit_topic_count_task of the sweep reads. Same
+    tokens and filtering as OnlineTopicModel.train.
+    """
+    docs = list(TokenStream(texts, topic_tokens))
+    dictionary = build_dictionary(docs)
+    corpus = serialize_corpus(os.path.join(work_dir, CORPUS_FILE), docs, dictionary)
+    dictionary.save(os.path.join(work_dir, DICTIONARY_FILE))
+    return {'documents': corpus.num_docs, 'vocabulary_size': len(dictionary)}
+
+
+def fit_topic_count_task(work_dir: str, num_topics: int, passes: int = 10, chunksize: int = 2000) -> Dict[str, Any]:
+    """
+    Train one single-process LDA model on the shared corpus (streamed from
+    disk, so concurrent workers share it through the page cache), score it
+    and save it under work_dir/k<num_topics>/
+    """
+    dictionary = corpora.Dictionary.load(os.path.join(work_dir, DICTIONARY_FILE))
+    corpus = corpora.MmCorpus(os.path.join(work_dir, CORPUS_FILE))
+
+    start = time.perf_counter()
+    lda = fit_lda(corpus, dictionary, num_topics, passes=passes, chunksize=chunksize)
+    train_seconds = time.perf_counter() - start
+
+    coherence = CoherenceModel(
+        model=lda,
+        corpus=corpus,
+        dictionary=dictionary,
+        coherence='u_mass',
+        topn=COHERENCE_TOPN
+    ).get_coherence()
+
+    model_path = os.path.join(work_dir, f"k{num_topics}", MODEL_FILE)
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    lda.save(model_path)
+    return {
+        'num_topics': num_topics,
+        'coherence_score': round(float(coherence), 4),
+        'train_seconds': round(train_seconds, 2),
+        'model_path': model_path
+    }
+
+
+# ============ Sweep ============
+
+async def sweep_num_topics(
+    executor: BoundedExecutor,
+    texts: List[str],
+    counts: List[int],
+    work_dir: str,
+    patience: int = 2,
+    min_delta: float = 0.0,
+    parallel: Optional[int] = None,
+    passes: int = 10,
+    chunksize: int = 2000
+) -> Dict[str, Any]:
+    """
+    Train one model per topic count on `executor` (a process pool),
+    `parallel` at a time (default: its worker count), in increasing order.
+    A model improves on the best so far if its coherence is higher by more
+    than min_delta; the sweep stops after `patience` topic counts in a row
+    without improvement. Models already running when it stops still count.
+    The best model stays in work_dir at 'best_model_path'.
+    """
+    if patience < 1:
+        raise ValueError("patience must be at least 1")
+
+    corpus_stats = await executor.run_when_available(prepare_corpus_task, texts, work_dir)
+    if corpus_stats['documents'] < max(counts):
+        raise ValueError(
+            f"Need at least {max(counts)} documents with enough content, got {corpus_stats['documents']}"
+        )
+    if corpus_stats['vocabulary_size'] < 10:
+        raise ValueError("Vocabulary too small after filtering; add more documents")
+
+    parallel = max(1, parallel or executor.max_workers)
+    curve: List[Dict[str, Any]] = []
+    best = None
+    stale = 0
+    for start in range(0, len(counts), parallel):
+        results = await asyncio.gather(*(
+            executor.run_when_available(fit_topic_count_task, work_dir, num_topics, passes, chunksize)
+            for num_topics in counts[start:start + parallel]
+        ))
+        for result in results:
+            curve.append(result)
+            if best is None or result['coherence_score'] > best['coherence_score'] + min_delta:
+                best, stale = result, 0
+            else:
+                stale += 1
+        if stale >= patience:
+            break
+
+    return {
+        **corpus_stats,
+        'coherence': 'u_mass',
+        'best_num_topics': best['num_topics'],
+        'best_coherence_score': best['coherence_score'],
+        'best_model_path': best['model_path'],
+        'stopped_early': len(curve) < len(counts),
+        'curve': [
+            {key: value for key, value in result.items() if key != 'model_path'}
+            for result in curve
+        ]
+    }
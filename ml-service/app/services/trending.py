@@ -0,0 +1,398 @@
+"""
+Trending Topics
+Keyword counts aggregated per scope and hour at ingestion time, so trending
+queries compare pre-aggregated windows instead of re-reading any text
+"""
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+import json
+import os
+import threading
+import time
+
+from .file_lock import exclusive_lock
+
+GLOBAL_SCOPE = 'global'
+PERIOD_HOURS = {'day': 24, 'week': 24 * 7, 'month': 24 * 30}
+_EPOCH = date(1970, 1, 1)
+# Per-scope lock file serializing access to its day files
+LOCK_FILE = '.lock'
+# A day's delta log is folded into its snapshot once it is larger than
+# both this and the snapshot, so compaction is amortized over the appends
+COMPACT_MIN_BYTES = 256 * 1024
+
+
+def _encode_hours(hours: Dict[int, list]) -> Dict[str, Any]:
+    return {str(hour): {'docs': bucket[0], 'counts': dict(bucket[1])} for hour, bucket in sorted(hours.items())}
+
+
+def _add_hours(hours: Dict[int, list], stored: Dict[str, Any]):
+    """Add hour buckets as stored in a snapshot or log line to `hours`"""
+    for hour, bucket in stored.items():
+        target = hours.setdefault(int(hour), [0, Counter()])
+        target[0] += int(bucket['docs'])
+        target[1].update(bucket['counts'])
+
+
+class TrendingKeywords:
+    def __init__(
+        self,
+        data_dir: str = 'models/trending',
+        baseline_periods: int = 4,
+        retention_days: int = 150,
+        min_frequency: int = 2
+    ):
+        """
+        Every ingested document adds 1 to each of its keywords in the hourly
+        bucket of its scope (and of the global scope). A period is trending
+        against the `baseline_periods` periods before it. Buckets are kept
+        for retention_days per scope and UTC day under data_dir/<scope>/:
+        a snapshot, <YYYY-MM-DD>.json, plus a log of the deltas added since,
+        <YYYY-MM-DD>.<generation>.log.
+
+        The files are the shared state of all worker processes: ingestion
+        appends its counts to the day's log, and queries read only the log
+        lines added since their last read, so every worker sees every
+        worker's documents. Both happen under a per-scope file lock.
+        """
+        if baseline_periods < 1:
+            raise ValueError("baseline_periods must be at least 1")
+
+        self.data_dir = data_dir
+        self.baseline_periods = baseline_periods
+        self.retention_hours = retention_days * 24
+        self.min_frequency = min_frequency
+        # (scope, day) -> (snapshot signature, its generation, log bytes read,
+        #                 hour since epoch -> [document count, keyword Counter])
+        self._days: Dict[Tuple[str, int], Tuple[Optional[tuple], int, int, Dict[int, list]]] = {}
+        self._pruned_before: Optional[int] = None
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._prune(self._cutoff_hour() // 24)
+
+    def _cutoff_hour(self) -> int:
+        return int(time.time() // 3600) - self.retention_hours
+
+    # ============ Ingestion ============
+
+    def add(self, documents: Iterable[Tuple[str, float, List[str]]]) -> int:
+        """
+        Count (scope, unix timestamp, keywords) documents into their hourly
+        buckets and append them to the day logs, at a cost that follows the
+        documents, not the size of the days. Documents older than the
+        retention period are skipped. Returns the number added.
+        """
+        cutoff_hour = self._cutoff_hour()
+        # scope -> day -> hour -> [document count, keyword Counter] of this call
+        deltas: Dict[str, Dict[int, Dict[int, list]]] = {}
+        added = 0
+        for scope, timestamp, keywords in documents:
+            hour = int(timestamp // 3600)
+            if hour < cutoff_hour:
+                continue
+            distinct = set(keywords)
+            for target in dict.fromkeys([scope, GLOBAL_SCOPE]):
+                days = deltas.setdefault(target, {})
+                bucket = days.setdefault(hour // 24, {}).setdefault(hour, [0, Counter()])
+                bucket[0] += 1
+                bucket[1].update(distinct)
+            added += 1
+
+        with self._lock:
+            for scope, days in deltas.items():
+                with self._scope_lock(scope):
+                    for day, hours in days.items():
+                        self._append_day(scope, day, hours)
+            self._prune(cutoff_hour // 24)
+        return added
+
+    def _prune(self, cutoff_day: int):
+        """
+        Delete day files (snapshots, logs and files moved aside) and cached
+        days before cutoff_day. The data directory is scanned at most once
+        per day and process.
+        """
+        if self._pruned_before == cutoff_day:
+            return
+        self._pruned_before = cutoff_day
+        for key in [key for key in self._days if key[1] < cutoff_day]:
+            del self._days[key]
+
+        if not os.path.isdir(self.data_dir):
+            return
+        for scope_dir in os.listdir(self.data_dir):
+            scope_path = os.path.join(self.data_dir, scope_dir)
+            if not os.path.isdir(scope_path):
+                continue
+            for file_name in os.listdir(scope_path):
+                try:
+                    day = (date.fromisoformat(file_name.split('.')[0]) - _EPOCH).days
+                except ValueError:
+                    continue
+                if day < cutoff_day:
+                    try:
+                        os.remove(os.path.join(scope_path, file_name))
+                    except FileNotFoundError:
+                        pass
+
+    # ============ Queries ============
+
+    def trending(
+        self,
+        scope: str = GLOBAL_SCOPE,
+        period: str = 'week',
+        top_n: int = 20,
+        now: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Keywords of the last `period` ranked by growth over the average of
+        the baseline periods before it, (frequency + 1) / (baseline + 1).
+        Only the day files of the window and baseline are read, and of
+        those only what was added since the last query.
+        """
+        if period not in PERIOD_HOURS:
+            raise ValueError(f"Unknown period {period!r}, expected one of {list(PERIOD_HOURS)}")
+
+        window = PERIOD_HOURS[period]
+        end_hour = int((time.time() if now is None else now) // 3600) + 1  # exclusive
+        start_hour = end_hour - window
+        baseline_start = start_hour - window * self.baseline_periods
+
+        with self._lock:
+            buckets = self._hours(scope, baseline_start, end_hour)
+            docs, counts = self._sum(buckets, start_hour, end_hour)
+            baseline_docs, baseline_counts = self._sum(buckets, baseline_start, start_hour)
+
+        periods = self.baseline_periods
+        ranked = sorted(
+            (
+                (keyword, frequency, baseline_counts[keyword] / periods)
+                for keyword, frequency in counts.items()
+                if frequency >= self.min_frequency
+            ),
+            key=lambda item: ((item[1] + 1) / (item[2] + 1), item[1]),
+            reverse=True
+        )[:top_n]
+
+        return {
+            'scope': scope,
+            'period': period,
+            'window_start': start_hour * 3600,
+            'window_end': end_hour * 3600,
+            'doc_count': docs,
+            'baseline_doc_count': round(baseline_docs / periods, 2),
+            'trending_keywords': [
+                {
+                    'keyword': keyword,
+                    'frequency': frequency,
+                    'baseline_frequency': round(baseline, 2),
+                    'growth': round((frequency + 1) / (baseline + 1), 3)
+                }
+                for keyword, frequency, baseline in ranked
+            ]
+        }
+
+    def _hours(self, scope: str, start_hour: int, end_hour: int) -> Dict[int, list]:
+        """Buckets of the scope's days overlapping [start_hour, end_hour)"""
+        hours: Dict[int, list] = {}
+        if not os.path.isdir(self._scope_dir(scope)):
+            return hours
+        with self._scope_lock(scope):
+            for day in range(start_hour // 24, (end_hour - 1) // 24 + 1):
+                hours.update(self._day_buckets(scope, day))
+        return hours
+
+    @staticmethod
+    def _sum(buckets: Dict[int, list], start_hour: int, end_hour: int) -> Tuple[int, Counter]:
+        """Document count and keyword counts of the buckets in [start_hour, end_hour)"""
+        docs, counts = 0, Counter()
+        if end_hour - start_hour < len(buckets):
+            hours = (hour for hour in range(start_hour, end_hour) if hour in buckets)
+        else:
+            hours = (hour for hour in buckets if start_hour <= hour < end_hour)
+        for hour in hours:
+            docs += buckets[hour][0]
+            counts.update(buckets[hour][1])
+        return docs, counts
+
+    # ============ Persistence ============
+
+    def _scope_dir(self, scope: str) -> str:
+        # Dots escaped too, so no scope can name '.' or '..'
+        return os.path.join(self.data_dir, quote(scope, safe='').replace('.', '%2E'))
+
+    def _snapshot_path(self, scope: str, day: int) -> str:
+        day_name = (_EPOCH + timedelta(days=day)).isoformat()
+        return os.path.join(self._scope_dir(scope), f"{day_name}.json")
+
+    def _log_path(self, scope: str, day: int, generation: int) -> str:
+        """Log of the deltas added after the snapshot of `generation` - 1"""
+        return f"{self._snapshot_path(scope, day)[:-len('.json')]}.{generation}.log"
+
+    @staticmethod
+    def _signature(path: str) -> Optional[tuple]:
+        """Changes whenever the file is replaced; None if it does not exist"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _move_aside(path: str):
+        """Keep an unreadable file for inspection instead of overwriting it"""
+        os.replace(path, f"{path}.corrupt-{int(time.time())}")
+
+    @staticmethod
+    def _write_snapshot(path: str, generation: int, hours: Dict[int, list]):
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({'generation': generation}) + '\n')
+            f.write(json.dumps(_encode_hours(hours)) + '\n')
+        os.replace(tmp_path, path)
+
+    def _scope_lock(self, scope: str):
+        """Exclusive lock on a scope's day files, across threads and processes"""
+        return exclusive_lock(os.path.join(self._scope_dir(scope), LOCK_FILE))
+
+    # Everything below runs under the scope lock
+
+    def _replace_corrupt(self, path: str, generation: Optional[int]) -> int:
+        """
+        Move an unreadable snapshot aside and put an empty one of the same
+        generation in its place, so the day's current log stays in use.
+        If even the header is unreadable, the generation is taken from the
+        newest log on disk.
+        """
+        self._move_aside(path)
+        if generation is None:
+            prefix = os.path.basename(path)[:-len('.json')] + '.'
+            logs = [
+                name[len(prefix):-len('.log')] for name in os.listdir(os.path.dirname(path))
+                if name.startswith(prefix) and name.endswith('.log')
+            ]
+            generation = max([int(log) - 1 for log in logs if log.isdigit()], default=0)
+        self._write_snapshot(path, generation, {})
+        return generation
+
+    def _snapshot_generation(self, path: str) -> int:
+        """
+        Generation of a snapshot from its header line alone; 0 if there is
+        none. Snapshots written before the logs are a single line of
+        buckets, generation 0.
+        """
+        try:
+            with open(path) as f:
+                header = json.loads(f.readline())
+            return int(header.get('generation', 0))
+        except FileNotFoundError:
+            return 0
+        except (ValueError, TypeError, AttributeError):
+            return self._replace_corrupt(path, None)
+
+    def _read_snapshot(self, path: str) -> Tuple[int, Dict[int, list]]:
+        """(generation, buckets) of a snapshot; a corrupt one is replaced"""
+        try:
+            with open(path) as f:
+                header_line, body_line = f.readline(), f.readline()
+        except FileNotFoundError:
+            return 0, {}
+
+        try:
+            header = json.loads(header_line)
+            generation = int(header.get('generation', 0))
+        except (ValueError, TypeError, AttributeError):
+            return self._replace_corrupt(path, None), {}
+
+        hours: Dict[int, list] = {}
+        try:
+            _add_hours(hours, json.loads(body_line) if 'generation' in header else header)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return self._replace_corrupt(path, generation), {}
+        return generation, hours
+
+    @staticmethod
+    def _read_log(path: str, offset: int, hours: Dict[int, list]) -> Tuple[int, int]:
+        """
+        Add the log lines from byte `offset` on to `hours`. Returns the end
+        offset and the number of unreadable lines (skipped).
+        """
+        bad_lines = 0
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        _add_hours(hours, json.loads(line))
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        bad_lines += 1
+                return f.tell(), bad_lines
+        except FileNotFoundError:
+            return 0, 0
+
+    def _day_buckets(self, scope: str, day: int) -> Dict[int, list]:
+        """
+        One scope-day's buckets: cached, plus the log lines appended since
+        the last read. The snapshot is re-read only after a compaction.
+        """
+        key = (scope, day)
+        path = self._snapshot_path(scope, day)
+        signature = self._signature(path)
+        cached = self._days.get(key)
+        if cached is not None and cached[0] == signature:
+            _, generation, offset, hours = cached
+        else:
+            offset = 0
+            generation, hours = self._read_snapshot(path)
+            signature = self._signature(path)
+
+        offset, _ = self._read_log(self._log_path(scope, day, generation + 1), offset, hours)
+        if signature is None and not hours:
+            self._days.pop(key, None)
+        else:
+            self._days[key] = (signature, generation, offset, hours)
+        return hours
+
+    def _append_day(self, scope: str, day: int, delta: Dict[int, list]):
+        """
+        Append `delta` as one line to the scope-day's log. Once the log is
+        larger than the snapshot (and COMPACT_MIN_BYTES), both are folded
+        into a new snapshot.
+        """
+        path = self._snapshot_path(scope, day)
+        generation = self._snapshot_generation(path)
+        line = (json.dumps(_encode_hours(delta)) + '\n').encode('utf-8')
+        with open(self._log_path(scope, day, generation + 1), 'a+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                # Terminate a line cut short by a crash instead of gluing onto it
+                f.seek(size - 1)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+            size += len(line)
+
+        snapshot_size = (self._signature(path) or (0, 0, 0))[2]
+        if size > max(COMPACT_MIN_BYTES, snapshot_size):
+            self._compact_day(scope, day)
+
+    def _compact_day(self, scope: str, day: int):
+        """
+        Fold the log into a new snapshot of the next generation. The
+        snapshot names its generation, so a crash before the folded log is
+        removed cannot count that log twice.
+        """
+        path = self._snapshot_path(scope, day)
+        generation, hours = self._read_snapshot(path)
+        log_path = self._log_path(scope, day, generation + 1)
+        _, bad_lines = self._read_log(log_path, 0, hours)
+
+        self._write_snapshot(path, generation + 1, hours)
+        if bad_lines:
+            self._move_aside(log_path)
+        else:
+            os.remove(log_path)
+        self._days[(scope, day)] = (self._signature(path), generation + 1, 0, hours)
@@ -0,0 +1,78 @@
+"""
+Benchmark: keyword extraction throughput vs. process pool workers
+
+Usage (from ml-service/):
+    python -m benchmarks.bench_keywords [--posts 10000] [--workers 1 2 4] [--chunk-size 100] [--method yake]
+
+The serial row is TopicModeler.extract_keywords_* in this process (the old
+endpoint path). Pool rows run KeywordService over a fresh process pool
+whose workers are started and warmed before timing; the cache is disabled
+for them. The last row repeats the request against a warm result cache.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.services.executor import BoundedExecutor
+from app.services.keywords import KeywordService
+from app.services.topic_modeler import TopicModeler, init_worker
+from benchmarks.synthetic import iter_topic_texts
+
+
+def report(label, n, seconds):
+    print(f"{label:<16} {seconds:>8.2f} {n / seconds:>10.0f}")
+
+
+async def run_pool(texts, workers, chunk_size, method):
+    pool = BoundedExecutor('bench', 'process', workers, workers * 2, initializer=init_worker)
+    try:
+        # Start and warm every worker outside the timed region
+        await asyncio.gather(*(pool.run(init_worker) for _ in range(workers)))
+        service = KeywordService(pool, chunk_size=chunk_size, cache_max_bytes=0)
+        start = time.perf_counter()
+        await service.extract(texts, method)
+        return time.perf_counter() - start
+    finally:
+        pool.shutdown()
+
+
+async def run_cached(texts, chunk_size, method):
+    pool = BoundedExecutor('bench', 'process', 1, 2, initializer=init_worker)
+    try:
+        service = KeywordService(pool, chunk_size=chunk_size, cache_max_bytes=256 * 1024 * 1024)
+        await service.extract(texts, method)
+        start = time.perf_counter()
+        await service.extract(texts, method)
+        return time.perf_counter() - start
+    finally:
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--chunk-size', type=int, default=100)
+    parser.add_argument('--method', choices=['yake', 'rake'], default='yake')
+    args = parser.parse_args()
+
+    texts = list(iter_topic_texts(args.posts))
+    print(f"{args.posts} posts, method={args.method}, chunk size {args.chunk_size}, {os.cpu_count()} cores")
+    print(f"{'run':<16} {'seconds':>8} {'posts/s':>10}")
+
+    modeler = TopicModeler()
+    extract = modeler.extract_keywords_yake if args.method == 'yake' else modeler.extract_keywords_rake
+    start = time.perf_counter()
+    extract(texts)
+    report('serial', len(texts), time.perf_counter() - start)
+
+    for workers in args.workers:
+        seconds = asyncio.run(run_pool(texts, workers, args.chunk_size, args.method))
+        report(f"pool x{workers}", len(texts), seconds)
+
+    report('cached', len(texts), asyncio.run(run_cached(texts, args.chunk_size, args.method)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: single-process vs. multicore LDA training
+
+Usage (from ml-service/):
+    python -m benchmarks.bench_lda_modes [--docs 50000] [--topics 6] [--passes 10] [--workers 0 3]
+
+Trains on the same preprocessed synthetic corpus with LdaModel (alpha='auto')
+and with LdaMulticore (alpha='asymmetric') for each worker count (0 = cores - 1),
+and reports wall time and u_mass / c_v coherence (c_v on a --coherence-docs
+sample, it is slow). Speedups need idle cores; on a single core multicore
+only adds process overhead.
+"""
+import argparse
+import os
+import time
+
+from gensim import corpora
+from gensim.models.coherencemodel import CoherenceModel
+
+from app.services.topic_modeler import TopicModeler, fit_lda
+from benchmarks.synthetic import iter_topic_texts
+
+
+def coherence(lda, docs, corpus, dictionary, measure):
+    model = CoherenceModel(model=lda, texts=docs, corpus=corpus, dictionary=dictionary, coherence=measure)
+    return model.get_coherence()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--docs', type=int, default=50000)
+    parser.add_argument('--topics', type=int, default=6)
+    parser.add_argument('--passes', type=int, default=10)
+    parser.add_argument('--chunksize', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0])
+    parser.add_argument('--coherence-docs', type=int, default=5000)
+    args = parser.parse_args()
+
+    modeler = TopicModeler()
+    docs = [modeler._preprocess(text) for text in iter_topic_texts(args.docs)]
+    docs = [doc for doc in docs if len(doc) > 3]
+    dictionary = corpora.Dictionary(docs)
+    dictionary.filter_extremes(no_below=2, no_above=0.8)
+    corpus = [dictionary.doc2bow(doc) for doc in docs]
+    sample = slice(0, args.coherence_docs)
+    print(f"{len(corpus)} documents, {len(dictionary)} terms, {args.topics} topics, "
+          f"{args.passes} passes, {os.cpu_count()} cores")
+
+    runs = [('single', None)] + [('multicore', workers) for workers in args.workers]
+    print(f"{'mode':<10} {'workers':>7} {'train s':>8} {'u_mass':>8} {'c_v':>7}")
+    for mode, workers in runs:
+        start = time.perf_counter()
+        lda = fit_lda(corpus, dictionary, args.topics, passes=args.passes, mode=mode,
+                      workers=workers, chunksize=args.chunksize)
+        elapsed = time.perf_counter() - start
+        u_mass = coherence(lda, None, corpus[sample], dictionary, 'u_mass')
+        c_v = coherence(lda, docs[sample], None, dictionary, 'c_v')
+        shown = '-' if mode == 'single' else (workers or max(1, os.cpu_count() - 1))
+        print(f"{mode:<10} {shown:>7} {elapsed:>8.1f} {u_mass:>8.3f} {c_v:>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: pickled vs. memory-mapped sentiment model artifacts across workers
+
+Usage (from ml-service/):
+    python -m benchmarks.bench_model_loading [--workers 4] [--samples 20000]
+
+Trains a TF-IDF + LogisticRegression model and an online hashing + SGD
+model, saves each as one joblib pickle (previous layout) and as
+memory-mapped artifacts, then starts --workers processes that each load
+the model and score a batch (touching every coefficient page). Reported
+per worker: load time, growth of private (anonymous) RSS, and PSS. PSS
+splits shared pages between the processes mapping them, so it shows what
+each worker really costs (Linux only: reads /proc/self/smaps_rollup).
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import joblib
+
+from app.services.artifacts import load_text_model, save_text_model
+from app.services.sentiment_analyzer import SentimentAnalyzer
+from benchmarks.synthetic import iter_labeled_texts
+
+
+def memory_kb():
+    """(private anonymous RSS, PSS) of this process in kB"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Anonymous:', 'Pss:'):
+                values[parts[0]] = int(parts[1])
+    return values.get('Anonymous:', 0), values.get('Pss:', 0)
+
+
+def worker(layout, path, texts, barrier, results):
+    anon_before, _ = memory_kb()
+    start = time.perf_counter()
+    if layout == 'pickle':
+        saved = joblib.load(path)
+        vectorizer, classifier = saved['vectorizer'], saved['classifier']
+    else:
+        vectorizer, classifier, _ = load_text_model(path)
+    load_ms = (time.perf_counter() - start) * 1000
+    classifier.predict_proba(vectorizer.transform(texts))
+    # Measure while every worker holds the model
+    barrier.wait()
+    anon, pss = memory_kb()
+    barrier.wait()
+    results.put((load_ms, (anon - anon_before) / 1024, pss / 1024))
+
+
+def run(layout, path, workers, texts):
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(layout, path, texts, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    rows = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return [sum(column) / len(rows) for column in zip(*rows)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--samples', type=int, default=20000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    texts, labels = map(list, zip(*iter_labeled_texts(args.samples)))
+    factory = SentimentAnalyzer()
+
+    vectorizer = factory._new_vectorizer()
+    tfidf_model = (vectorizer, factory._new_classifier().fit(vectorizer.fit_transform(texts), labels))
+    hashing = factory._new_hashing_vectorizer()
+    sgd = factory._new_online_classifier()
+    sgd.partial_fit(hashing.transform(texts), labels, classes=['negative', 'neutral', 'positive'])
+
+    print(f"workers: {args.workers}")
+    print(f"{'model':<14} {'layout':<7} {'load ms':>8} {'anon +MB':>9} {'PSS MB':>8}")
+    for name, (vectorizer, classifier) in (('tfidf+logreg', tfidf_model), ('hashing+sgd', (hashing, sgd))):
+        pickle_path = f"{name}.pkl"
+        joblib.dump({'vectorizer': vectorizer, 'classifier': classifier}, pickle_path)
+        save_text_model(name, vectorizer, classifier)
+
+        for layout, path in (('pickle', pickle_path), ('mmap', name)):
+            load_ms, anon_mb, pss_mb = run(layout, path, args.workers, texts[:200])
+            print(f"{name:<14} {layout:<7} {load_ms:>8.1f} {anon_mb:>9.1f} {pss_mb:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: online (hashing + partial_fit) vs. full-batch sentiment training
+
+Usage (from ml-service/):
+    python -m benchmarks.bench_online_sentiment [--sizes 10000 100000 300000] [--batch-size 500]
+
+Online training streams the synthetic corpus from a generator in
+mini-batches; full-batch training (SentimentAnalyzer.train) needs the whole
+corpus as lists. Peak traced Python memory is reported for both, and the
+last column is the time to fold in one fresh mini-batch and swap the model.
+Full-batch runs are skipped above --batch-max.
+"""
+import argparse
+import itertools
+import os
+import tempfile
+import time
+import tracemalloc
+
+from app.services.sentiment_analyzer import SentimentAnalyzer
+from benchmarks.synthetic import iter_labeled_texts
+
+
+def batches(n, batch_size, seed=42):
+    pairs = iter_labeled_texts(n, seed)
+    while True:
+        chunk = list(itertools.islice(pairs, batch_size))
+        if not chunk:
+            return
+        texts, labels = zip(*chunk)
+        yield list(texts), list(labels)
+
+
+def traced(fn):
+    """(result, seconds, peak MB) of fn()"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 300000])
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--batch-max', type=int, default=100000)
+    args = parser.parse_args()
+
+    # Trained models are saved under ./models; keep them out of the repo
+    os.chdir(tempfile.mkdtemp())
+
+    print(f"{'N':>8} {'online s':>9} {'online MB':>10} {'acc':>6} {'batch s':>8} {'batch MB':>9} {'acc':>6} {'fold-in ms':>11}")
+    for n in args.sizes:
+        online = SentimentAnalyzer()
+        metrics, online_s, online_mb = traced(
+            lambda: online.partial_train_stream(batches(n, args.batch_size))
+        )
+        fresh_texts, fresh_labels = next(batches(args.batch_size, args.batch_size, seed=7))
+        start = time.perf_counter()
+        online.partial_train(fresh_texts, fresh_labels)
+        fold_ms = (time.perf_counter() - start) * 1000
+
+        batch_cols = f"{'-':>8} {'-':>9} {'-':>6}"
+        if n <= args.batch_max:
+            full = SentimentAnalyzer()
+
+            def train_full():
+                texts, labels = zip(*iter_labeled_texts(n))
+                return full.train(list(texts), list(labels))
+
+            full_metrics, full_s, full_mb = traced(train_full)
+            batch_cols = f"{full_s:>8.1f} {full_mb:>9.1f} {full_metrics['accuracy']:>6.3f}"
+
+        print(f"{n:>8} {online_s:>9.1f} {online_mb:>10.1f} {metrics['progressive_accuracy']:>6.3f} "
+              f"{batch_cols} {fold_ms:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: top-k selection with lazy explanations vs. eager full ranking
+
+Usage (from ml-service/):
+    python -m benchmarks.bench_recommend [--sizes 1000 10000 100000] [--limit 10]
+
+Both paths score against the same prebuilt AlumniIndex, so the numbers
+isolate ranking cost: the eager path renders a result dict and explanation
+for every alumnus and sorts the full list (the previous behaviour); the
+top-k path selects k rows from the score array and renders only those.
+"""
+import argparse
+import time
+
+from app.services.alumni_index import AlumniIndex
+from app.services.recommender import AlumniRecommender
+from benchmarks.synthetic import make_profiles
+
+
+def eager_rank(recommender, index, student, limit):
+    """Previous behaviour: build every result, sort, slice"""
+    text_scores = index.text_similarity(student)
+    skills_scores = index.skills_overlap(student)
+    results = [
+        recommender._build_recommendation(student, index.store.row_profile(row), t, s)
+        for row, (t, s) in enumerate(zip(text_scores, skills_scores))
+    ]
+    results.sort(key=lambda x: x['match_percent'], reverse=True)
+    return results[:limit]
+
+
+def best_of(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    recommender = AlumniRecommender()
+    student = make_profiles(1, seed=7, start_id=0)[0]
+
+    print(f"{'N':>8} {'eager (ms)':>12} {'top-k (ms)':>12} {'speedup':>8}")
+    for n in args.sizes:
+        index = AlumniIndex(make_profiles(n))
+        index.text_similarity(student)  # warm: build matrices outside the timing
+
+        eager = best_of(lambda: eager_rank(recommender, index, student, args.limit), args.repeats)
+        top_k = best_of(lambda: recommender._rank(index, student, args.limit), args.repeats)
+        print(f"{n:>8} {eager * 1000:>12.1f} {top_k * 1000:>12.1f} {eager / top_k:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: sharded multi-process recommendation scoring
+
+Usage (from ml-service/):
+    python -m benchmarks.bench_sharded [--alumni 100000] [--queries 50] [--shards 1 2 4 8]
+
+Loads the same synthetic pool into a single-process AlumniIndex and into
+ShardedAlumniIndex with each shard count, then reports mean exact
+recommend latency and throughput. Scaling is bounded by the machine's
+core count (printed first).
+"""
+import argparse
+import os
+import time
+
+from app.services.recommender import AlumniRecommender
+from app.services.sharded_index import ShardedAlumniIndex
+from benchmarks.synthetic import make_profiles
+
+
+def run_queries(recommender, students, limit):
+    start = time.perf_counter()
+    for student in students:
+        # Bypass the result cache: every query is scored
+        if isinstance(recommender.index, ShardedAlumniIndex):
+            recommender.index.recommend(student, limit)
+        else:
+            recommender._rank(recommender.index, student, limit)
+    return (time.perf_counter() - start) / len(students)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--alumni', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    alumni = make_profiles(args.alumni)
+    students = make_profiles(args.queries, seed=7, start_id=0)
+    print(f"cores={os.cpu_count()} alumni={args.alumni} queries={args.queries} k={args.limit}")
+
+    single = AlumniRecommender()
+    single.index.upsert(alumni)
+    run_queries(single, students[:1], args.limit)  # warm: build matrices
+    baseline = run_queries(single, students, args.limit)
+    print(f"{'shards':>7} {'latency (ms)':>13} {'queries/s':>10} {'speedup':>8}")
+    print(f"{'none':>7} {baseline * 1000:>13.1f} {1 / baseline:>10.1f} {1.0:>7.2f}x")
+
+    for shards in args.shards:
+        recommender = AlumniRecommender(shards=shards)
+        try:
+            recommender.index.upsert(alumni)
+            run_queries(recommender, students[:1], args.limit)  # warm: sync shards
+            latency = run_queries(recommender, students, args.limit)
+            print(f"{shards:>7} {latency * 1000:>13.1f} {1 / latency:>10.1f} {baseline / latency:>7.2f}x")
+        finally:
+            recommender.index.close()
+
+
+if __name__ == '__main__':
+    main()
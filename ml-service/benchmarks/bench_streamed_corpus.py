@@ -0,0 +1,69 @@
+"""
+Benchmark: in-memory vs. disk-streamed topic extraction memory
+
+Usage (from ml-service/):
+    python -m benchmarks.bench_streamed_corpus [--docs 5000 20000 60000] [--topics 6] [--passes 2]
+
+Writes a synthetic JSONL corpus of each size, then extracts topics once
+from the texts loaded into a list (extract_topics) and once from the file
+(extract_topics_from_file), reporting wall time and the tracemalloc peak of
+each. The streamed peak should stay flat as the corpus grows (it is
+bounded by the token cache, ML_TOKEN_CACHE_MAX_BYTES).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from app.services import topic_modeler as topic_modeler_module
+from app.services.topic_modeler import TopicModeler
+from benchmarks.synthetic import iter_topic_texts
+
+
+def measure(fn, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--docs', type=int, nargs='+', default=[5000, 20000, 60000])
+    parser.add_argument('--topics', type=int, default=6)
+    parser.add_argument('--passes', type=int, default=2)
+    args = parser.parse_args()
+
+    # Fewer passes than the endpoint default keep large sizes affordable;
+    # memory does not depend on the number of passes
+    fit_lda = topic_modeler_module.fit_lda
+    topic_modeler_module.fit_lda = lambda *a, **kw: fit_lda(*a, **{**kw, 'passes': args.passes})
+
+    modeler = TopicModeler()
+    print(f"{'docs':>8} {'memory s':>9} {'memory MB':>10} {'stream s':>9} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.docs:
+            path = os.path.join(work_dir, f"corpus-{size}.jsonl")
+            with open(path, 'w') as f:
+                for text in iter_topic_texts(size):
+                    f.write(json.dumps({'text': text}) + '\n')
+
+            def in_memory():
+                with open(path) as f:
+                    texts = [json.loads(line)['text'] for line in f]
+                modeler.extract_topics(texts, args.topics, coherence='none')
+
+            memory_s, memory_mb = measure(in_memory)
+            stream_s, stream_mb = measure(
+                modeler.extract_topics_from_file, path, args.topics, coherence='none', work_dir=work_dir
+            )
+            print(f"{size:>8} {memory_s:>9.1f} {memory_mb:>10.1f} {stream_s:>9.1f} {stream_mb:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
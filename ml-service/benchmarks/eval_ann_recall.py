@@ -0,0 +1,71 @@
+"""
+Evaluation: recall@k of mode='approximate' against exact recommendations
+
+Usage (from ml-service/):
+    python -m benchmarks.eval_ann_recall [--alumni 100000] [--students 200] [--limit 10]
+
+For each LSH setting, reports recall@k (share of the exact top-k ids that
+the approximate mode also returns), mean shortlist size as a fraction of
+the pool, and mean latency of both modes on a prebuilt index.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.alumni_index import AlumniIndex
+from app.services.recommender import AlumniRecommender
+from benchmarks.synthetic import make_profiles
+
+SETTINGS = [
+    {'num_perm': 64, 'bands': 16, 'projection_bits': 12, 'projection_tables': 8},
+    {'num_perm': 64, 'bands': 32, 'projection_bits': 10, 'projection_tables': 12},
+    {'num_perm': 128, 'bands': 64, 'projection_bits': 8, 'projection_tables': 16},
+]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--alumni', type=int, default=100000)
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    index = AlumniIndex(make_profiles(args.alumni))
+    students = make_profiles(args.students, seed=7, start_id=0)
+
+    exact = AlumniRecommender()
+    exact_ids, exact_times = [], []
+    for student in students:
+        recs, elapsed = timed(lambda: exact._rank(index, student, args.limit))
+        exact_ids.append({r['alumni_id'] for r in recs})
+        exact_times.append(elapsed)
+
+    print(f"alumni={args.alumni} students={args.students} k={args.limit} "
+          f"exact={np.mean(exact_times) * 1000:.1f}ms")
+    print(f"{'num_perm':>8} {'bands':>5} {'bits':>4} {'tables':>6} "
+          f"{'recall@k':>9} {'shortlist':>9} {'approx (ms)':>11}")
+
+    for params in SETTINGS:
+        approx = AlumniRecommender(ann_params=params)
+        index.lsh(**params)  # build tables outside the timing
+        recalls, shortlists, times = [], [], []
+        for student, truth in zip(students, exact_ids):
+            recs, elapsed = timed(lambda: approx._rank(index, student, args.limit, mode='approximate'))
+            found = {r['alumni_id'] for r in recs}
+            recalls.append(len(found & truth) / len(truth) if truth else 1.0)
+            shortlists.append(len(index.ann_candidates(student, **params)) / len(index))
+            times.append(elapsed)
+        print(f"{params['num_perm']:>8} {params['bands']:>5} {params['projection_bits']:>4} "
+              f"{params['projection_tables']:>6} {np.mean(recalls):>9.3f} "
+              f"{np.mean(shortlists):>8.1%} {np.mean(times) * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Synthetic profile and text generators shared by the benchmarks
+"""
+from typing import List, Dict, Any, Iterator, Tuple
+import random
+
+SKILLS = [
+    'Python', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'Java', 'Spring',
+    'Go', 'Rust', 'C++', 'SQL', 'PostgreSQL', 'MongoDB', 'AWS', 'Azure', 'GCP',
+    'Docker', 'Kubernetes', 'Machine Learning', 'Deep Learning', 'NLP',
+    'Data Analysis', 'Pandas', 'TensorFlow', 'PyTorch', 'Android', 'Kotlin',
+    'Swift', 'Figma', 'UI/UX', 'DevOps', 'Linux', 'Git', 'GraphQL', 'Django',
+    'Flask', 'FastAPI', 'Spark', 'Hadoop', 'Tableau', 'Excel', 'AutoCAD',
+    'MATLAB', 'Embedded C', 'VLSI', 'IoT', 'Blockchain', 'Cybersecurity'
+]
+
+BRANCHES = [
+    'Computer Engineering', 'Information Technology', 'Electronics',
+    'Mechanical', 'Civil'
+]
+
+WORDS = (
+    'software engineer developer backend frontend fullstack data scientist '
+    'analyst cloud infrastructure platform product manager design research '
+    'machine learning startup fintech healthcare mobile web distributed '
+    'systems security embedded hardware consulting mentor open source '
+    'scalable services architecture analytics automation team lead'
+).split()
+
+SENTIMENT_WORDS = {
+    'positive': 'great excellent helpful amazing love thanks wonderful congrats useful inspiring'.split(),
+    'negative': 'bad terrible awful hate broken useless poor disappointing spam rude'.split(),
+    'neutral': 'meeting schedule today office update report notes agenda reminder deadline'.split(),
+}
+
+# Post themes for topic-model benchmarks (words longer than 3 letters,
+# so they survive TopicModeler preprocessing)
+TOPIC_WORDS = {
+    'ml': 'python machine learning model training dataset neural network pytorch tensorflow accuracy features'.split(),
+    'careers': 'internship interview resume offer career salary recruiter company hiring referral placement'.split(),
+    'events': 'hackathon team project prize coding weekend demo judges workshop meetup registration'.split(),
+    'web': 'react javascript frontend backend api server database deploy docker kubernetes cloud'.split(),
+    'campus': 'exam semester professor lecture assignment library hostel canteen syllabus marks grades'.split(),
+    'alumni': 'mentor mentorship alumni network guidance startup founder experience advice connect reunion'.split(),
+}
+
+COMPANIES = ['Google', 'Microsoft', 'Amazon', 'TCS', 'Infosys', 'Flipkart', 'Zomato', 'Startup']
+
+
+def make_profile(rng: random.Random, profile_id: int) -> Dict[str, Any]:
+    """One synthetic student/alumni profile"""
+    return {
+        'id': profile_id,
+        'name': f'User {profile_id}',
+        'skills': rng.sample(SKILLS, rng.randint(0, 8)),
+        'branch': rng.choice(BRANCHES),
+        'bio': ' '.join(rng.choices(WORDS, k=rng.randint(5, 30))),
+        'headline': ' '.join(rng.choices(WORDS, k=rng.randint(2, 6))),
+        'years_of_experience': rng.randint(0, 20),
+        'company': rng.choice(COMPANIES),
+        'linkedin_url': 'https://linkedin.com/in/x' if rng.random() < 0.6 else '',
+        'github_url': 'https://github.com/x' if rng.random() < 0.4 else '',
+        'resume_url': '',
+    }
+
+
+def make_profiles(n: int, seed: int = 42, start_id: int = 1) -> List[Dict[str, Any]]:
+    """n synthetic profiles with ids start_id .. start_id + n - 1"""
+    rng = random.Random(seed)
+    return [make_profile(rng, start_id + i) for i in range(n)]
+
+
+def make_labeled_text(rng: random.Random) -> Tuple[str, str]:
+    """One (text, sentiment label) pair; 20% of cue words come from another label"""
+    label = rng.choice(list(SENTIMENT_WORDS))
+    cues = [
+        rng.choice(SENTIMENT_WORDS[label if rng.random() < 0.8 else rng.choice(list(SENTIMENT_WORDS))])
+        for _ in range(rng.randint(1, 4))
+    ]
+    words = cues + rng.choices(WORDS, k=rng.randint(4, 20))
+    rng.shuffle(words)
+    return ' '.join(words), label
+
+
+def iter_labeled_texts(n: int, seed: int = 42) -> Iterator[Tuple[str, str]]:
+    """n synthetic (text, label) pairs, generated lazily"""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield make_labeled_text(rng)
+
+
+def make_topic_text(rng: random.Random) -> str:
+    """One post drawn mostly from one or two themes, with some filler words"""
+    themes = rng.sample(list(TOPIC_WORDS), rng.choice([1, 1, 2]))
+    words = [rng.choice(TOPIC_WORDS[rng.choice(themes)]) for _ in range(rng.randint(15, 40))]
+    words += rng.choices(WORDS, k=rng.randint(2, 8))
+    rng.shuffle(words)
+    return ' '.join(words)
+
+
+def iter_topic_texts(n: int, seed: int = 42) -> Iterator[str]:
+    """n synthetic posts for topic modeling, generated lazily"""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield make_topic_text(rng)
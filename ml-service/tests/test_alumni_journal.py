@@ -0,0 +1,79 @@
+"""
+Tests for the alumni index journal shared by worker processes
+"""
+import os
+
+from app.services import alumni_journal
+from app.services.recommender import AlumniRecommender
+
+STUDENT = {'skills': ['python'], 'bio': 'python backend services', 'branch': 'Computer Engineering'}
+
+
+def _profile(alumni_id, skill='python'):
+    return {
+        'id': alumni_id,
+        'name': f"Alumnus {alumni_id}",
+        'bio': f"engineer working on {skill} systems",
+        'headline': 'Software Engineer',
+        'skills': [skill, 'sql'],
+        'branch': 'Computer Engineering',
+        'years_of_experience': 3,
+    }
+
+
+def _worker(tmp_path):
+    # One recommender per worker process, all sharing the journal directory
+    return AlumniRecommender(cache_max_bytes=1024 * 1024, index_dir=str(tmp_path / 'index'))
+
+
+def _recommended_ids(worker):
+    return sorted(rec['alumni_id'] for rec in worker.recommend_from_index(STUDENT, limit=100))
+
+
+def test_workers_serve_each_others_changes(tmp_path):
+    first, second = _worker(tmp_path), _worker(tmp_path)
+
+    first.upsert_alumni([_profile(1), _profile(2), _profile(3, 'rust')])
+    assert _recommended_ids(second) == [1, 2, 3]
+
+    version = second.delete_alumni([2])
+    assert _recommended_ids(first) == [1, 3]
+    assert first.refresh_index() == version == 2
+
+    # A replaced profile is replaced everywhere
+    second.upsert_alumni([{**_profile(3), 'headline': 'Data Scientist'}])
+    replaced = next(rec for rec in first.recommend_from_index(STUDENT, limit=100) if rec['alumni_id'] == 3)
+    assert replaced['alumni_headline'] == 'Data Scientist'
+
+
+def test_compaction_keeps_idle_and_new_workers_consistent(tmp_path, monkeypatch):
+    monkeypatch.setattr(alumni_journal, 'COMPACT_MIN_BYTES', 600)
+    writer, idle_once, idle_long = _worker(tmp_path), _worker(tmp_path), _worker(tmp_path)
+    idle_once.refresh_index()
+    idle_long.refresh_index()
+
+    for alumni_id in range(1, 5):
+        writer.upsert_alumni([_profile(alumni_id)])
+    assert writer.journal._generation == 1
+    assert idle_once.refresh_index() == 4
+
+    for alumni_id in range(5, 30):
+        writer.upsert_alumni([_profile(alumni_id)])
+        if alumni_id % 3 == 0:
+            writer.delete_alumni([alumni_id - 1])
+    assert writer.journal._generation > 2
+
+    expected = _recommended_ids(writer)
+    for worker in (idle_once, idle_long, _worker(tmp_path)):
+        assert _recommended_ids(worker) == expected
+        assert worker.refresh_index() == writer.refresh_index()
+
+
+def test_line_cut_short_by_a_crash_is_skipped(tmp_path):
+    first, second = _worker(tmp_path), _worker(tmp_path)
+    first.upsert_alumni([_profile(1)])
+    with open(os.path.join(tmp_path, 'index', 'journal.1.log'), 'a') as log:
+        log.write('{"op": "upsert", "profiles": [{"id": 9')
+
+    second.upsert_alumni([_profile(2)])
+    assert _recommended_ids(first) == _recommended_ids(second) == [1, 2]
@@ -0,0 +1,36 @@
+"""
+Tests for the bounded executor's recovery from dead process pool workers
+"""
+import asyncio
+import os
+
+import pytest
+
+from app.services.executor import BoundedExecutor, PoolSaturated
+
+
+def _square(x):
+    return x * x
+
+
+def _crash():
+    os._exit(1)
+
+
+def test_process_pool_recovers_after_a_worker_dies():
+    pool = BoundedExecutor('test', 'process', max_workers=1, max_queue=2)
+
+    async def scenario():
+        assert await pool.run(_square, 3) == 9
+        with pytest.raises(PoolSaturated) as excinfo:
+            await pool.run(_crash)
+        assert excinfo.value.status_code == 503
+        return await pool.run(_square, 4)
+
+    try:
+        assert asyncio.run(scenario()) == 16
+        stats = pool.stats()
+        assert stats['restarts'] == 1
+        assert stats['in_flight'] == 0
+    finally:
+        pool.shutdown()
@@ -0,0 +1,44 @@
+"""
+Tests for the columnar alumni feature store
+"""
+from app.services.feature_store import AlumniFeatureStore
+from app.services.recommender import AlumniRecommender
+
+
+def _profile(alumni_id, years):
+    return {
+        'id': alumni_id,
+        'name': f"Alumnus {alumni_id}",
+        'bio': 'backend engineer building python services',
+        'headline': 'Software Engineer',
+        'skills': ['python', 'sql'],
+        'branch': 'Computer Engineering',
+        'years_of_experience': years,
+    }
+
+
+def test_fractional_years_round_trip_exactly():
+    store = AlumniFeatureStore.from_profiles([_profile(1, 2.7), _profile(2, 5), _profile(3, '4.5')])
+
+    assert store.row_years(0) == 2.7
+    assert repr(store.row_years(0)) == '2.7'
+    assert store.row_years(1) == 5 and isinstance(store.row_years(1), int)
+    assert store.row_years(2) == 4.5
+
+
+def test_bad_years_are_coerced_per_row():
+    profiles = [_profile(1, 'ten'), _profile(2, None), _profile(3, [3]), _profile(4, float('nan')), _profile(5, 3)]
+    store = AlumniFeatureStore.from_profiles(profiles)
+
+    assert [store.row_years(row) for row in range(len(store))] == [0, 0, 0, 0, 3]
+
+
+def test_recommend_survives_bad_years_and_renders_fractional_years():
+    student = {'skills': ['python'], 'bio': 'python backend', 'branch': 'Computer Engineering'}
+    recommendations = AlumniRecommender(cache_max_bytes=0).recommend(
+        student, [_profile(1, 2.7), _profile(2, 'unknown')], limit=2
+    )
+
+    assert {rec['alumni_id'] for rec in recommendations} == {1, 2}
+    explanation = next(rec['explanation'] for rec in recommendations if rec['alumni_id'] == 1)
+    assert "Alumni has 2.7 years of relevant industry experience." in explanation
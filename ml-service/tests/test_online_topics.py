@@ -0,0 +1,33 @@
+"""
+Tests for the global topic model shared by worker processes
+"""
+import random
+
+from app.services.online_topics import OnlineTopicModel
+
+WORDS = ['python', 'career', 'mentor', 'startup', 'finance', 'design', 'research', 'hiring',
+         'alumni', 'network', 'robotics', 'cloud', 'data', 'marketing', 'product', 'event']
+
+
+def _texts(count, seed=0):
+    rng = random.Random(seed)
+    return [' '.join(rng.choices(WORDS, k=12)) for _ in range(count)]
+
+
+def test_workers_follow_the_published_version(tmp_path):
+    # Two models over one model_dir stand in for two worker processes
+    model_dir = str(tmp_path / 'topics')
+    publisher = OnlineTopicModel(str.split, model_dir=model_dir, refresh_interval=0)
+    reader = OnlineTopicModel(str.split, model_dir=model_dir, refresh_interval=0)
+    assert not reader.is_trained
+
+    trained = publisher.train(_texts(30), num_topics=2, passes=1)
+    assert reader.infer(['python career mentor'])['model_version'] == trained['model_version']
+
+    updated = publisher.update(_texts(10, seed=1))
+    assert reader.describe(topn=3)['model_version'] == updated['model_version']
+
+    # An update in the reader builds on the publisher's latest version
+    folded = reader.update(_texts(10, seed=2))
+    assert folded['model_version'] == updated['model_version'] + 1
+    assert folded['total_documents'] == updated['total_documents'] + 10
@@ -0,0 +1,43 @@
+"""
+Tests for sentiment model versions shared by worker processes, and online
+(incremental) training
+"""
+import pytest
+
+from app.services.sentiment_analyzer import SentimentAnalyzer, StaleOnlineModel
+
+TEXTS = ['great helpful mentor', 'terrible awful experience', 'okay average event', 'loved the talk']
+LABELS = ['positive', 'negative', 'neutral', 'positive']
+
+
+def test_counters_cover_one_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    analyzer = SentimentAnalyzer()
+
+    first = analyzer.partial_train_stream([(TEXTS, LABELS), (TEXTS, LABELS)])
+    second = analyzer.partial_train(TEXTS, LABELS)
+
+    assert (first['samples_seen'], first['batches']) == (8, 2)
+    assert (second['samples_seen'], second['batches']) == (4, 1)
+    # The second run continues from the first run's model, so it is scored
+    assert second['progressive_accuracy'] is not None
+    assert second['model_version'] == first['model_version'] + 1
+
+
+def test_workers_follow_the_published_version(tmp_path, monkeypatch):
+    # Two analyzers over one model_dir stand in for two worker processes
+    monkeypatch.chdir(tmp_path)
+    publisher = SentimentAnalyzer(refresh_interval=0)
+    reader = SentimentAnalyzer(refresh_interval=0)
+    assert not reader.is_trained
+
+    first = publisher.partial_train(TEXTS, LABELS)
+    assert reader.analyze_batch(TEXTS)[0]['sentiment'] in ('positive', 'neutral', 'negative')
+    assert reader.model.version == first['model_version']
+
+    online = reader.start_online()
+    second = publisher.partial_train(TEXTS, LABELS)
+    assert reader.is_trained and reader.model.version == second['model_version']
+    reader.partial_train(TEXTS, LABELS, online)
+    with pytest.raises(StaleOnlineModel):
+        reader.commit_online(online)
@@ -0,0 +1,40 @@
+"""
+Tests for the sharded alumni index's recovery from a dead shard process
+"""
+import pytest
+
+from app.services.sharded_index import ShardedAlumniIndex
+
+STUDENT = {'skills': ['python'], 'bio': 'python backend services', 'branch': 'Computer Engineering'}
+
+
+def _profile(alumni_id, skill):
+    return {
+        'id': alumni_id,
+        'name': f"Alumnus {alumni_id}",
+        'bio': f"engineer working on {skill} systems",
+        'headline': 'Software Engineer',
+        'skills': [skill, 'sql'],
+        'branch': 'Computer Engineering',
+        'years_of_experience': alumni_id,
+    }
+
+
+def test_dead_shard_restarts_all_shards_without_stale_replies():
+    index = ShardedAlumniIndex(2, reply_timeout=60)
+    try:
+        index.upsert([_profile(i, skill) for i, skill in enumerate(['python', 'java', 'rust', 'go'], 1)])
+        expected = index.recommend(STUDENT, limit=4)
+        assert len(expected) == 4
+
+        index._processes[0].kill()
+        index._processes[0].join()
+        with pytest.raises(RuntimeError):
+            index.recommend(STUDENT, limit=4)
+
+        # Shard 1's reply to the failed query must not answer this one
+        assert index.recommend(STUDENT, limit=2) == expected[:2]
+        assert index.recommend(STUDENT, limit=4) == expected
+        assert index.stats()['restarts'] == 1
+    finally:
+        index.close()
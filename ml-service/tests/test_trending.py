@@ -0,0 +1,66 @@
+"""
+Tests for the trending keyword day files shared by worker processes
+"""
+import os
+
+from app.services import trending
+from app.services.trending import TrendingKeywords
+
+NOW = 1_790_000_000.0
+
+
+def _documents(count, keyword, scope='cs'):
+    return [(scope, NOW - 60 * i, [keyword, 'alumni']) for i in range(count)]
+
+
+def _frequencies(tracker, scope='cs'):
+    result = tracker.trending(scope, period='day', top_n=10, now=NOW)
+    return result['doc_count'], {item['keyword']: item['frequency'] for item in result['trending_keywords']}
+
+
+def _scope_files(tmp_path, scope='cs'):
+    return sorted(os.listdir(tmp_path / scope))
+
+
+def test_workers_see_each_others_documents(tmp_path, monkeypatch):
+    monkeypatch.setattr(trending.time, 'time', lambda: NOW)
+    first, second = TrendingKeywords(str(tmp_path)), TrendingKeywords(str(tmp_path))
+
+    first.add(_documents(3, 'python'))
+    assert _frequencies(second) == (3, {'python': 3, 'alumni': 3})
+    second.add(_documents(2, 'rust'))
+    first.add(_documents(2, 'python'))
+    assert _frequencies(first) == _frequencies(second) == (7, {'python': 5, 'rust': 2, 'alumni': 7})
+
+
+def test_compaction_folds_the_log_exactly_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(trending.time, 'time', lambda: NOW)
+    monkeypatch.setattr(trending, 'COMPACT_MIN_BYTES', 200)
+    reader, writer = TrendingKeywords(str(tmp_path)), TrendingKeywords(str(tmp_path))
+    assert _frequencies(reader) == (0, {})
+
+    for _ in range(10):
+        writer.add(_documents(1, 'python'))
+    assert any(name.endswith('.json') for name in _scope_files(tmp_path))
+    assert _frequencies(reader) == (10, {'python': 10, 'alumni': 10})
+
+    # A folded log left behind by a crash mid-compaction is not counted again
+    day_file = next(name for name in _scope_files(tmp_path) if name.endswith('.json'))
+    stale_log = tmp_path / 'cs' / day_file.replace('.json', '.1.log')
+    stale_log.write_text('{"%d": {"docs": 5, "counts": {"python": 5}}}\n' % int(NOW // 3600))
+    assert _frequencies(TrendingKeywords(str(tmp_path))) == (10, {'python': 10, 'alumni': 10})
+
+
+def test_corrupt_day_file_is_moved_aside_not_overwritten(tmp_path, monkeypatch):
+    monkeypatch.setattr(trending.time, 'time', lambda: NOW)
+    monkeypatch.setattr(trending, 'COMPACT_MIN_BYTES', 0)
+    tracker = TrendingKeywords(str(tmp_path))
+    tracker.add(_documents(2, 'python'))
+    day_file = next(name for name in _scope_files(tmp_path) if name.endswith('.json'))
+    (tmp_path / 'cs' / day_file).write_text('{"generation": 1}\n{"truncated')
+
+    tracker.add(_documents(2, 'rust'))
+    assert _frequencies(TrendingKeywords(str(tmp_path))) == (2, {'rust': 2, 'alumni': 2})
+    aside = [name for name in _scope_files(tmp_path) if '.corrupt-' in name]
+    assert len(aside) == 1
+    assert (tmp_path / 'cs' / aside[0]).read_text() == '{"generation": 1}\n{"truncated'